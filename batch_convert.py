@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Batch converter - converts whole folders of packing lists to CMR files
+Fans the PDFs out to a process pool (one worker per CPU core) and
+streams progress events so both the CLI and the GUI can show them.
+"""
+
+import os
+import sys
+import time
+import argparse
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+
+from stage_timer import summarize, format_summary
+
+DEFAULT_TEMPLATE = "CTS_NL_CMR_Template.xlsx"
+DEFAULT_OUTPUT_DIR = "cmr_output"
+
+
+def collect_pdfs(inputs: List[str], recursive: bool = False) -> List[str]:
+    """Expand files and folders into a sorted list of PDF paths"""
+    pdf_paths = []
+
+    for item in inputs:
+        if os.path.isfile(item):
+            if item.lower().endswith('.pdf'):
+                pdf_paths.append(item)
+        elif os.path.isdir(item):
+            if recursive:
+                for folder, _, files in os.walk(item):
+                    for file in files:
+                        if file.lower().endswith('.pdf'):
+                            pdf_paths.append(os.path.join(folder, file))
+            else:
+                for file in os.listdir(item):
+                    full_path = os.path.join(item, file)
+                    if file.lower().endswith('.pdf') and os.path.isfile(full_path):
+                        pdf_paths.append(full_path)
+
+    return sorted(pdf_paths)
+
+
+def build_output_path(pdf_path: str, output_dir: str) -> str:
+    """CMR_<pdf name>_<timestamp>.xlsx - same naming as the CLI and GUI.
+    
+    The file is created (empty) right away, so PDFs with the same name from
+    different folders that finish in the same second get CMR_..._2.xlsx,
+    _3 ... instead of overwriting each other. The caller writes the CMR
+    over it, or removes it if the conversion fails.
+    """
+    base_name = os.path.splitext(os.path.basename(pdf_path))[0]
+    stem = os.path.join(output_dir, f"CMR_{base_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    for n in itertools.count(1):
+        output_path = f"{stem}.xlsx" if n == 1 else f"{stem}_{n}.xlsx"
+        try:
+            with open(output_path, 'x'):
+                return output_path
+        except FileExistsError:
+            continue
+
+
+def _init_worker(quiet: bool, template_path: str):
+    """Worker setup: per-file tracing only if asked for, prepare the template once"""
+    import logging
+    from pdf_to_cmr import CMRExcelPopulator, configure_logging
+
+    if not quiet:
+        sys.stdout.reconfigure(line_buffering=True)  # don't lose output at pool shutdown
+        configure_logging(logging.DEBUG)
+    try:
+        CMRExcelPopulator.preload(template_path)
+    except Exception:
+        pass  # populate() reports template problems per file
+
+
+def convert_one(pdf_path: str, output_dir: str, template_path: str,
+                use_cache: bool = True, aggregate: bool = False) -> Dict:
+    """Convert a single PDF - runs inside a worker process, never raises"""
+    from pdf_to_cmr import PackingListExtractor, CMRExcelPopulator
+    from extraction_cache import ExtractionCache
+    from stage_timer import StageTimer
+
+    started = time.perf_counter()
+    timer = StageTimer()
+    result = {
+        'pdf_path': pdf_path,
+        'output_path': None,
+        'success': False,
+        'error': None,
+        'num_boxes': 0,
+        'total_gross_weight': 0,
+    }
+
+    output_path = None
+    try:
+        extractor = PackingListExtractor(pdf_path, cache=ExtractionCache() if use_cache else None,
+                                         timer=timer)
+        data = extractor.extract()
+
+        output_path = build_output_path(pdf_path, output_dir)
+        populator = CMRExcelPopulator(template_path, timer=timer, aggregate=aggregate)
+        populator.populate(data, output_path)
+
+        result['output_path'] = output_path
+        result['num_boxes'] = data.get('num_boxes', 0)
+        result['total_gross_weight'] = data.get('total_gross_weight', 0)
+        result['success'] = True
+    except Exception as e:
+        result['error'] = str(e)
+        if output_path is not None:
+            try:
+                os.remove(output_path)  # the reserved name, maybe half written
+            except OSError:
+                pass
+
+    result['seconds'] = time.perf_counter() - started
+    result['stages'] = timer.report()
+    return result
+
+
+def iter_batch_convert(pdf_paths: List[str], output_dir: str = DEFAULT_OUTPUT_DIR,
+                       template_path: str = DEFAULT_TEMPLATE,
+                       max_workers: Optional[int] = None,
+                       quiet_workers: bool = True,
+                       use_cache: bool = True,
+                       aggregate: bool = False) -> Iterator[Dict]:
+    """
+    Convert PDFs in a process pool and yield progress events:
+
+    {'event': 'start',  'total': n, 'workers': w}
+    {'event': 'file',   'completed': k, 'total': n, 'result': {...}}
+    {'event': 'finish', 'total': n, 'succeeded': s, 'failed': f,
+     'seconds': t, 'results': [...],     # results in input order
+     'stage_summary': {...}}             # per-stage percentiles, see stage_timer
+    """
+    total = len(pdf_paths)
+    workers = max_workers or os.cpu_count() or 1
+    workers = max(1, min(workers, total))
+
+    os.makedirs(output_dir, exist_ok=True)
+    started = time.perf_counter()
+
+    yield {'event': 'start', 'total': total, 'workers': workers}
+
+    results = [None] * total
+    if total:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(quiet_workers, template_path)) as pool:
+            futures = {
+                pool.submit(convert_one, pdf_path, output_dir, template_path, use_cache, aggregate): idx
+                for idx, pdf_path in enumerate(pdf_paths)
+            }
+
+            for completed, future in enumerate(as_completed(futures), 1):
+                idx = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # Worker crashed (e.g. killed) - record it, keep going
+                    result = {'pdf_path': pdf_paths[idx], 'output_path': None,
+                              'success': False, 'error': f"Worker failed: {e}",
+                              'num_boxes': 0, 'total_gross_weight': 0, 'seconds': 0.0,
+                              'stages': None}
+                results[idx] = result
+                yield {'event': 'file', 'completed': completed, 'total': total,
+                       'result': result}
+
+    succeeded = sum(1 for r in results if r['success'])
+    yield {
+        'event': 'finish',
+        'total': total,
+        'succeeded': succeeded,
+        'failed': total - succeeded,
+        'seconds': time.perf_counter() - started,
+        'results': results,
+        'stage_summary': summarize([r['stages'] for r in results if r['success']]),
+    }
+
+
+def batch_convert(pdf_paths: List[str], output_dir: str = DEFAULT_OUTPUT_DIR,
+                  template_path: str = DEFAULT_TEMPLATE,
+                  max_workers: Optional[int] = None,
+                  progress_callback: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+    """Convert PDFs in parallel, returns the per-file results in input order"""
+    results = []
+    for event in iter_batch_convert(pdf_paths, output_dir, template_path, max_workers):
+        if progress_callback:
+            progress_callback(event)
+        if event['event'] == 'finish':
+            results = event['results']
+    return results
+
+
+def print_progress(event: Dict):
+    """CLI progress output"""
+    if event['event'] == 'start':
+        print(f"Converting {event['total']} PDFs with {event['workers']} workers...")
+    elif event['event'] == 'file':
+        result = event['result']
+        name = os.path.basename(result['pdf_path'])
+        prefix = f"[{event['completed']}/{event['total']}]"
+        if result['success']:
+            print(f"{prefix} ✓ {name} -> {result['output_path']} "
+                  f"({result['num_boxes']} boxes, {result['seconds']:.1f}s)")
+        else:
+            first_line = result['error'].split('\n')[0] if result['error'] else 'Unknown error'
+            print(f"{prefix} ✗ {name}: {first_line}")
+    elif event['event'] == 'finish':
+        print(f"\n✓ Done in {event['seconds']:.1f}s - "
+              f"{event['succeeded']} succeeded, {event['failed']} failed")
+        for result in event['results']:
+            if not result['success']:
+                print(f"  ✗ {result['pdf_path']}")
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Convert a folder of packing list PDFs to CMR files")
+    parser.add_argument('input_dir', help="Folder (or PDF file) to convert")
+    parser.add_argument('output_dir', nargs='?', default=DEFAULT_OUTPUT_DIR,
+                        help=f"Output folder for CMR files (default: {DEFAULT_OUTPUT_DIR})")
+    parser.add_argument('--template', default=DEFAULT_TEMPLATE, help="CMR template path")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument('--recursive', action='store_true',
+                        help="Include PDFs in sub-folders (e.g. every Transport folder of a year)")
+    parser.add_argument('--verbose', action='store_true', help="Show per-file extraction output")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Re-parse every PDF instead of using the extraction cache")
+    parser.add_argument('--aggregate', action='store_true',
+                        help="One CMR line per group of identical colli (type, dimensions, weight)")
+    parser.add_argument('--profile', action='store_true',
+                        help="Show per-stage timing percentiles across the batch")
+    args = parser.parse_args()
+
+    pdf_paths = collect_pdfs([args.input_dir], recursive=args.recursive)
+    if not pdf_paths:
+        print(f"Error: No PDF files found in {args.input_dir}")
+        sys.exit(1)
+
+    failed = 0
+    for event in iter_batch_convert(pdf_paths, args.output_dir, args.template,
+                                    args.workers, quiet_workers=not args.verbose,
+                                    use_cache=not args.no_cache, aggregate=args.aggregate):
+        print_progress(event)
+        if event['event'] == 'finish':
+            failed = event['failed']
+            if args.profile and event['stage_summary']:
+                print("\nStage timings:")
+                print(format_summary(event['stage_summary']))
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: box aggregation for shipments of many identical colli
+
+Groups boxes by type, dimensions and weight (aggregate_boxes) and shows
+the effect on the CMR: lines written, sheets generated, population time.
+Also checks that the grouping is linear - 10x the boxes may take at most
+~20x the time - and that colli and weight totals are unchanged.
+
+Usage: python benchmarks/bench_aggregate.py [--boxes N] [--template PATH]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from openpyxl import load_workbook
+from pdf_to_cmr import CMRExcelPopulator, aggregate_boxes
+
+# A typical project shipment: a handful of pallet/crate sizes, repeated
+KINDS = [("Pallet", "120 x 80 x 100", 400), ("Pallet", "120 x 100 x 120", 650),
+         ("Wooden Box", "240 x 100 x 160", 1800), ("Crate", "80 x 80 x 90", 220)]
+
+
+def shipment(num_boxes, seed=1):
+    rnd = random.Random(seed)
+    boxes = []
+    for number in range(1, num_boxes + 1):
+        box_type, dims, weight = rnd.choice(KINDS)
+        boxes.append({'type': box_type, 'number': number, 'name': f"{box_type} {number}",
+                      'dimensions': dims, 'gross_weight': f"{weight} KG", 'gross_weight_kg': weight})
+    return {'packing_list_number': '15738', 'our_ref': '56993', 'consignee': {'name': "Qatar Petroleum"},
+            'boxes': boxes, 'num_boxes': num_boxes,
+            'total_gross_weight': sum(box['gross_weight_kg'] for box in boxes)}
+
+
+def grouping_ms(boxes, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        aggregate_boxes(boxes)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def populate(data, template_path, output_path, aggregate):
+    started = time.perf_counter()
+    CMRExcelPopulator(template_path, aggregate=aggregate).populate(data, output_path)
+    return (time.perf_counter() - started) * 1000, len(load_workbook(output_path).sheetnames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--boxes', type=int, default=1000)
+    parser.add_argument('--template', default=os.path.join(ROOT, "CTS_NL_CMR_Template.xlsx"))
+    args = parser.parse_args()
+
+    data = shipment(args.boxes)
+    lines = aggregate_boxes(data['boxes'])
+    colli = sum(line.get('count', 1) for line in lines)
+    weight = sum(line.get('gross_weight_kg', 0) for line in lines)
+    if colli != data['num_boxes'] or weight != data['total_gross_weight']:
+        print(f"✗ Totals changed: {colli} colli / {weight} KG, "
+              f"expected {data['num_boxes']} / {data['total_gross_weight']}")
+        sys.exit(1)
+
+    small = grouping_ms(shipment(10000)['boxes'])
+    large = grouping_ms(shipment(100000)['boxes'])
+
+    CMRExcelPopulator.preload(args.template)
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = os.path.join(tmp, "CMR.xlsx")
+        populate(data, args.template, output_path, False)  # warm up
+        per_box_ms, per_box_sheets = populate(data, args.template, output_path, False)
+        grouped_ms, grouped_sheets = populate(data, args.template, output_path, True)
+
+    print(f"{args.boxes} colli, {len(KINDS)} kinds:")
+    print(f"  one line per box:  {args.boxes:6} lines, {per_box_sheets:3} sheets, {per_box_ms:7.1f} ms")
+    print(f"  aggregated:        {len(lines):6} lines, {grouped_sheets:3} sheets, {grouped_ms:7.1f} ms")
+    print(f"  aggregate_boxes(): 10,000 boxes {small:.1f} ms, 100,000 boxes {large:.1f} ms")
+    for line in lines:
+        print(f"    {line['name']:<16} {line.get('dimensions', ''):<18} {line.get('gross_weight_kg', 0):>8,} KG")
+
+    if large > small * 20:
+        print("✗ Grouping does not scale linearly")
+        sys.exit(1)
+    print("✓ Totals unchanged, grouping linear")
+
+
+if __name__ == "__main__":
+    main()
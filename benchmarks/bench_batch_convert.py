@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark: recursive batch conversion of same-named packing lists
+
+Every Transport folder has its own PL.pdf, so a --recursive batch converts
+many PDFs with the same name into one output folder, most of them within
+the same second. Times the batch and checks that every PDF got its own
+CMR (none overwritten) and that a PDF that fails leaves no file behind.
+
+Usage: python benchmarks/bench_batch_convert.py [--folders N] [--pages N] [--workers N]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from batch_convert import collect_pdfs, iter_batch_convert
+from synthetic_pdf import make_packing_list
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--folders', type=int, default=8, help="Transport folders, one PL.pdf each")
+    parser.add_argument('--pages', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        share = os.path.join(tmp, "2025")
+        for n in range(args.folders):
+            transport = os.path.join(share, f"{20000 + n} Customer {n}", "Transport")
+            os.makedirs(transport)
+            make_packing_list(os.path.join(transport, "PL.pdf"), args.pages, seed=n, pl_number=15700 + n)
+        broken = os.path.join(share, "20999 Broken", "Transport")
+        os.makedirs(broken)
+        with open(os.path.join(broken, "PL.pdf"), 'wb') as f:
+            f.write(b"%PDF-1.4 not really")
+
+        pdf_paths = collect_pdfs([share], recursive=True)
+        output_dir = os.path.join(tmp, "out")
+        started = time.perf_counter()
+        for event in iter_batch_convert(pdf_paths, output_dir, os.path.join(ROOT, "CTS_NL_CMR_Template.xlsx"),
+                                        max_workers=args.workers, use_cache=False):
+            if event['event'] == 'finish':
+                results = event['results']
+        seconds = time.perf_counter() - started
+
+        converted = [r for r in results if r['success']]
+        output_paths = {r['output_path'] for r in converted}
+        on_disk = sorted(os.listdir(output_dir))
+
+    print(f"{len(pdf_paths)} x PL.pdf in sibling folders, {args.workers} workers: "
+          f"{seconds * 1000:.0f} ms ({seconds * 1000 / len(pdf_paths):.0f} ms per PDF)")
+    if len(converted) != args.folders or len(output_paths) != args.folders:
+        print(f"✗ {len(converted)} converted, {len(output_paths)} distinct CMR paths - "
+              f"expected {args.folders}")
+        sys.exit(1)
+    if len(on_disk) != args.folders:
+        print(f"✗ {len(on_disk)} files in the output folder, expected {args.folders}: {on_disk}")
+        sys.exit(1)
+    print(f"✓ One CMR per PDF ({', '.join(on_disk[:3])}, ...), nothing left by the failed PDF")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-scan box detection vs. the old pattern-by-pattern search
+
+Old: _extract_box_from_page() ran one re.search per package type (11),
+measurement pattern (3) and weight pattern (3), recompiling each time.
+New: one precompiled combined scan per page (_scan_box_fields).
+
+Both are run over a corpus of page texts; results must be identical.
+
+Usage: python benchmarks/bench_box_detection.py [--pages N] [--repeat N]
+"""
+
+import io
+import os
+import re
+import sys
+import time
+import random
+import argparse
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pdf_to_cmr import PackingListExtractor
+from synthetic_pdf import build_pages
+
+
+def legacy_extract_box_from_page(text, page_num):
+    """_extract_box_from_page as it was before the single-scan engine"""
+    box = {}
+
+    package_types = [
+        r'Wooden\s*box', r'Pallet', r'Case', r'Crate', r'Carton\s*box',
+        r'Carton', r'Package', r'Container', r'Box', r'Skid', r'Bundle'
+    ]
+
+    for pkg_type_pattern in package_types:
+        collo_match = re.search(rf'({pkg_type_pattern})\s*\(?\s*(\d+)\s*\)?', text, re.IGNORECASE)
+        if collo_match:
+            box['type'] = collo_match.group(1).strip()
+            box['number'] = int(collo_match.group(2))
+            type_cleaned = re.sub(r'\s+', ' ', box['type'].title())
+            box['name'] = f"{type_cleaned} {box['number']}"
+            print(f"    ✓ Found package: {box['name']}")
+            break
+
+    if not box:
+        packing_match = re.search(r'Packing List\s+\d+[-\s]*(\d+)', text)
+        if packing_match:
+            box_num = int(packing_match.group(1))
+            box['type'] = 'Package'
+            box['number'] = box_num
+            box['name'] = f"Package {box_num}"
+            print(f"    ✓ Found from packing list number: {box['name']}")
+        else:
+            print(f"    - No package identifier found on page {page_num}")
+            return None
+
+    measurement_patterns = [
+        r'Measurement[:\s]+([\d\s]+x[\d\s]+x[\d\s]+)',
+        r'Dimensions?[:\s]+([\d\s]+x[\d\s]+x[\d\s]+)',
+        r'(\d+\s*x\s*\d+\s*x\s*\d+)\s*cm',
+    ]
+
+    for pattern in measurement_patterns:
+        measurement_match = re.search(pattern, text, re.IGNORECASE)
+        if measurement_match:
+            dims = measurement_match.group(1).strip()
+            dims = re.sub(r'\s+', ' ', dims).replace(' x ', ' x ')
+            box['dimensions'] = dims
+            print(f"      Dimensions: {dims}")
+            break
+
+    if 'dimensions' not in box: print(f"      ⚠ No dimensions found")
+
+    weight_patterns = [
+        r'Gross\s*weight[:\s]+([\d,]+)\s*KG',
+        r'Gross[:\s]+([\d,]+)\s*KG',
+        r'([\d,]+)\s*KG.*gross',
+    ]
+
+    for pattern in weight_patterns:
+        gross_weight_match = re.search(pattern, text, re.IGNORECASE)
+        if gross_weight_match:
+            weight_str = gross_weight_match.group(1).replace(',', '')
+            weight = int(weight_str)
+            box['gross_weight'] = f"{weight} KG"
+            box['gross_weight_kg'] = weight
+            print(f"      Weight: {weight} KG")
+            break
+
+    if 'gross_weight_kg' not in box: print(f"      ⚠ No gross weight found")
+
+    return box
+
+
+# Fragments that stress pattern priority, overlaps and case handling
+FRAGMENTS = [
+    "Wooden box (3)", "wooden  box(12)", "WOODENBOX 7", "Pallet(6)", "pallet 2", "Case 4",
+    "Showcase 12", "Crate (9)", "Carton box 5", "Cartonbox(3)", "Carton 8", "Package 11",
+    "Packages", "Container 2", "Box 1", "Skid(4)", "Bundle 10", "Packing List 15738-4",
+    "Packing List 15738", "packing list 15738-2", "Measurement: 120 x 80 x 100 cm",
+    "Measurement 1 x 2 x 3", "Dimensions: 240 x 100 x 87", "Dimension 12x34x56",
+    "120x80x100 cm", "80 x 120 x 161cm", "Gross weight: 1,234 KG", "Gross weight 980 KG",
+    "Gross: 12KG", "GROSS 4,800 kg", "1,250 KG gross", "Net weight: 900 KG", "980 KG total gross",
+    "Gross weight: 2,000 KG Net", "Country of origin: Netherlands", "Ball valve 2\" class 300",
+    "HS 84818081", "12 PCS", "Tel.: +968 2456 1234", "Case", "Box", "x 12 x", "KG",
+]
+
+
+def build_corpus(pages, seed=7):
+    rng = random.Random(seed)
+    corpus = []
+    # Realistic pages from the synthetic packing-list generator
+    for layout in build_pages(pages // 2, seed=seed, continuation_every=4):
+        corpus.append("\n".join(text for _, _, text in sorted(layout, key=lambda l: (-l[1], l[0]))))
+    # Adversarial pages: random mixes of tricky fragments
+    while len(corpus) < pages:
+        parts = rng.sample(FRAGMENTS, rng.randint(1, 10))
+        corpus.append(rng.choice(["\n", " ", "\n\n"]).join(parts))
+    return corpus
+
+
+def run_all(fn, corpus):
+    results = []
+    for page_num, text in enumerate(corpus, 1):
+        try:
+            results.append(fn(text, page_num))
+        except ValueError as e:
+            results.append(('ValueError', str(e)))
+    return results
+
+
+def best_of(fn, corpus, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run_all(fn, corpus)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--pages', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.pages)
+    extractor = PackingListExtractor("benchmark.pdf")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        old_results = run_all(legacy_extract_box_from_page, corpus)
+        new_results = run_all(extractor._extract_box_from_page, corpus)
+
+    mismatches = [i for i, (a, b) in enumerate(zip(old_results, new_results)) if a != b]
+    if mismatches:
+        print(f"✗ {len(mismatches)} pages differ, first: {corpus[mismatches[0]]!r}")
+        print(f"  old: {old_results[mismatches[0]]}")
+        print(f"  new: {new_results[mismatches[0]]}")
+        sys.exit(1)
+    print(f"✓ Identical results on {len(corpus)} page texts")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        old = best_of(legacy_extract_box_from_page, corpus, args.repeat)
+        new = best_of(extractor._extract_box_from_page, corpus, args.repeat)
+
+    print(f"  old: {old / len(corpus) * 1e6:8.1f} µs/page")
+    print(f"  new: {new / len(corpus) * 1e6:8.1f} µs/page")
+    print(f"  speedup: {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
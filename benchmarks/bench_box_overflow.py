@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CMR population for high-collo shipments
+
+Old: boxes were written from row 50 down without a limit - past 20 colli
+they ran into the footer (B70) and off the print area.
+New: 19 boxes on the CMR plus a pointer row, the rest on annex sheets
+with repeated headers, written row by row with append().
+
+Checks that every box appears exactly once (CMR + annexes) and nothing
+runs into the footer, and times population at several box counts.
+
+Usage: python benchmarks/bench_box_overflow.py [--boxes N ...] [--repeat N] [--template PATH]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from openpyxl import load_workbook
+from pdf_to_cmr import CMRExcelPopulator
+
+FOOTER_CELL = 'B70'
+FOOTER_TEXT = "Previous to deliver, please contact:"
+
+
+def shipment(num_boxes):
+    boxes = [{'name': f"Crate {n}", 'dimensions': "120 x 80 x 100", 'gross_weight_kg': 400 + n % 7}
+             for n in range(1, num_boxes + 1)]
+    return {'packing_list_number': '15738', 'our_ref': '56993', 'your_ref': 'PO 4592670206',
+            'consignee': {'name': "Qatar Petroleum"}, 'boxes': boxes, 'num_boxes': num_boxes,
+            'total_gross_weight': sum(box['gross_weight_kg'] for box in boxes)}
+
+
+def boxes_written(path):
+    """Box names on the CMR (rows 50-69) and its annex sheets"""
+    wb = load_workbook(path)
+    cmr = wb.worksheets[0]
+    names = [cmr[f'B{row}'].value for row in range(50, 70)]
+    for ws in wb.worksheets[1:]:
+        names += [row[1] for row in ws.iter_rows(min_row=5, values_only=True)]
+    return [name for name in names if name and name.startswith("Crate")], cmr[FOOTER_CELL].value, len(wb.sheetnames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--boxes', type=int, nargs='+', default=[10, 20, 21, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--template', default=os.path.join(ROOT, "CTS_NL_CMR_Template.xlsx"))
+    args = parser.parse_args()
+
+    CMRExcelPopulator.preload(args.template)
+    print(f"{'boxes':>7} {'sheets':>7} {'ms':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = os.path.join(tmp, "CMR.xlsx")
+        for num_boxes in args.boxes:
+            data = shipment(num_boxes)
+            best = float('inf')
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                CMRExcelPopulator(args.template).populate(data, output_path)
+                best = min(best, time.perf_counter() - started)
+
+            names, footer, sheets = boxes_written(output_path)
+            expected = [box['name'] for box in data['boxes']]
+            if names != expected or footer != FOOTER_TEXT:
+                print(f"✗ {num_boxes} boxes: {len(names)} written, footer {footer!r}")
+                sys.exit(1)
+            print(f"{num_boxes:>7} {sheets:>7} {best * 1000:>9.1f}")
+    print("✓ Every box written once, footer intact")
+
+
+if __name__ == "__main__":
+    main()
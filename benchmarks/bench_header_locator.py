@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: positional header locator vs. the old crop + regex extraction
+
+Old: page 1 extract_text() for the header regexes, crop(left half)
+.extract_text() for the consignee - two text layouts of the page.
+New: PackingListExtractor's header stages - one pass over page 1's chars
+gives the text and the word boxes, values are read next to their labels.
+
+Both must find the same header fields and consignee.
+
+Usage: python benchmarks/bench_header_locator.py [--repeat N]
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pdfplumber
+import pdf_to_cmr
+from pdf_to_cmr import PackingListExtractor
+from synthetic_pdf import make_packing_list
+
+SEEDS = range(1, 9)
+
+OLD_PATTERNS = {
+    'packing_list_number': r'Packing List\s+(\d+)(?:-\d+)?',
+    'date': r'Barendrecht,\s*(\d{2}-\d{2}-\d{4})',
+    'your_ref': r'Your ref\.:\s*([^\n]+)',
+    'our_ref': r'Our ref\.:\s*(\d{4,5})',
+    'delivery_terms': r'Delivery\s+([^\n]+)',
+}
+
+
+def old_header(pdf_path):
+    extractor = PackingListExtractor(pdf_path)
+    with pdfplumber.open(pdf_path) as pdf:
+        page = pdf.pages[0]
+        full_text = page.extract_text()
+        left_text = page.crop((0, 0, page.width * 0.5, page.height)).extract_text()
+    header = {}
+    for field, pattern in OLD_PATTERNS.items():
+        match = re.search(pattern, full_text)
+        header[field] = match.group(1).strip() if match else None
+    header['consignee'] = extractor._extract_consignee(left_text)
+    return header
+
+
+def new_header(pdf_path):
+    extractor = PackingListExtractor(pdf_path)
+    with pdfplumber.open(pdf_path) as pdf:
+        page = pdf.pages[0]
+        words = extractor._extract_page_text(page, with_words=True)['words']
+        width = page.width
+    lines = pdf_to_cmr._words_to_lines(words)
+    header = {field: pdf_to_cmr._value_near_anchor(lines, anchor, value,
+                                                   extractor.VALUE_COLUMN_GAP,
+                                                   extractor.VALUE_MAX_DISTANCE)
+              for field, anchor, value in pdf_to_cmr.HEADER_FIELDS}
+    left_lines = pdf_to_cmr._words_to_lines([word for word in words
+                                             if word['x0'] < width * extractor.LEFT_HALF_RATIO])
+    header['consignee'] = extractor._extract_consignee(
+        "\n".join(pdf_to_cmr._line_text(line) for line in left_lines))
+    return header
+
+
+def best_of(fn, paths, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for path in paths:
+            fn(path)
+        timings.append(time.perf_counter() - started)
+    return min(timings) / len(paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [make_packing_list(os.path.join(tmp, f"PL{seed}.pdf"), 1, seed=seed) for seed in SEEDS]
+
+        for path in paths:
+            if old_header(path) != new_header(path):
+                print(f"✗ Header mismatch on {os.path.basename(path)}")
+                sys.exit(1)
+
+        old = best_of(old_header, paths, args.repeat) * 1000
+        new = best_of(new_header, paths, args.repeat) * 1000
+
+    print(f"{'old ms/list':>12} {'new ms/list':>12} {'saved':>7}")
+    print(f"{old:>12.2f} {new:>12.2f} {(old - new) / old:>7.0%}")
+    print(f"✓ Same header fields and consignee for {len(paths)} packing lists")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cost of the conversion trace output - print vs. disabled logger
+
+Old: every consignee line, box and cell was traced with an f-string print,
+formatted and written even when nobody reads stdout (windowed GUI build,
+batch runs piped to a file).
+New: the trace goes through the "pdf_to_cmr" logger at DEBUG level and is
+only formatted when that level is enabled.
+
+Times a full conversion (extract + populate) with tracing on (written to
+os.devnull) and off, plus the bare cost of one trace call. Fails (exit 1)
+if a disabled logger still creates log records.
+
+Usage: python benchmarks/bench_logging_overhead.py [--pages N] [--repeat N]
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pdf_to_cmr import PackingListExtractor, CMRExcelPopulator, logger
+
+
+class RecordCounter(logging.Filter):
+    """Counts the trace records (below WARNING) that reach the logger's handlers"""
+
+    def __init__(self):
+        super().__init__()
+        self.records = 0
+
+    def filter(self, record):
+        if record.levelno < logging.WARNING:
+            self.records += 1
+        return True
+
+
+def convert(pdf_path, template_path, output_path):
+    """One conversion, in ms"""
+    started = time.perf_counter()
+    data = PackingListExtractor(pdf_path).extract()
+    CMRExcelPopulator(template_path).populate(data, output_path)
+    return (time.perf_counter() - started) * 1000
+
+
+def per_call_ns(func, calls=200000):
+    started = time.perf_counter()
+    for i in range(calls):
+        func(i)
+    return (time.perf_counter() - started) / calls * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    from synthetic_pdf import make_packing_list
+
+    devnull = open(os.devnull, 'w')
+    handler = logging.StreamHandler(devnull)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    counter = RecordCounter()
+    handler.addFilter(counter)
+    logger.addHandler(handler)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = make_packing_list(os.path.join(tmp, "bench.pdf"), args.pages, seed=1)
+        template_path = os.path.join(tmp, "missing_template.xlsx")  # blank workbook
+        output_path = os.path.join(tmp, "out.xlsx")
+
+        convert(pdf_path, template_path, output_path)  # warm up
+
+        # Alternate the two modes so machine noise hits both alike
+        timings = {logging.DEBUG: [], logging.WARNING: []}
+        records = {logging.DEBUG: 0, logging.WARNING: 0}
+        for _ in range(args.repeat):
+            for level in timings:
+                logger.setLevel(level)
+                counter.records = 0
+                timings[level].append(convert(pdf_path, template_path, output_path))
+                records[level] = counter.records
+
+    # One per-cell trace line, the old way and the new way
+    def old_print(i):
+        print(f"  B{i}: Delivery terms - EXW Barendrecht", file=devnull)
+
+    def new_disabled(i):
+        logger.debug("  B%d: %s - %s", i, "Delivery terms", "EXW Barendrecht")
+
+    loop_ns = per_call_ns(lambda i: None)
+    print_ns = per_call_ns(old_print) - loop_ns
+    disabled_ns = per_call_ns(new_disabled) - loop_ns
+
+    logger.removeHandler(handler)
+    devnull.close()
+
+    traced_ms, quiet_ms = min(timings[logging.DEBUG]), min(timings[logging.WARNING])
+    quiet_records = records[logging.WARNING]
+    print(f"{args.pages} pages, best of {args.repeat}:")
+    print(f"  tracing on (to devnull):  {traced_ms:8.1f} ms, {records[logging.DEBUG]} messages formatted")
+    print(f"  tracing off:              {quiet_ms:8.1f} ms, {quiet_records} messages formatted")
+    print(f"  per trace line: print {print_ns:6.0f} ns, disabled logger {disabled_ns:6.0f} ns")
+
+    if quiet_records:
+        print(f"✗ Disabled tracing still formatted {quiet_records} messages")
+        sys.exit(1)
+    print("✓ No trace formatting when tracing is off")
+
+
+if __name__ == "__main__":
+    main()
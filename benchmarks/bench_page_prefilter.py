@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: skipping pages without collo markers vs. laying out every page
+
+Packing lists with long item lists have continuation pages that can't
+hold a collo. With the prefilter (the default) their content stream is
+checked for package keywords / "Packing List" before any text layout,
+and pages without one are skipped.
+
+Both modes must extract the same data - also for a PDF whose font has a
+ToUnicode CMap, where the content stream bytes hold no package keyword but
+the extracted text does.
+
+Usage: python benchmarks/bench_page_prefilter.py [--repeat N]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import pdfplumber
+from pdfminer.pdftypes import resolve1
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pdf_to_cmr import PackingListExtractor, _COLLO_MARKER_BYTES
+from synthetic_pdf import make_packing_list
+
+# (colli, a continuation page after every n-th collo - 0 = none)
+CASES = [(50, 0), (50, 3), (50, 1), (20, 1)]
+
+
+def best_of_alternating(fns, repeat):
+    """[(best ms, last result)] per function - runs alternate so drift hits both alike"""
+    best = [float('inf')] * len(fns)
+    results = [None] * len(fns)
+    for _ in range(repeat):
+        for i, fn in enumerate(fns):
+            started = time.perf_counter()
+            results[i] = fn()
+            best[i] = min(best[i], time.perf_counter() - started)
+    return [(ms * 1000, result) for ms, result in zip(best, results)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'colli':>6} {'cont. pages':>12} {'all pages ms':>13} {'prefilter ms':>13} {'saved':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for colli, continuation_every in CASES:
+            pdf_path = make_packing_list(os.path.join(tmp, f"PL{colli}_{continuation_every}.pdf"),
+                                         colli, seed=colli, continuation_every=continuation_every)
+            continuation_pages = colli // continuation_every if continuation_every else 0
+
+            (full_ms, full), (filtered_ms, filtered) = best_of_alternating([
+                lambda: PackingListExtractor(pdf_path, prefilter=False).extract(),
+                lambda: PackingListExtractor(pdf_path).extract(),
+            ], args.repeat)
+            if full != filtered:
+                print(f"✗ Different data with the prefilter for {colli} colli / every {continuation_every}")
+                sys.exit(1)
+
+            print(f"{colli:>6} {continuation_pages:>12} {full_ms:>13.1f} {filtered_ms:>13.1f} "
+                  f"{(full_ms - filtered_ms) / full_ms:>7.0%}")
+
+        # Font with a ToUnicode CMap: the markers are only in the extracted text
+        colli = 20
+        pdf_path = make_packing_list(os.path.join(tmp, "PL_to_unicode.pdf"), colli, seed=colli,
+                                     continuation_every=2, shifted_codes=True)
+        with pdfplumber.open(pdf_path) as pdf:
+            stream = b"".join(resolve1(content).get_data()
+                              for content in pdf.pages[1].page_obj.contents).lower()
+        if any(marker in stream for marker in _COLLO_MARKER_BYTES):
+            print("✗ ToUnicode test PDF shows a collo marker in its content stream")
+            sys.exit(1)
+        full = PackingListExtractor(pdf_path, prefilter=False).extract()
+        filtered = PackingListExtractor(pdf_path).extract()
+        if full != filtered or filtered['num_boxes'] != colli:
+            print(f"✗ ToUnicode font: {filtered['num_boxes']} of {colli} colli with the prefilter")
+            sys.exit(1)
+
+    print("✓ Same data with and without the prefilter (also with a ToUnicode font)")
+
+
+if __name__ == "__main__":
+    main()
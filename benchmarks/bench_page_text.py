@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-pass page text extraction vs. the old per-call extraction
+
+Old: page 1 extract_text() for the header, crop(left half).extract_text()
+for the consignee, then extract_text() again for every page in the box loop.
+New: PackingListExtractor._extract_page_text() - one pass over each page's chars
+(the consignee is located from page 1's words, see bench_header_locator.py).
+
+Usage: python benchmarks/bench_page_text.py [--repeat N]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pdfplumber
+from pdf_to_cmr import PackingListExtractor
+from synthetic_pdf import make_packing_list
+
+PAGE_COUNTS = [1, 10, 50]
+
+
+def old_texts(pdf_path):
+    with pdfplumber.open(pdf_path) as pdf:
+        first_page = pdf.pages[0]
+        full_text = first_page.extract_text()
+        first_page.crop((0, 0, first_page.width * 0.5, first_page.height)).extract_text()
+        page_texts = [page.extract_text() for page in pdf.pages]
+    return full_text, page_texts
+
+
+def new_texts(pdf_path):
+    extractor = PackingListExtractor(pdf_path)
+    with pdfplumber.open(pdf_path) as pdf:
+        first = extractor._extract_page_text(pdf.pages[0], with_words=True)
+        page_texts = [first['full']]
+        page_texts += [extractor._extract_page_text(page)['full'] for page in pdf.pages[1:]]
+    return first['full'], page_texts
+
+
+def best_of(fn, pdf_path, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(pdf_path)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'pages':>6} {'old ms/page':>12} {'new ms/page':>12} {'saved ms/page':>14} {'saved':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in PAGE_COUNTS:
+            pdf_path = make_packing_list(os.path.join(tmp, f"PL{pages}.pdf"), pages)
+
+            if old_texts(pdf_path) != new_texts(pdf_path):
+                print(f"✗ Text mismatch on {pages}-page PDF")
+                sys.exit(1)
+
+            old = best_of(old_texts, pdf_path, args.repeat) / pages * 1000
+            new = best_of(new_texts, pdf_path, args.repeat) / pages * 1000
+            print(f"{pages:>6} {old:>12.2f} {new:>12.2f} {old - new:>14.2f} {(old - new) / old:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
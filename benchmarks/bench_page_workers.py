@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: parallel page parsing of one large PDF vs. serial
+
+PackingListExtractor(page_workers=N) parses pages 2.. in N processes that
+each open the PDF once, for one range of pages. Times extract() (no cache)
+per worker count, including the process start-up, and checks the data is
+identical to serial. Fails if parallel parsing of a --min-pages PDF is
+slower than serial.
+
+The speed-up needs as many free CPU cores as workers - the extractor never
+starts more workers than there are cores, on a single core it parses serially.
+Runs that were capped to one worker only have their data checked; if none
+is left the speed check is skipped with a notice.
+
+Usage: python benchmarks/bench_page_workers.py [--pages N ...] [--workers N ...] [--repeat N]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pdf_to_cmr import PackingListExtractor
+from synthetic_pdf import make_packing_list
+
+# Timing noise allowed before "not slower than serial" fails
+TOLERANCE = 0.10
+
+
+def best_of(fn, repeat):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--pages', type=int, nargs='+', default=[100, 400])
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--min-pages', type=int, default=400,
+                        help="PDFs this large must not parse slower in parallel")
+    args = parser.parse_args()
+
+    print(f"CPU cores: {os.cpu_count()}")
+    slower, gated = [], 0
+    print(f"{'pages':>6} {'workers':>8} {'ms':>9} {'speed-up':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            pdf_path = make_packing_list(os.path.join(tmp, f"PL{pages}.pdf"), pages, seed=pages,
+                                         continuation_every=4)
+
+            serial_ms, serial = best_of(lambda: PackingListExtractor(pdf_path).extract(), args.repeat)
+            print(f"{pages:>6} {1:>8} {serial_ms:>9.0f} {1:>8.2f}x")
+
+            for workers in args.workers:
+                ms, data = best_of(lambda: PackingListExtractor(pdf_path, page_workers=workers).extract(),
+                                   args.repeat)
+                if data != serial:
+                    print(f"✗ {pages} pages, {workers} workers: data differs from serial")
+                    sys.exit(1)
+                print(f"{pages:>6} {workers:>8} {ms:>9.0f} {serial_ms / ms:>8.2f}x")
+                # Same cap as the extractor: one effective worker is a serial parse
+                effective = min(workers, os.cpu_count() or 1,
+                                (pages - 1) // PackingListExtractor.MIN_PAGES_PER_WORKER)
+                if pages < args.min_pages or effective <= 1:
+                    continue
+                gated += 1
+                if ms > serial_ms * (1 + TOLERANCE):
+                    slower.append(f"{pages} pages, {workers} workers")
+
+    print("✓ Same data as serial for every worker count")
+    if slower:
+        print(f"✗ Slower than serial: {', '.join(slower)}")
+        sys.exit(1)
+    if not gated:
+        print(f"⚠ Speed check skipped: no run from {args.min_pages} pages got more than one worker "
+              f"(CPU cores: {os.cpu_count()})")
+        return
+    print(f"✓ Not slower than serial from {args.min_pages} pages")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark: reads from the source PDF - one PDFSource read vs. the old opens
+
+Old: the extraction cache hashed the file, pdfplumber read the header page
+from it, and every page worker opened it again for its pages.
+New: PDFSource reads it once; pdfplumber parses that copy and page workers
+map a local spool file.
+
+Counts the read calls and bytes that reach the original file (on the P:\\
+share: network round trips and transfer) for a large packing list, and
+estimates the time at --rtt ms per read and --mbps network throughput.
+
+Usage: python benchmarks/bench_pdf_source.py [--pages N] [--workers N ...] [--rtt MS] [--mbps N]
+"""
+
+import io
+import os
+import sys
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pdfplumber
+import pdf_source
+from extraction_cache import file_sha256
+from pdf_to_cmr import PackingListExtractor
+from synthetic_pdf import make_packing_list
+
+
+class CountingFile(io.RawIOBase):
+    """Binary file that counts the read calls and bytes going to the real file"""
+
+    calls = 0
+    bytes = 0
+
+    def __init__(self, path):
+        self._f = open(path, 'rb')
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=0):
+        return self._f.seek(offset, whence)
+
+    def tell(self):
+        return self._f.tell()
+
+    def readinto(self, buffer):
+        n = self._f.readinto(buffer)
+        CountingFile.calls += 1
+        CountingFile.bytes += n or 0
+        return n
+
+    def readall(self):
+        data = self._f.read()  # one call, like FileIO.readall
+        CountingFile.calls += 1
+        CountingFile.bytes += len(data)
+        return data
+
+    def close(self):
+        self._f.close()
+        super().close()
+
+
+def reset():
+    CountingFile.calls = CountingFile.bytes = 0
+
+
+def counting_open(path, mode='rb'):
+    """Like open(path, 'rb') - buffered - but counted"""
+    return io.BufferedReader(CountingFile(path))
+
+
+def old_reads(pdf_path, workers):
+    """The old access pattern, each worker's opens replayed in this process"""
+    reset()
+    with counting_open(pdf_path) as f:  # file_sha256
+        for _ in iter(lambda: f.read(1024 * 1024), b''):
+            pass
+    extractor = PackingListExtractor(pdf_path)
+    with counting_open(pdf_path) as f, pdfplumber.open(f) as pdf:
+        extractor._extract_page_text(pdf.pages[0], with_words=True)
+        num_pages = len(pdf.pages)
+        if workers <= 1:
+            for page_num, page in enumerate(pdf.pages[1:], 2):
+                extractor._parse_page(page, page_num)
+    if workers > 1:
+        # One page range per worker, as PackingListExtractor._iter_page_boxes splits them
+        bounds = [2 + (num_pages - 1) * n // workers for n in range(workers + 1)]
+        for start, stop in zip(bounds, bounds[1:]):
+            with counting_open(pdf_path) as f, pdfplumber.open(f) as pdf:
+                for page_num in range(start, stop):
+                    extractor._parse_page(pdf.pages[page_num - 1], page_num)
+    return CountingFile.calls, CountingFile.bytes
+
+
+def new_reads(pdf_path):
+    reset()
+    pdf_source.open = counting_open
+    try:
+        source = pdf_source.PDFSource(pdf_path)
+    finally:
+        del pdf_source.open
+    if source.sha256 != file_sha256(pdf_path):
+        raise RuntimeError("PDFSource hash differs from file_sha256")
+    return CountingFile.calls, CountingFile.bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4])
+    parser.add_argument('--rtt', type=float, default=1.0, help="ms per read call over the network")
+    parser.add_argument('--mbps', type=float, default=100, help="network throughput, Mbit/s")
+    args = parser.parse_args()
+
+    def network_ms(calls, size):
+        return calls * args.rtt + size * 8 / (args.mbps * 1000)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = make_packing_list(os.path.join(tmp, f"PL{args.pages}.pdf"), args.pages,
+                                     seed=args.pages, continuation_every=4)
+        size = os.path.getsize(pdf_path)
+        print(f"{args.pages}-collo packing list, {size / 1024:.0f} KB; "
+              f"{args.rtt:g} ms per read, {args.mbps:g} Mbit/s")
+        print(f"{'':>10} {'workers':>8} {'reads':>7} {'KB read':>9} {'network ms':>11}")
+
+        new_calls, new_bytes = new_reads(pdf_path)
+        for workers in args.workers:
+            calls, read = old_reads(pdf_path, workers)
+            print(f"{'old':>10} {workers:>8} {calls:>7} {read / 1024:>9.0f} {network_ms(calls, read):>11.0f}")
+            print(f"{'PDFSource':>10} {workers:>8} {new_calls:>7} {new_bytes / 1024:>9.0f} "
+                  f"{network_ms(new_calls, new_bytes):>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark: one truck's packing lists - a workbook each vs. one workbook
+
+Old: populate() per packing list - template copy + save for every file.
+New: populate_many() - template loaded once, a CMR sheet per list plus a
+summary sheet, saved once.
+
+Also checks that a dozen lists with the same long packing list number get
+distinct sheet titles within Excel's 31-character limit.
+
+Usage: python benchmarks/bench_populate_many.py [--lists N] [--repeat N] [--template PATH]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from openpyxl import load_workbook
+from pdf_to_cmr import PackingListExtractor, CMRExcelPopulator
+from synthetic_pdf import make_packing_list
+
+
+def separate(data_list, template_path, tmp):
+    for i, data in enumerate(data_list):
+        CMRExcelPopulator(template_path).populate(data, os.path.join(tmp, f"CMR_{i}.xlsx"))
+
+
+def combined(data_list, template_path, tmp):
+    CMRExcelPopulator(template_path).populate_many(data_list, os.path.join(tmp, "CMR_truck.xlsx"))
+
+
+def best_ms(func, repeat, *args):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--lists', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--template', default=os.path.join(ROOT, "CTS_NL_CMR_Template.xlsx"))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_list = []
+        for i in range(args.lists):
+            pdf_path = make_packing_list(os.path.join(tmp, f"PL{i}.pdf"), 1 + i % 6, seed=i,
+                                         pl_number=16000 + i)
+            data_list.append(PackingListExtractor(pdf_path).extract())
+
+        CMRExcelPopulator.preload(args.template)
+        combined(data_list, args.template, tmp)  # warm up
+
+        # Alternate the two so machine noise hits both alike
+        old, new = float('inf'), float('inf')
+        for _ in range(args.repeat):
+            old = min(old, best_ms(separate, 1, data_list, args.template, tmp))
+            new = min(new, best_ms(combined, 1, data_list, args.template, tmp))
+
+        sheets = load_workbook(os.path.join(tmp, "CMR_truck.xlsx")).sheetnames
+        if len(sheets) != args.lists + 1:
+            print(f"✗ Expected {args.lists} CMR sheets + summary, got {sheets}")
+            sys.exit(1)
+
+        # The same long packing list number 12 times: titles get " (2)" ... " (12)"
+        duplicates = [dict(data_list[0], packing_list_number="1" * 30) for _ in range(12)]
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            CMRExcelPopulator(args.template).populate_many(duplicates, os.path.join(tmp, "CMR_dup.xlsx"))
+        titles = load_workbook(os.path.join(tmp, "CMR_dup.xlsx")).sheetnames
+        too_long = [title for title in titles if len(title) > CMRExcelPopulator.MAX_SHEET_TITLE]
+        if too_long or len(set(titles)) != len(duplicates) + 1 or caught:
+            print(f"✗ Bad sheet titles for duplicate packing lists: {titles} "
+                  f"{[str(w.message) for w in caught]}")
+            sys.exit(1)
+
+    template = os.path.basename(args.template) if os.path.exists(args.template) else "blank workbook"
+    print(f"{args.lists} packing lists, template: {template}, best of {args.repeat}:")
+    print(f"  {args.lists} workbooks (populate):    {old:8.1f} ms, {args.lists} files")
+    print(f"  1 workbook (populate_many):  {new:8.1f} ms, 1 file, {len(sheets)} sheets")
+    print(f"✓ {len(duplicates)} duplicate packing lists: distinct sheet titles of at most "
+          f"{CMRExcelPopulator.MAX_SHEET_TITLE} characters")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark: conversion latency - fresh process vs. the warm conversion service
+
+Old: every conversion (CLI run, GUI launch) imports pdfplumber, pdfminer and
+openpyxl and loads the CMR template before it can start.
+New: conversion_service.py keeps warm workers with the template prepared;
+clients only send a request.
+
+Times a cold `python pdf_to_cmr.py` run against single and concurrent
+requests to a service started in this process. Fails (exit 1) if a warm
+request is not faster than the cold run, or if a bad Content-Length
+(not a number, negative, over the upload limit) doesn't get a JSON 400/413
+and a closed connection.
+
+Usage: python benchmarks/bench_service_latency.py [--pages N] [--requests N] [--workers N]
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from conversion_service import (ConversionService, MAX_UPLOAD_BYTES, create_server,
+                                convert_via_service, upload_via_service)
+from synthetic_pdf import make_packing_list
+
+
+def cold_run_ms(pdf_path, work_dir):
+    """A complete CLI conversion in a new Python process"""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(ROOT, "pdf_to_cmr.py"), pdf_path, "--no-cache", "-q"],
+                   cwd=work_dir, check=True, capture_output=True)
+    return (time.perf_counter() - started) * 1000
+
+
+def bad_length_response(port, length):
+    """(status, JSON body) for a POST with this Content-Length and no body -
+    read until the server closes the connection. (None, {}) if it never
+    answers or drops the connection without a response"""
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        sock.sendall(f"POST /convert HTTP/1.1\r\nHost: localhost\r\n"
+                     f"Content-Length: {length}\r\n\r\n".encode('ascii'))
+        response = b''
+        try:
+            while chunk := sock.recv(65536):
+                response += chunk
+        except socket.timeout:
+            return None, {}
+    head, _, body = response.partition(b'\r\n\r\n')
+    if not head:
+        return None, {}
+    return int(head.split()[1]), json.loads(body)
+
+
+def timed_ms(func, *args):
+    started = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--pages', type=int, default=5)
+    parser.add_argument('--requests', type=int, default=16, help="concurrent requests")
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = make_packing_list(os.path.join(tmp, "PL15738.pdf"), args.pages, seed=1)
+        output_dir = os.path.join(tmp, "out")
+        template_path = os.path.join(ROOT, "CTS_NL_CMR_Template.xlsx")
+
+        cold = min(cold_run_ms(pdf_path, tmp) for _ in range(3))
+
+        service = ConversionService(template_path, args.workers, use_cache=False)
+        started = time.perf_counter()
+        service.warm_up()
+        warm_up = (time.perf_counter() - started) * 1000
+
+        server = create_server(service, port=0)
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            by_path = min(timed_ms(convert_via_service, pdf_path, output_dir, url) for _ in range(5))
+            upload = min(timed_ms(upload_via_service, pdf_path, os.path.join(tmp, "up.xlsx"), url)
+                         for _ in range(5))
+
+            with ThreadPoolExecutor(args.requests) as clients:
+                started = time.perf_counter()
+                latencies = list(clients.map(
+                    lambda i: timed_ms(upload_via_service, pdf_path, os.path.join(tmp, f"c{i}.xlsx"), url),
+                    range(args.requests)))
+                wall = (time.perf_counter() - started) * 1000
+
+            bad_lengths = {length: bad_length_response(server.server_address[1], length)
+                           for length in ("abc", "-1", "1e3", str(MAX_UPLOAD_BYTES + 1))}
+        finally:
+            server.shutdown()
+            server.server_close()
+            service.close()
+
+    latencies.sort()
+    print(f"{args.pages}-page packing list, {args.workers} workers:")
+    print(f"  cold CLI process:           {cold:8.0f} ms")
+    print(f"  service warm-up (once):     {warm_up:8.0f} ms")
+    print(f"  service, local path:        {by_path:8.0f} ms")
+    print(f"  service, upload:            {upload:8.0f} ms")
+    print(f"  {args.requests} concurrent uploads:      {wall:8.0f} ms wall, "
+          f"p50 {latencies[len(latencies) // 2]:.0f} ms, max {latencies[-1]:.0f} ms")
+
+    if by_path >= cold:
+        print("✗ Warm service is not faster than a cold run")
+        sys.exit(1)
+    print(f"✓ Warm request {cold / by_path:.0f}x faster than a cold run")
+
+    expected = {"abc": 400, "-1": 400, "1e3": 400, str(MAX_UPLOAD_BYTES + 1): 413}
+    wrong = {length: status for length, (status, body) in bad_lengths.items()
+             if status != expected[length] or 'error' not in body}
+    if wrong:
+        print(f"✗ Bad Content-Length not rejected as expected: {wrong}")
+        sys.exit(1)
+    print("✓ Bad Content-Length rejected with 400/413 and the connection closed")
+
+
+if __name__ == "__main__":
+    main()
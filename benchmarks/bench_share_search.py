@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Benchmark: packing list search on a slow share - old folder walk vs. index
+
+Old: PDFSearcher walked <year>/<project>/Transport on every search, one
+stat/listdir after the other.
+New: PackingListIndex scans with a thread pool, refreshes incrementally and
+answers lookups from memory; project searches only check that project.
+
+A local stand-in share is generated and every os.stat / os.scandir /
+os.listdir is delayed to simulate SMB round trips. Results must match.
+
+Searches must not wait for a refresh that is running on the same index
+(the GUI's start-up refresh): a project + PL search has to finish while
+it is still running, and a cancelled search has to stop right away.
+A packing list renamed after it was indexed must be found under its new name.
+A refresh while the share is unreachable must keep the index (and its file).
+
+Usage: python benchmarks/bench_share_search.py [--years N] [--projects N] [--latency MS]
+"""
+
+import io
+import os
+import sys
+import glob
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+import contextlib
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pl_index import PackingListIndex, matches_pl
+from pdf_to_cmr_gui import PDFSearcher
+
+
+def build_share(root, years, projects, seed=1):
+    """<root>/<year>/<project number> <name>/Transport/*.pdf"""
+    rnd = random.Random(seed)
+    pl_numbers = []
+    for y in range(years):
+        year = str(2025 - y)
+        for p in range(projects):
+            project = f"{20000 + y * projects + p} Customer {p}"
+            transport = os.path.join(root, year, project, "Transport")
+            os.makedirs(transport)
+            for _ in range(rnd.randint(1, 5)):
+                pl = str(rnd.randint(10000, 99999))
+                name = rnd.choice([f"PL{pl}.pdf", f"PL {pl} rev1.pdf", f"Cl{pl}.pdf", "Invoice.pdf"])
+                open(os.path.join(transport, name), 'w').close()
+                if pl in name:
+                    pl_numbers.append((project.split()[0], pl))
+    return pl_numbers
+
+
+@contextlib.contextmanager
+def share_latency(seconds):
+    """Delay every directory round trip, like a network share does"""
+    originals = os.stat, os.scandir, os.listdir
+
+    def slow(func):
+        def wrapper(*args, **kwargs):
+            time.sleep(seconds)
+            return func(*args, **kwargs)
+        return wrapper
+
+    os.stat, os.scandir, os.listdir = (slow(f) for f in originals)
+    try:
+        yield
+    finally:
+        os.stat, os.scandir, os.listdir = originals
+
+
+def legacy_find_by_pl_only(base_path, pl_num):
+    """PDFSearcher.find_by_pl_only as it was before the index"""
+    results = []
+    year_folders = sorted((os.path.join(base_path, item) for item in os.listdir(base_path)
+                           if item.isdigit() and len(item) == 4
+                           and os.path.isdir(os.path.join(base_path, item))), reverse=True)
+    for year_folder in year_folders:
+        for project_folder in [d for d in glob.glob(os.path.join(year_folder, "*")) if os.path.isdir(d)]:
+            transport_folder = os.path.join(project_folder, "Transport")
+            if os.path.exists(transport_folder):
+                for file in os.listdir(transport_folder):
+                    if file.lower().endswith('.pdf') and matches_pl(file, pl_num):
+                        full_path = os.path.join(transport_folder, file)
+                        results.append({'path': full_path, 'filename': file,
+                                        'modified': datetime.fromtimestamp(os.path.getmtime(full_path))})
+    return results
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--years', type=int, default=3)
+    parser.add_argument('--projects', type=int, default=150)
+    parser.add_argument('--latency', type=float, default=2.0, help="ms per directory round trip")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="bench_share_")
+    index_dir = os.path.join(root, "index")
+    share = os.path.join(root, "share")
+    try:
+        pl_numbers = build_share(share, args.years, args.projects)
+        project_num, pl_num = random.Random(7).choice(pl_numbers)
+        print(f"Share: {args.years} years x {args.projects} projects, "
+              f"{args.latency:.1f} ms per round trip")
+
+        with share_latency(args.latency / 1000), contextlib.redirect_stdout(io.StringIO()):
+            old, old_s = timed(legacy_find_by_pl_only, share, pl_num)
+
+            serial = PackingListIndex(share, index_dir=os.path.join(index_dir, "serial"), max_workers=1)
+            _, serial_s = timed(serial.refresh)
+
+            index = PackingListIndex(share, index_dir=index_dir)
+            _, build_s = timed(index.refresh)
+            new, lookup_s = timed(index.find_by_pl, pl_num)
+
+            # One new packing list, then an incremental refresh
+            newest_year = os.path.join(share, max(os.listdir(share)))
+            transport = os.path.join(newest_year, min(os.listdir(newest_year)), "Transport")
+            open(os.path.join(transport, "PL99999.pdf"), 'w').close()
+            _, incremental_s = timed(index.refresh)
+            added = index.find_by_pl("99999")
+
+            # Project + PL on a cold index: only that project's folder is checked
+            cold = PDFSearcher(share)
+            cold._indexes[share] = PackingListIndex(share, index_dir=os.path.join(index_dir, "cold"))
+            targeted, targeted_s = timed(lambda: list(cold.iter_search(project_num, pl_num, threading.Event())))
+
+            # Searches while a cold refresh of the same index runs in another thread
+            busy = PDFSearcher(share)
+            busy_index = PackingListIndex(share, index_dir=os.path.join(index_dir, "busy"), max_workers=1)
+            busy._indexes[share] = busy_index
+            refresher = threading.Thread(target=busy_index.refresh)
+            refresher.start()
+            time.sleep(0.05)
+            during, during_s = timed(lambda: list(busy.iter_search(project_num, pl_num, threading.Event())))
+            refreshing_after_search = refresher.is_alive()
+
+            # A PL-only search re-scans the whole share - cancel it part way
+            cancel = threading.Event()
+            threading.Timer(0.05, cancel.set).start()
+            _, cancel_s = timed(lambda: list(busy.iter_search('', "00000", cancel)))
+            refreshing_after_cancel = refresher.is_alive()
+            refresher.join()
+            after_refresh = busy_index.find_by_pl(pl_num)
+
+            # Rename the packing list after it was indexed: the index hit is stale
+            old_path = new[0]['path']
+            renamed_path = os.path.join(os.path.dirname(old_path), f"PL{pl_num} moved.pdf")
+            os.rename(old_path, renamed_path)
+            searcher = PDFSearcher(share)
+            searcher._indexes[share] = index
+            renamed = [match['path'] for match in searcher.iter_search(project_num, '', threading.Event())]
+
+            # Share unreachable (offline, VPN down): the refresh must keep the index
+            os.rename(share, share + ".offline")
+            index.refresh()
+            offline = index.find_by_pl(pl_num)
+            reloaded = PackingListIndex(share, index_dir=index_dir).find_by_pl(pl_num)
+            os.rename(share + ".offline", share)
+
+        key = lambda results: sorted((r['path'], r['modified']) for r in results)
+        if key(old) != key(new) or len(added) != 1 or not targeted:
+            print("✗ Index results differ from the folder walk")
+            sys.exit(1)
+        print(f"✓ Identical results for PL {pl_num} ({len(new)} files)")
+
+        if not during or key(after_refresh) != key(new):
+            print("✗ Search during a refresh found nothing, or the refresh lost results")
+            sys.exit(1)
+        if not refreshing_after_search or not refreshing_after_cancel or cancel_s > 0.5:
+            print("✗ Search waited for the refresh running on the same index")
+            sys.exit(1)
+        print("✓ Searches during a refresh don't wait for it")
+
+        if renamed_path not in renamed or old_path in renamed:
+            print(f"✗ Stale index hit or renamed packing list missing: {renamed}")
+            sys.exit(1)
+        print("✓ Stale index hit dropped, renamed packing list found")
+
+        if not offline or not reloaded:
+            print("✗ Refresh of an unreachable share emptied the index")
+            sys.exit(1)
+        print("✓ Index kept while the share is unreachable")
+
+        print(f"  old walk, PL only:           {old_s * 1000:8.0f} ms per search")
+        print(f"  index build, 1 thread:       {serial_s * 1000:8.0f} ms (once)")
+        print(f"  index build, {index.max_workers} threads:      {build_s * 1000:8.0f} ms (once)")
+        print(f"  incremental refresh:         {incremental_s * 1000:8.0f} ms")
+        print(f"  index lookup, PL only:       {lookup_s * 1000:8.2f} ms per search")
+        print(f"  project + PL, cold index:    {targeted_s * 1000:8.0f} ms")
+        print(f"  project + PL, during refresh:{during_s * 1000:8.0f} ms")
+        print(f"  cancel after 50 ms:          {cancel_s * 1000:8.0f} ms")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
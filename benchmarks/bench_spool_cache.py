@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: converting a PDF picked from the share - with and without the spool cache
+
+Simulates the P:\\ share: reads of files in the "share" folder are slowed
+to --rtt ms per read plus --mbps network throughput. Times extract() (no
+extraction cache) of a picked search hit, and its PDF read stage:
+  direct      read from the share (no spool cache)
+  cold        spool cache, first time - read from the share and spooled
+  prefetched  the selection dialog was open --dialog-s seconds while the
+              top hits were prefetched in the background
+  repeat      the same PDF converted again - a local read
+Every case must extract the same data.
+
+Usage: python benchmarks/bench_spool_cache.py [--rtt MS] [--mbps N] [--dialog-s S]
+"""
+
+import os
+import sys
+import time
+import builtins
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pdf_source
+from pdf_source import SpoolCache, SpoolPrefetcher
+from pdf_to_cmr import PackingListExtractor
+from stage_timer import StageTimer
+from synthetic_pdf import make_packing_list
+
+TOP_HITS = 5
+
+
+def slow_share(share_dir, rtt_ms, mbps):
+    """open() for pdf_source that delays reads from share_dir like a network share"""
+    def share_open(path, mode='r', *args, **kwargs):
+        if os.path.abspath(path).startswith(share_dir) and 'r' in mode:
+            size = os.path.getsize(path)
+            time.sleep(rtt_ms / 1000 + size * 8 / (mbps * 1_000_000))
+        return builtins.open(path, mode, *args, **kwargs)
+    return share_open
+
+
+def timed(spool_cache=None):
+    """(total ms, PDF read ms, data) of one extract() of the picked PDF"""
+    timer = StageTimer()
+    started = time.perf_counter()
+    data = PackingListExtractor(timed.picked, spool_cache=spool_cache, timer=timer).extract()
+    total_ms = (time.perf_counter() - started) * 1000
+    return total_ms, timer.report()['stages']['pdf_read']['ms'], data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rtt', type=float, default=20, help="ms per read from the share")
+    parser.add_argument('--mbps', type=float, default=20, help="share throughput, Mbit/s")
+    parser.add_argument('--dialog-s', type=float, default=1.0,
+                        help="seconds the selection dialog is open before the pick")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        share_dir = os.path.join(tmp, "share")
+        os.makedirs(share_dir)
+        hits = [make_packing_list(os.path.join(share_dir, f"PL1573{n}.pdf"), 40, seed=n)
+                for n in range(TOP_HITS)]
+        picked = timed.picked = hits[2]
+        pdf_source.open = slow_share(share_dir, args.rtt, args.mbps)
+        try:
+            cache = SpoolCache(os.path.join(tmp, "spool"))
+
+            timed()  # warm up imports
+            results = {}
+            results['direct'] = timed()
+            results['cold'] = timed(cache)
+
+            cache.clear()
+            prefetcher = SpoolPrefetcher(cache)
+            for path in hits:
+                prefetcher.add(path)
+            time.sleep(args.dialog_s)
+            results['prefetched'] = timed(cache)
+            results['repeat'] = timed(cache)
+        finally:
+            del pdf_source.open
+
+        size_kb = os.path.getsize(picked) / 1024
+
+    print(f"Share: {args.rtt:g} ms per read, {args.mbps:g} Mbit/s; {TOP_HITS} hits of "
+          f"~{size_kb:.0f} KB, dialog open {args.dialog_s:g}s")
+    print(f"{'':>12} {'extract':>10} {'PDF read':>10}")
+    direct = results['direct'][2]
+    for case, (total_ms, read_ms, data) in results.items():
+        if data != direct:
+            print(f"✗ {case}: different data")
+            sys.exit(1)
+        print(f"{case:>12} {total_ms:>7.0f} ms {read_ms:>7.1f} ms")
+    print("✓ Same data in every case")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: GUI start-up - eager vs. lazy imports of the converter
+
+Old: pdf_to_cmr_gui imported pdf_to_cmr (pdfplumber, pdfminer, openpyxl)
+and the updater imported packaging before the window was created.
+New: those are imported on first use, after the window is up.
+
+Each measurement runs in a fresh Python process (best of --repeat):
+  import     - importing pdf_to_cmr_gui
+  window     - Tk() + PDFtoCMRApp + first draw (skipped without a display)
+The "eager" rows also import the heavy modules up front, like the old GUI.
+Fails (exit 1) if importing the GUI still loads a heavy module.
+
+Usage: python benchmarks/bench_startup.py [--repeat N]
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ['pdfplumber', 'pdfminer', 'openpyxl', 'packaging']
+
+EAGER_IMPORTS = "import pdf_to_cmr, packaging.version"
+
+CHILD = r'''
+import sys, time, json
+started = time.perf_counter()
+sys.path.insert(0, {root!r})
+{eager}
+import pdf_to_cmr_gui
+imported = time.perf_counter()
+heavy = [m for m in {heavy!r} if m in sys.modules]
+window = None
+if {window}:
+    try:
+        root = pdf_to_cmr_gui.Tk()
+    except pdf_to_cmr_gui.TclError:
+        root = None
+    if root is not None:
+        root.withdraw()
+        pdf_to_cmr_gui.UPDATER_AVAILABLE = False  # no update check in a benchmark
+        app = pdf_to_cmr_gui.PDFtoCMRApp(root)
+        root.deiconify()
+        root.update()
+        window = (time.perf_counter() - started) * 1000
+        root.destroy()
+print(json.dumps({{'import_ms': (imported - started) * 1000, 'window_ms': window,
+                  'heavy': heavy}}))
+'''
+
+
+def run_child(eager, window):
+    code = CHILD.format(root=ROOT, eager=EAGER_IMPORTS if eager else "", window=window,
+                        heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True,
+                            text=True, cwd=ROOT).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def best(runs, key):
+    values = [run[key] for run in runs if run[key] is not None]
+    return min(values) if values else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    lazy = [run_child(eager=False, window=True) for _ in range(args.repeat)]
+    eager = [run_child(eager=True, window=True) for _ in range(args.repeat)]
+
+    print(f"GUI start-up, best of {args.repeat}:")
+    print(f"  {'':<8}{'import ms':>12}{'window ms':>12}")
+    for name, runs in (("eager", eager), ("lazy", lazy)):
+        window = best(runs, 'window_ms')
+        window_text = f"{window:12.0f}" if window is not None else f"{'no display':>12}"
+        print(f"  {name:<8}{best(runs, 'import_ms'):12.0f}{window_text}")
+
+    loaded = sorted({module for run in lazy for module in run['heavy']})
+    if loaded:
+        print(f"✗ Importing the GUI still loads: {', '.join(loaded)}")
+        sys.exit(1)
+    print("✓ No heavy modules loaded before the window")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: peak memory of extraction on a huge packing list
+
+Old: every page's parsed layout stayed cached until the PDF was closed,
+so memory grew with the page count.
+New: iter_boxes() closes each page once its text is read.
+
+Each run happens in a fresh process; the "keep pages" run disables
+page.close() to show the old growth. Fails (exit 1) if streaming
+extraction grows the process by more than --limit MB.
+
+Usage: python benchmarks/bench_streaming_memory.py [--pages N] [--limit MB]
+"""
+
+import io
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def peak_memory_mb():
+    """Peak resident memory of this process so far"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                        ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(),
+                                                 ctypes.byref(counters), counters.cb)
+        return counters.PeakWorkingSetSize / (1024 * 1024)
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def child(pdf_path, keep_pages):
+    """Extract in this process and report memory as JSON"""
+    import pdfplumber
+    from pdf_to_cmr import PackingListExtractor
+
+    if keep_pages:
+        pdfplumber.page.Page.close = lambda self: None
+
+    before = peak_memory_mb()
+    with contextlib.redirect_stdout(io.StringIO()):
+        data = PackingListExtractor(pdf_path).extract()
+    print(json.dumps({'before': before, 'peak': peak_memory_mb(), 'boxes': data['num_boxes']}))
+
+
+def run_child(pdf_path, keep_pages=False):
+    command = [sys.executable, os.path.abspath(__file__), '--child', pdf_path]
+    if keep_pages:
+        command.append('--keep-pages')
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--pages', type=int, default=500)
+    parser.add_argument('--limit', type=float, default=50, help="max growth in MB")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--keep-pages', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.keep_pages)
+        return
+
+    from synthetic_pdf import make_packing_list
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = make_packing_list(os.path.join(tmp, "huge.pdf"), args.pages, seed=1)
+        streaming = run_child(pdf_path)
+        keeping = run_child(pdf_path, keep_pages=True)
+
+    if streaming['boxes'] != args.pages:
+        print(f"✗ Expected {args.pages} boxes, got {streaming['boxes']}")
+        sys.exit(1)
+
+    growth = streaming['peak'] - streaming['before']
+    print(f"{args.pages} pages:")
+    print(f"  pages kept:     +{keeping['peak'] - keeping['before']:7.1f} MB peak")
+    print(f"  pages released: +{growth:7.1f} MB peak")
+
+    if growth > args.limit:
+        print(f"✗ Streaming extraction grew by {growth:.1f} MB (limit {args.limit:.0f} MB)")
+        sys.exit(1)
+    print(f"✓ Within {args.limit:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
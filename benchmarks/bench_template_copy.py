@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: prepared template copy vs. load_workbook() per conversion
+
+Writes a CMR-like template to disk (styles, merged cells, column widths,
+row heights, print area) and converts the same packing lists with:
+  load      load_workbook() + row heights + print settings every time
+  copy      CMRExcelPopulator's prepared template, unpickled per conversion
+The saved workbooks must have the same contents (every part of the .xlsx
+except the document timestamps), for populate() and populate_many().
+
+Usage: python benchmarks/bench_template_copy.py [--repeat N]
+"""
+
+import os
+import sys
+import time
+import zipfile
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Border, Font, Side
+from pdf_to_cmr import PackingListExtractor, CMRExcelPopulator
+from synthetic_pdf import make_packing_list
+
+
+class LoadEveryTime(CMRExcelPopulator):
+    """The populator without the prepared template: parses the file every time"""
+
+    def _load_prepared_template(self):
+        started = time.perf_counter()
+        self.wb = load_workbook(self.template_path)
+        self.ws = self.wb.active
+        self._apply_row_heights()
+        self._apply_print_settings()
+        self._styled_cells = {cell.coordinate for row in self.ws.iter_rows()
+                              for cell in row if cell.value}
+        self.template_timings = {'load_ms': (time.perf_counter() - started) * 1000, 'copy_ms': None}
+        return self.wb
+
+
+def write_template(path):
+    """A CMR form stand-in: labels, boxes, merged cells, widths, heights, print area"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "CMR"
+    thin = Side(style='thin')
+    for row, label in [(2, "1 Sender"), (10, "2 Consignee"), (16, "3 Place of delivery"),
+                       (22, "4 Place and date of taking over"), (29, "6 Marks and numbers"),
+                       (43, "Total"), (88, "Signature and stamp")]:
+        ws.cell(row=row, column=2, value=label).font = Font(name='Arial', size=8, bold=True)
+        ws.merge_cells(start_row=row, start_column=2, end_row=row, end_column=5)
+        for column in range(2, 9):
+            ws.cell(row=row + 1, column=column).border = Border(top=thin)
+    for column, width in zip("ABCDEFGH", (4, 30, 14, 10, 14, 10, 14, 20)):
+        ws.column_dimensions[column].width = width
+    ws.row_dimensions[1].height = 30
+    ws.print_area = "A1:H90"
+    wb.save(path)
+    return path
+
+
+def xlsx_parts(path):
+    """{part name: bytes} without the document timestamps"""
+    with zipfile.ZipFile(path) as archive:
+        return {name: archive.read(name) for name in archive.namelist()
+                if name != "docProps/core.xml"}
+
+
+def timed_ms(fn):
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        template = write_template(os.path.join(tmp, "CMR_Template.xlsx"))
+        data_list = [PackingListExtractor(make_packing_list(os.path.join(tmp, f"PL{n}.pdf"), 3 + n * 10,
+                                                            seed=n, pl_number=15700 + n)).extract()
+                     for n in range(3)]
+
+        cases = [
+            ("populate", lambda cls, out: cls(template).populate(data_list[2], out)),
+            ("populate_many", lambda cls, out: cls(template).populate_many(data_list, out)),
+        ]
+        timings = {}
+        for name, run in cases:
+            load_out, copy_out = os.path.join(tmp, f"load_{name}.xlsx"), os.path.join(tmp, f"copy_{name}.xlsx")
+            load_ms = min(timed_ms(lambda: run(LoadEveryTime, load_out)) for _ in range(args.repeat))
+            copy_ms = min(timed_ms(lambda: run(CMRExcelPopulator, copy_out)) for _ in range(args.repeat))
+            timings[name] = load_ms, copy_ms
+
+            cmr_sheets = [ws for ws in load_workbook(copy_out).worksheets
+                          if ws.title != "Summary" and " Annex " not in ws.title]
+            if not all(ws["B2"].value == "1 Sender" for ws in cmr_sheets):
+                print(f"✗ {name}: the template was not used")
+                sys.exit(1)
+            load_parts, copy_parts = xlsx_parts(load_out), xlsx_parts(copy_out)
+            differing = sorted(part for part in load_parts.keys() | copy_parts.keys()
+                               if load_parts.get(part) != copy_parts.get(part))
+            if differing:
+                print(f"✗ {name}: template copy output differs from load_workbook in {differing}")
+                sys.exit(1)
+
+    print(f"Template on disk, best of {args.repeat}:")
+    print(f"{'':>15} {'load ms':>9} {'copy ms':>9}")
+    for name, (load_ms, copy_ms) in timings.items():
+        print(f"{name:>15} {load_ms:>9.1f} {copy_ms:>9.1f}")
+    print("✓ Same workbook contents as load_workbook() for populate and populate_many")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: extraction, Excel population and end-to-end conversion
+
+Generates synthetic packing lists (see synthetic_pdf.py) at several page
+counts and times, best of --repeat:
+  extract   PackingListExtractor.extract(), no extraction cache
+  populate  CMRExcelPopulator.populate() on the extracted data
+  total     both, one after the other, with fresh objects
+
+Results are compared with the baseline stored for this machine in
+baselines.json; a case that got slower than the allowed tolerance is
+reported and the run exits 1. Timings only compare on the same machine, so
+baselines are kept per machine + Python version.
+
+Usage: python benchmarks/run_benchmarks.py [--pages N ...] [--repeat N]
+                                           [--template PATH] [--save-baseline]
+                                           [--tolerance PCT]
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pdf_to_cmr import PackingListExtractor, CMRExcelPopulator
+from synthetic_pdf import make_packing_list
+
+PAGE_COUNTS = [1, 10, 50, 200]
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+DEFAULT_TEMPLATE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "CTS_NL_CMR_Template.xlsx")
+
+# Differences below this are timer noise, whatever the percentage
+NOISE_FLOOR_MS = 5.0
+
+
+def machine_key():
+    return f"{platform.node()} / {platform.system()} / Python {platform.python_version()}"
+
+
+def best_of(fn, repeat):
+    """(best time in ms, last result)"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def run_case(tmp, pages, template_path, repeat):
+    """{'extract': ms, 'populate': ms, 'total': ms} for one page count"""
+    pdf_path = make_packing_list(os.path.join(tmp, f"PL{pages}.pdf"), pages, seed=pages)
+    output_path = os.path.join(tmp, f"CMR_PL{pages}.xlsx")
+
+    def convert():
+        data = PackingListExtractor(pdf_path).extract()
+        CMRExcelPopulator(template_path).populate(data, output_path)
+        return data
+
+    convert()  # warm up (imports, prepared template)
+
+    extract_ms, data = best_of(lambda: PackingListExtractor(pdf_path).extract(), repeat)
+    if data['num_boxes'] != pages:
+        raise RuntimeError(f"{pages}-page list: expected {pages} boxes, got {data['num_boxes']}")
+
+    populate_ms, _ = best_of(lambda: CMRExcelPopulator(template_path).populate(data, output_path), repeat)
+    total_ms, _ = best_of(convert, repeat)
+    return {'extract': extract_ms, 'populate': populate_ms, 'total': total_ms}
+
+
+def load_baselines():
+    try:
+        with open(BASELINE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baselines(baselines):
+    with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(results, baseline, tolerance):
+    """Lines for the cases that got slower than baseline * (1 + tolerance)"""
+    regressions = []
+    for case, timings in results.items():
+        for stage, ms in timings.items():
+            old = baseline.get('cases', {}).get(case, {}).get(stage)
+            if old is None:
+                continue
+            if ms > old * (1 + tolerance) and ms - old > NOISE_FLOOR_MS:
+                regressions.append(f"{case} {stage}: {ms:.1f} ms vs. baseline {old:.1f} ms "
+                                   f"(+{(ms - old) / old:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--pages', type=int, nargs='+', default=PAGE_COUNTS)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--template', default=DEFAULT_TEMPLATE,
+                        help="CMR template (a blank workbook is generated if it doesn't exist)")
+    parser.add_argument('--tolerance', type=float, default=25,
+                        help="allowed slowdown against the baseline, in percent")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="store these results as this machine's baseline")
+    args = parser.parse_args()
+
+    template = os.path.basename(args.template) if os.path.exists(args.template) else "blank workbook"
+    print(f"Machine: {machine_key()}")
+    print(f"Template: {template}, best of {args.repeat}")
+    print(f"{'case':>10} {'extract ms':>11} {'populate ms':>12} {'total ms':>10}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            case = f"{pages}p"
+            results[case] = run_case(tmp, pages, args.template, args.repeat)
+            timings = results[case]
+            print(f"{case:>10} {timings['extract']:>11.1f} {timings['populate']:>12.1f} {timings['total']:>10.1f}")
+
+    baselines = load_baselines()
+    key = machine_key()
+
+    if args.save_baseline:
+        baseline = baselines.setdefault(key, {'template': template, 'cases': {}})
+        if baseline.get('template') != template:
+            baseline.update(template=template, cases={})
+        baseline['cases'].update(results)
+        save_baselines(baselines)
+        print(f"✓ Baseline saved to {BASELINE_PATH}")
+        return
+
+    baseline = baselines.get(key)
+    if baseline is None:
+        print("No baseline for this machine yet - run with --save-baseline first")
+        return
+    if baseline.get('template') != template:
+        print(f"Baseline was taken with {baseline.get('template')}, not {template} - not compared")
+        return
+
+    regressions = compare(results, baseline, args.tolerance / 100)
+    if regressions:
+        print(f"\n✗ {len(regressions)} REGRESSION(S) against the baseline (tolerance {args.tolerance:.0f}%):")
+        for line in regressions:
+            print(f"  ✗ {line}")
+        sys.exit(1)
+    print(f"✓ No regressions against the baseline (tolerance {args.tolerance:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Synthetic CTS packing-list PDFs for the benchmarks
+
+Writes small text-only PDFs (Helvetica, no external dependencies) laid out
+like the Navision packing lists: header + consignee block on page 1 and
+one "Wooden box (n)" / "Pallet(n)" page per collo.
+
+Also a corpus generator for trying the converter on many lists:
+    python benchmarks/synthetic_pdf.py ./corpus --pages 1 5 20 100 --count 10
+"""
+
+import os
+import random
+import zlib
+import argparse
+from typing import List, Optional, Tuple
+
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+
+CONSIGNEES = [
+    ["Oman Oil Refineries LLC", "P.O. Box 3568", "Muscat 100", "Al Mina Street", "Sultanate of Oman"],
+    ["Saudi Aramco Procurement", "Building 12, Dhahran Road", "Dhahran 31311", "Eastern Province", "Kingdom of Saudi Arabia"],
+    ["Qatar Petroleum", "Salwa Road 45", "Doha 3212", "Industrial Area", "Qatar"],
+    ["BASF SE Logistik", "Carl-Bosch-Strasse 38", "Ludwigshafen 67056", "Werkstor 3", "Germany"],
+]
+
+PACKAGE_TYPES = ["Wooden box ({n})", "Pallet({n})", "Case {n}", "Crate ({n})", "Carton box {n}"]
+
+ITEMS = [
+    ("Ball valve 2\" class 300", "HS 84818081"),
+    ("Gate valve 6\" class 600", "HS 84818099"),
+    ("Pressure transmitter", "HS 90262020"),
+    ("Spare parts kit", "HS 84819000"),
+    ("Actuator pneumatic", "HS 84123100"),
+]
+
+# (x, y, text) - y from the bottom like PDF user space
+Line = Tuple[float, float, str]
+
+# ToUnicode CMap for shifted_codes: each code is the ASCII code + 1
+SHIFTED_TO_UNICODE = b"""/CIDInit /ProcSet findresource begin
+12 dict begin
+begincmap
+/CMapName /Shifted def
+/CMapType 2 def
+1 begincodespacerange
+<00> <FF>
+endcodespacerange
+1 beginbfrange
+<21> <7F> <0020>
+endbfrange
+endcmap
+CMapName currentdict /CMap defineresource pop
+end
+end"""
+
+
+def _escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def _content_stream(lines: List[Line], font_size: int = 9, shifted_codes: bool = False) -> bytes:
+    ops = []
+    for x, y, text in lines:
+        if shifted_codes:
+            text = "".join(chr(ord(char) + 1) for char in text)
+        ops.append(f"BT /F1 {font_size} Tf {x:.1f} {y:.1f} Td ({_escape(text)}) Tj ET")
+    return "\n".join(ops).encode('latin-1')
+
+
+def header_lines(pl_number: int, page_suffix: int, consignee: List[str],
+                 our_ref: str, your_ref: str) -> List[Line]:
+    lines = [
+        (320, 800, f"Packing List {pl_number}-{page_suffix}"),
+        (320, 785, "Barendrecht, 04-09-2023"),
+        (320, 770, f"Your ref.: {your_ref}"),
+        (320, 755, f"Our ref.: {our_ref}"),
+        (320, 740, "Delivery EXW Barendrecht"),
+        (320, 725, "Country of origin: Netherlands"),
+        (40, 800, "CTS Netherlands B.V."),
+        (40, 785, "Riga 10, 2993 LW Barendrecht"),
+        (40, 750, "Consignee address"),
+    ]
+    for i, text in enumerate(consignee):
+        lines.append((40, 735 - i * 13, text))
+    lines.append((40, 655, "Tel.: +968 2456 1234    Fax: +968 2456 1235"))
+    return lines
+
+
+def collo_lines(package: str, dims: str, weight: int, rng: random.Random,
+                top: float = 620) -> List[Line]:
+    lines = [
+        (40, top, package),
+        (40, top - 15, f"Measurement: {dims} cm"),
+        (300, top - 15, f"Gross weight: {weight:,} KG"),
+        (300, top - 30, f"Net weight: {int(weight * 0.8):,} KG"),
+        (40, top - 55, "Description"),
+        (300, top - 55, "Article no."),
+        (450, top - 55, "Qty"),
+    ]
+    y = top - 70
+    for i in range(rng.randint(4, 12)):
+        description, hs_code = rng.choice(ITEMS)
+        lines.append((40, y, description))
+        lines.append((300, y, f"{rng.randint(100000, 999999)}  {hs_code}"))
+        lines.append((450, y, f"{rng.randint(1, 40)} PCS"))
+        y -= 13
+    return lines
+
+
+def build_pages(num_colli: int, seed: int = 1, pl_number: int = 15738,
+                continuation_every: int = 0) -> List[List[Line]]:
+    """Page layouts: page 1 = header + collo 1, then one page per collo.
+
+    continuation_every > 0 inserts an items-only page after every n-th collo.
+    """
+    rng = random.Random(seed)
+    consignee = rng.choice(CONSIGNEES)
+    our_ref = str(rng.randint(10000, 99999))
+    your_ref = f"PO {rng.randint(4500000000, 4599999999)}"
+
+    pages = []
+    for n in range(1, max(1, num_colli) + 1):
+        package = rng.choice(PACKAGE_TYPES).format(n=n)
+        dims = f"{rng.choice([120, 100, 80, 240])} x {rng.choice([80, 100, 120])} x {rng.randint(40, 220)}"
+        weight = rng.randint(80, 4800)
+
+        if n == 1:
+            page = header_lines(pl_number, n, consignee, our_ref, your_ref)
+            page += collo_lines(package, dims, weight, rng)
+        else:
+            page = [(320, 800, f"Packing List {pl_number}-{n}")]
+            page += collo_lines(package, dims, weight, rng, top=760)
+        pages.append(page)
+
+        if continuation_every and n % continuation_every == 0:
+            page = [(40, 800, "Continued - items")]
+            y = 780
+            for _ in range(30):
+                description, hs_code = rng.choice(ITEMS)
+                page.append((40, y, description))
+                page.append((300, y, hs_code))
+                y -= 13
+            pages.append(page)
+
+    return pages
+
+
+def write_pdf(path: str, pages: List[List[Line]], compress: bool = True,
+              shifted_codes: bool = False) -> str:
+    """Write the page layouts as a minimal PDF file
+
+    shifted_codes: show every character with the next code and give the
+    font a ToUnicode CMap that maps it back - like subset fonts with their
+    own codes, the text is only readable through the CMap.
+    """
+    objects: List[Optional[bytes]] = [None, None, None]  # 1 catalog, 2 pages, 3 font
+    page_ids = []
+
+    for lines in pages:
+        data = _content_stream(lines, shifted_codes=shifted_codes)
+        if compress:
+            data = zlib.compress(data)
+            stream_dict = f"<< /Length {len(data)} /Filter /FlateDecode >>".encode()
+        else:
+            stream_dict = f"<< /Length {len(data)} >>".encode()
+        objects.append(stream_dict + b"\nstream\n" + data + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>".encode()
+        )
+        page_ids.append(len(objects))
+
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+    font = b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding"
+    if shifted_codes:
+        objects.append(f"<< /Length {len(SHIFTED_TO_UNICODE)} >>\nstream\n".encode()
+                       + SHIFTED_TO_UNICODE + b"\nendstream")
+        font += f" /ToUnicode {len(objects)} 0 R".encode()
+    objects[2] = font + b" >>"
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+
+    xref_offset = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += (f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n").encode()
+
+    with open(path, 'wb') as f:
+        f.write(out)
+    return path
+
+
+def make_packing_list(path: str, num_colli: int, seed: int = 1,
+                      continuation_every: int = 0, pl_number: int = 15738,
+                      shifted_codes: bool = False) -> str:
+    """Write a CTS-style packing list with num_colli collo pages"""
+    return write_pdf(path, build_pages(num_colli, seed=seed, pl_number=pl_number,
+                                       continuation_every=continuation_every),
+                     shifted_codes=shifted_codes)
+
+
+def make_corpus(directory: str, page_counts: List[int], per_size: int = 1,
+                seed: int = 1, continuation_every: int = 0) -> List[str]:
+    """Write per_size packing lists for every page count, named PL<number>.pdf"""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    pl_number = 15000
+    for num_colli in page_counts:
+        for i in range(per_size):
+            pl_number += 1
+            path = os.path.join(directory, f"PL{pl_number}.pdf")
+            paths.append(make_packing_list(path, num_colli, seed=seed + pl_number,
+                                           continuation_every=continuation_every,
+                                           pl_number=pl_number))
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a corpus of synthetic CTS packing lists")
+    parser.add_argument('directory')
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 5, 20, 100],
+                        help="collo pages per packing list (one size per value)")
+    parser.add_argument('--count', type=int, default=1, help="packing lists per size")
+    parser.add_argument('--continuation-every', type=int, default=0,
+                        help="insert an items-only page after every n-th collo")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    paths = make_corpus(args.directory, args.pages, args.count, args.seed, args.continuation_every)
+    print(f"Wrote {len(paths)} packing lists to {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -32,7 +32,7 @@ REM Build using spec file if it exists, otherwise use command line
 if exist "CTS_CMR_Converter.spec" (
     pyinstaller CTS_CMR_Converter.spec
 ) else (
-    pyinstaller --name "CTS_CMR_Converter" --onefile --windowed --add-data "pdf_to_cmr.py;." --add-data "updater.py;." pdf_to_cmr_gui.py
+    pyinstaller --name "CTS_CMR_Converter" --onefile --windowed --add-data "pdf_to_cmr.py;." --add-data "updater.py;." --add-data "batch_convert.py;." --add-data "extraction_cache.py;." --add-data "pl_index.py;." --add-data "stage_timer.py;." --add-data "pdf_source.py;." --add-data "conversion_service.py;." pdf_to_cmr_gui.py
 )
 
 if errorlevel 1 (
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Local conversion service for CTS CMR Converter
+Keeps a pool of warm worker processes (pdfplumber/openpyxl imported, CMR
+template prepared) behind a small HTTP API on localhost, so the GUI and
+other tools get a CMR without paying the start-up and template load cost
+on every conversion.
+
+API:
+    GET  /health
+        {"status": "ok", "workers": n, "template": "..."}
+    POST /convert?filename=PL15738.pdf        (body: the PDF, application/pdf)
+        -> the CMR .xlsx
+    POST /convert                              (body: JSON)
+        {"path": "C:\\...\\PL15738.pdf"}                    -> the CMR .xlsx
+        {"path": "...", "output_dir": "C:\\...\\cmr_output"} -> JSON result,
+            the CMR is written into output_dir
+        Only from this computer (loopback) - remote clients upload the PDF.
+    Conversion errors are answered with 422 and {"error": "..."}.
+
+The client helpers at the bottom only need the standard library, so the
+GUI can try the service first without importing the converter.
+"""
+
+import os
+import sys
+import json
+import shutil
+import logging
+import argparse
+import tempfile
+import ipaddress
+import http.client
+import multiprocessing
+import urllib.error
+import urllib.parse
+import urllib.request
+from typing import Dict, Optional, Tuple
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_URL = os.environ.get("CTS_CMR_SERVICE_URL", f"http://{DEFAULT_HOST}:{DEFAULT_PORT}")
+
+# Packing lists are a few hundred KB - anything this big is a mistake
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+logger = logging.getLogger("conversion_service")
+logger.addHandler(logging.NullHandler())
+
+
+class ConversionService:
+    """Warm process pool that converts PDFs with a prepared template"""
+
+    def __init__(self, template_path: Optional[str] = None, max_workers: Optional[int] = None,
+                 use_cache: bool = True):
+        from concurrent.futures import ProcessPoolExecutor
+        from batch_convert import DEFAULT_TEMPLATE, _init_worker
+
+        self.template_path = template_path or DEFAULT_TEMPLATE
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.use_cache = use_cache
+        self.spool_dir = tempfile.mkdtemp(prefix="cts_cmr_service_")
+        self.pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                        initargs=(True, self.template_path))
+
+    def warm_up(self):
+        """Start every worker now (imports + template) instead of on the first requests"""
+        futures = [self.pool.submit(os.getpid) for _ in range(self.max_workers)]
+        for future in futures:
+            future.result()
+
+    def convert(self, pdf_path: str, output_dir: str) -> Dict:
+        """convert_one() result - see batch_convert"""
+        from batch_convert import convert_one
+
+        os.makedirs(output_dir, exist_ok=True)
+        return self.pool.submit(convert_one, pdf_path, output_dir,
+                                self.template_path, self.use_cache).result()
+
+    def convert_to_bytes(self, pdf_path: str) -> Tuple[Dict, Optional[bytes]]:
+        """Convert into a scratch folder and return the CMR's contents"""
+        work_dir = tempfile.mkdtemp(dir=self.spool_dir)
+        try:
+            result = self.convert(pdf_path, work_dir)
+            if not result['success']:
+                return result, None
+            with open(result['output_path'], 'rb') as f:
+                return result, f.read()
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def convert_upload(self, pdf_bytes: bytes, filename: str) -> Tuple[Dict, Optional[bytes]]:
+        """Convert PDF contents sent by a client"""
+        upload_dir = tempfile.mkdtemp(dir=self.spool_dir)
+        try:
+            pdf_path = os.path.join(upload_dir, filename)
+            with open(pdf_path, 'wb') as f:
+                f.write(pdf_bytes)
+            return self.convert_to_bytes(pdf_path)
+        finally:
+            shutil.rmtree(upload_dir, ignore_errors=True)
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+        shutil.rmtree(self.spool_dir, ignore_errors=True)
+
+
+def _make_handler():
+    from http.server import BaseHTTPRequestHandler
+
+    class ConversionRequestHandler(BaseHTTPRequestHandler):
+        """Routes requests to the server's ConversionService"""
+
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            if urllib.parse.urlsplit(self.path).path != "/health":
+                return self._send_json(404, {'error': "Not found"})
+            service = self.server.service
+            self._send_json(200, {'status': 'ok', 'workers': service.max_workers,
+                                  'template': service.template_path})
+
+        def do_POST(self):
+            url = urllib.parse.urlsplit(self.path)
+            if url.path != "/convert":
+                return self._send_json(404, {'error': "Not found"})
+
+            # Checked before anything is read: the body isn't read on a bad
+            # length, so the connection is closed instead of reused
+            length = (self.headers.get('Content-Length') or '0').strip()
+            if not (length.isascii() and length.isdigit()):
+                self.close_connection = True
+                return self._send_json(400, {'error': f"Bad request: invalid Content-Length {length!r}"})
+            if int(length) > MAX_UPLOAD_BYTES:
+                self.close_connection = True
+                return self._send_json(413, {'error': f"Upload larger than {MAX_UPLOAD_BYTES} bytes"})
+            body = self.rfile.read(int(length))
+
+            content_type = (self.headers.get('Content-Type') or '').split(';')[0].strip().lower()
+            try:
+                if content_type == 'application/json':
+                    self._convert_path(json.loads(body.decode('utf-8') or '{}'))
+                else:
+                    query = urllib.parse.parse_qs(url.query)
+                    self._convert_upload(body, query.get('filename', ['packing_list.pdf'])[0])
+            except ValueError as e:
+                self._send_json(400, {'error': f"Bad request: {e}"})
+            except Exception as e:
+                logger.exception("Conversion request failed")
+                self._send_json(500, {'error': str(e)})
+
+        def _convert_path(self, request: Dict):
+            # Paths are read and written as the service's user - never for other computers
+            if not _is_loopback(self.client_address[0]):
+                return self._send_json(403, {'error': "Path requests are only accepted from this "
+                                                      "computer - upload the PDF instead"})
+            pdf_path = request.get('path')
+            if not pdf_path:
+                raise ValueError("'path' is required")
+            if not os.path.isfile(pdf_path):
+                return self._send_json(404, {'error': f"File not found: {pdf_path}"})
+
+            service = self.server.service
+            if request.get('output_dir'):
+                result = service.convert(pdf_path, request['output_dir'])
+                return self._send_json(200 if result['success'] else 422, _public_result(result))
+
+            result, xlsx = service.convert_to_bytes(pdf_path)
+            self._send_result(result, xlsx)
+
+        def _convert_upload(self, body: bytes, filename: str):
+            if not body.startswith(b'%PDF'):
+                raise ValueError("body is not a PDF")
+            filename = os.path.basename(filename.replace('\\', '/')) or 'packing_list.pdf'
+            if not filename.lower().endswith('.pdf'):
+                filename += '.pdf'
+            result, xlsx = self.server.service.convert_upload(body, filename)
+            self._send_result(result, xlsx)
+
+        def _send_result(self, result: Dict, xlsx: Optional[bytes]):
+            if xlsx is None:
+                return self._send_json(422, _public_result(result))
+            self.send_response(200)
+            self.send_header('Content-Type', XLSX_CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(xlsx)))
+            self.send_header('Content-Disposition',
+                             f'attachment; filename="{os.path.basename(result["output_path"])}"')
+            self.send_header('X-CMR-Boxes', str(result['num_boxes']))
+            self.send_header('X-CMR-Gross-Weight', str(result['total_gross_weight']))
+            self.end_headers()
+            self.wfile.write(xlsx)
+
+        def _send_json(self, status: int, payload: Dict):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.info("%s - %s", self.address_string(), format % args)
+
+    return ConversionRequestHandler
+
+
+def _is_loopback(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    if getattr(ip, 'ipv4_mapped', None):
+        ip = ip.ipv4_mapped
+    return ip.is_loopback
+
+
+def _public_result(result: Dict) -> Dict:
+    """convert_one() result without the per-stage timings"""
+    return {key: value for key, value in result.items() if key != 'stages'}
+
+
+def create_server(service: ConversionService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+    """ThreadingHTTPServer bound to host:port - one thread per request, the pool does the work"""
+    from http.server import ThreadingHTTPServer
+
+    server = ThreadingHTTPServer((host, port), _make_handler())
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+# ---------------------------------------------------------------------- client
+
+def service_available(url: str = DEFAULT_URL, timeout: float = 0.5) -> bool:
+    """True if a conversion service answers at url"""
+    try:
+        with urllib.request.urlopen(f"{url}/health", timeout=timeout) as response:
+            return response.status == 200
+    except (OSError, ValueError):
+        return False
+
+
+def convert_via_service(pdf_path: str, output_dir: str, url: str = DEFAULT_URL,
+                        timeout: float = 120, connect_timeout: float = 0.5) -> Optional[Dict]:
+    """
+    Convert a local PDF with a running service, writing the CMR into output_dir.
+
+    Returns the conversion result ({'success', 'output_path', 'error', ...}
+    like batch_convert.convert_one), or None if the service can't be used -
+    not running (no connection within connect_timeout), no answer within
+    timeout, or an answer that isn't a result. The caller then converts
+    in-process.
+    """
+    body = json.dumps({'path': os.path.abspath(pdf_path),
+                       'output_dir': os.path.abspath(output_dir)}).encode('utf-8')
+    parts = urllib.parse.urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=connect_timeout)
+    try:
+        connection.connect()
+        connection.sock.settimeout(timeout)  # the conversion itself may take a while
+        connection.request('POST', f"{parts.path.rstrip('/')}/convert", body,
+                           {'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        status, payload = response.status, response.read()
+    except (OSError, ValueError):
+        return None  # not running, hung or broke off
+    finally:
+        connection.close()
+
+    try:
+        result = json.loads(payload.decode('utf-8'))
+    except ValueError:
+        result = None
+    if status == 200 and isinstance(result, dict):
+        return result
+    if status == 200:
+        return None  # not a conversion service
+
+    error = result.get('error') if isinstance(result, dict) else None
+    return {'pdf_path': pdf_path, 'output_path': None, 'success': False,
+            'error': error or f"Conversion service error {status}"}
+
+
+def upload_via_service(pdf_path: str, output_path: str, url: str = DEFAULT_URL,
+                       timeout: float = 120):
+    """Send the PDF's contents to a (possibly remote) service and save the CMR it returns"""
+    with open(pdf_path, 'rb') as f:
+        pdf_bytes = f.read()
+    query = urllib.parse.urlencode({'filename': os.path.basename(pdf_path)})
+    request = urllib.request.Request(f"{url}/convert?{query}", data=pdf_bytes,
+                                     headers={'Content-Type': 'application/pdf'})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            xlsx = response.read()
+    except urllib.error.HTTPError as e:
+        try:
+            error = json.loads(e.read().decode('utf-8')).get('error')
+        except ValueError:
+            error = None
+        raise Exception(error or f"Conversion service error {e.code}")
+
+    with open(output_path, 'wb') as f:
+        f.write(xlsx)
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Serve PDF to CMR conversions on localhost")
+    parser.add_argument('--host', default=DEFAULT_HOST,
+                        help=f"Address to listen on (default: {DEFAULT_HOST}, this computer only). "
+                             "Other computers can only upload PDFs, not convert by path")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--template', default=None, help="CMR template path")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Re-parse every PDF instead of using the extraction cache")
+    args = parser.parse_args()
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s", datefmt="%Y-%m-%d %H:%M:%S"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+    service = ConversionService(args.template, args.workers, use_cache=not args.no_cache)
+    server = None
+    try:
+        service.warm_up()
+        server = create_server(service, args.host, args.port)
+        logger.info("Conversion service on http://%s:%d - %d warm workers, template %s",
+                    args.host, server.server_address[1], service.max_workers, service.template_path)
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Stopped")
+    finally:
+        if server is not None:
+            server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,115 @@
+"""
+Extraction cache for CTS CMR Converter
+Stores extracted packing list data on disk, keyed by PDF content hash
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+# Cache location (per user, survives restarts)
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cts_cmr_converter", "extraction_cache")
+
+# Entries are a few KB each - 20 MB holds thousands of packing lists
+DEFAULT_MAX_BYTES = 20 * 1024 * 1024
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """On-disk cache of PackingListExtractor results with size-based LRU eviction
+
+    Each entry is one JSON file named <sha256>-v<extractor version>.json.
+    A hit touches the file, so the modified time is the last-used time and
+    eviction removes the least recently used entries first.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, digest: str, version) -> str:
+        return os.path.join(self.cache_dir, f"{digest}-v{version}.json")
+
+    def get(self, digest: str, version) -> Optional[Dict]:
+        """Cached data for this PDF hash + extractor version, or None"""
+        path = self._entry_path(digest, version)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return data
+
+    def put(self, digest: str, version, data: Dict):
+        """Store data for this PDF hash + extractor version"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._entry_path(digest, version)
+
+        # Write to a temp file first so a crash never leaves half an entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        total_size = 0
+
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+
+        for name in names:
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_size += stat.st_size
+
+        if total_size <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
+            if total_size <= self.max_bytes:
+                break
+
+    def clear(self):
+        """Remove all entries"""
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+
+        for name in names:
+            if name.endswith('.json') or name.endswith('.tmp'):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
@@ -0,0 +1,259 @@
+"""
+PDF input for CTS CMR Converter
+Reads a packing list PDF once - from the P:\\ share that is one trip over
+the network - and serves everything from that copy: the content hash for
+the extraction cache, the PDF parser, and a memory-mapped local spool file
+for worker processes that parse the same PDF.
+
+PDFs picked from the share again and again (the GUI) can be kept in a local
+SpoolCache, which a SpoolPrefetcher fills in the background.
+"""
+
+import io
+import os
+import mmap
+import queue
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Dict, Optional
+
+# Spool cache location (per user, survives restarts)
+DEFAULT_SPOOL_DIR = os.path.join(os.path.expanduser("~"), ".cts_cmr_converter", "pdf_spool")
+
+# Packing lists are a few hundred KB - 200 MB holds the recent ones of many projects
+DEFAULT_SPOOL_MAX_BYTES = 200 * 1024 * 1024
+
+logger = logging.getLogger("pdf_source")
+logger.addHandler(logging.NullHandler())
+
+
+class PDFSource:
+    """The contents of one PDF file, read once
+
+    data     the file's bytes (from spool_cache if given)
+    sha256   content hash (same as extraction_cache.file_sha256)
+    stream() file object over data for pdfplumber.open - shares the bytes
+    spool()  path of a local copy for worker processes (written on first
+             use, removed by close()) - workers map it with open_spool()
+    """
+
+    def __init__(self, path: str, spool_cache: Optional['SpoolCache'] = None):
+        self.path = path
+        if spool_cache is not None:
+            self.data = spool_cache.read(path)
+        else:
+            with open(path, 'rb') as f:
+                self.data = f.read()
+        self.sha256 = hashlib.sha256(self.data).hexdigest()
+        self._spool_path: Optional[str] = None
+
+    def stream(self) -> io.BytesIO:
+        # BytesIO shares an initial bytes object until it is written to
+        return io.BytesIO(self.data)
+
+    def spool(self) -> str:
+        """Local copy of the PDF - worker processes read this instead of the original"""
+        if self._spool_path is None:
+            fd, path = tempfile.mkstemp(prefix="cts_cmr_spool_", suffix=".pdf")
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self.data)
+            self._spool_path = path
+        return self._spool_path
+
+    def close(self):
+        """Remove the spool file (the workers must be done with it)"""
+        if self._spool_path is not None:
+            try:
+                os.remove(self._spool_path)
+            except OSError:
+                pass  # still mapped somewhere (Windows) - the temp folder cleanup gets it
+            self._spool_path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_spool(spool_path: str) -> mmap.mmap:
+    """Read-only memory map of a spool file, usable as a file object for pdfplumber.open.
+
+    Every process that maps the file shares the same pages of the OS file cache.
+    """
+    with open(spool_path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class SpoolCache:
+    """Local read-through copies of PDFs on the share, with size-based LRU eviction
+
+    Each entry is one file named after the PDF's path, size and modified
+    time, so a PDF that is saved again gets a new entry and the old one
+    ages out. A hit touches the file, so the modified time is the last-used
+    time and eviction removes the least recently used entries first.
+    """
+
+    def __init__(self, spool_dir: str = DEFAULT_SPOOL_DIR,
+                 max_bytes: int = DEFAULT_SPOOL_MAX_BYTES):
+        self.spool_dir = spool_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._fetching: Dict[str, threading.Event] = {}  # entry path -> set when its copy is done
+
+    def _entry_path(self, path: str, stat: os.stat_result) -> str:
+        key = f"{os.path.normcase(os.path.abspath(path))}\0{stat.st_size}\0{stat.st_mtime_ns}"
+        return os.path.join(self.spool_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + ".pdf")
+
+    def contains(self, path: str) -> bool:
+        """True if the current version of the PDF is spooled"""
+        try:
+            return os.path.exists(self._entry_path(path, os.stat(path)))
+        except OSError:
+            return False
+
+    def read(self, path: str) -> bytes:
+        """The PDF's contents - from the local copy if it is current, else from
+        the original (which is then spooled). Waits for a prefetch of the
+        same PDF that is under way instead of reading it a second time.
+        """
+        stat = os.stat(path)
+        entry = self._entry_path(path, stat)
+
+        with self._lock:
+            fetching = self._fetching.get(entry)
+            owner = fetching is None
+            if owner:
+                fetching = self._fetching[entry] = threading.Event()
+        if not owner:
+            fetching.wait()
+
+        try:
+            data = self._read_entry(entry)
+            if data is None:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                if len(data) == stat.st_size:  # not spooled while it is being written
+                    self._store(entry, data)
+            return data
+        finally:
+            if owner:
+                with self._lock:
+                    del self._fetching[entry]
+                fetching.set()
+
+    def prefetch(self, path: str):
+        """Spool the PDF now so a later read() is local"""
+        self.read(path)
+
+    def _read_entry(self, entry: str) -> Optional[bytes]:
+        try:
+            with open(entry, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        try:
+            os.utime(entry)  # mark as recently used
+        except OSError:
+            pass
+        return data
+
+    def _store(self, entry: str, data: bytes):
+        # Write to a temp file first so a crash never leaves half an entry
+        tmp_path = f"{entry}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.spool_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, entry)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return  # spooling is only an optimisation
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        total_size = 0
+
+        try:
+            names = os.listdir(self.spool_dir)
+        except OSError:
+            return
+
+        for name in names:
+            if not name.endswith('.pdf'):
+                continue
+            path = os.path.join(self.spool_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_size += stat.st_size
+
+        if total_size <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
+            if total_size <= self.max_bytes:
+                break
+
+    def clear(self):
+        """Remove all entries"""
+        try:
+            names = os.listdir(self.spool_dir)
+        except OSError:
+            return
+
+        for name in names:
+            if name.endswith('.pdf') or name.endswith('.tmp'):
+                try:
+                    os.remove(os.path.join(self.spool_dir, name))
+                except OSError:
+                    pass
+
+
+class SpoolPrefetcher:
+    """Spools PDFs into a SpoolCache on a background thread, in the order they were added"""
+
+    def __init__(self, cache: SpoolCache):
+        self.cache = cache
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, path: str):
+        self._queue.put(path)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def clear(self):
+        """Drop the PDFs that are still waiting (the one being copied finishes)"""
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def _run(self):
+        while True:
+            path = self._queue.get()
+            try:
+                self.cache.prefetch(path)
+            except OSError:
+                pass  # gone or unreadable - converting it will report that
+            except Exception:
+                # Keep the thread alive - prefetching is only an optimisation
+                logger.debug("Prefetch of %s failed", path, exc_info=True)
@@ -13,117 +13,332 @@ Fixed Issues:
 import re
 import sys
 import os
+import time
+import pickle
+import logging
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
+from operator import itemgetter
+from typing import Dict, Iterator, List, Optional
 import pdfplumber
+from pdfplumber.utils.text import WordExtractor
+from pdfminer.layout import LTChar, LTContainer
+from pdfminer.pdftypes import resolve1
+from pdfminer.psparser import LIT, PSLiteral
 from openpyxl import load_workbook, Workbook
 from openpyxl.styles import Font, Alignment
+from openpyxl.worksheet.properties import PageSetupProperties
+
+from extraction_cache import ExtractionCache
+from pdf_source import PDFSource, SpoolCache, open_spool
+from stage_timer import StageTimer, format_report
+
+# Progress/trace output of the extractor and populator. Silent unless the
+# application configures it (see configure_logging) - messages are only
+# formatted when their level is enabled
+logger = logging.getLogger("pdf_to_cmr")
+logger.addHandler(logging.NullHandler())
+
+
+def configure_logging(level: int = logging.INFO):
+    """Show extractor/populator messages on stdout (command line tools)"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(level)
 
 
 class PackingListExtractor:
     """Extract data from CTS packing list PDFs - handles multi-page PDFs"""
     
-    def __init__(self, pdf_path: str):
+    # Consignee block lives in the left half of page 1
+    LEFT_HALF_RATIO = 0.5
+    
+    # Header words further apart than this (pt) are in different columns
+    VALUE_COLUMN_GAP = 20
+    # ...and a value starts at most this far right of its label
+    VALUE_MAX_DISTANCE = 100
+    
+    # Bump when extraction output changes - invalidates cached results
+    EXTRACTOR_VERSION = 3
+    
+    # Parallel page parsing: starting a worker process costs about as much as
+    # parsing a few dozen pages, so each worker gets at least this many pages
+    MIN_PAGES_PER_WORKER = 25
+    
+    def __init__(self, pdf_path: str, cache: Optional[ExtractionCache] = None,
+                 timer: Optional[StageTimer] = None, prefilter: bool = True,
+                 page_workers: int = 1, spool_cache: Optional[SpoolCache] = None):
         self.pdf_path = pdf_path
+        self.cache = cache
+        # Local copies of PDFs on the share (GUI) - see pdf_source.SpoolCache
+        self.spool_cache = spool_cache
+        # Skip the text layout of pages that can't hold a collo (see _extract_page_text)
+        self.prefilter = prefilter
+        # > 1: parse the pages of a large PDF in that many processes (see _iter_page_boxes)
+        self.page_workers = page_workers
+        self._source: Optional[PDFSource] = None
+        # Per-stage timings - pass the populator's timer to get one report
+        self.timer = timer or StageTimer()
         self.data = {}
     
     def extract(self) -> Dict:
-        """Main extraction method - reads ALL pages"""
+        """Main extraction method - served from the cache if this exact PDF was seen before"""
+        if self.cache is None:
+            return self._extract_from_pdf()
+        
         try:
-            print(f"Opening PDF: {self.pdf_path}")
-            with pdfplumber.open(self.pdf_path) as pdf:
-                print(f"✓ PDF opened - {len(pdf.pages)} pages found")
-                
-                # Read first page for header info and consignee
-                first_page = pdf.pages[0]
-                
-                # 1. Get text from the FULL page for right-side data
-                full_text = first_page.extract_text()
-                if not full_text:
-                    raise Exception("PDF text extraction returned empty - PDF may be corrupted or scanned image")
-                
-                # 2. Crop the page to the left 50%
-                left_half_bbox = (0, 0, first_page.width * 0.5, first_page.height)
-                left_page_crop = first_page.crop(left_half_bbox)
-                
-                # 3. Get text *only* from the left half
-                left_text = left_page_crop.extract_text()
-                if not left_text:
-                    print("⚠ Warning: Left-half crop returned no text. Falling back to full text.")
-                    left_text = full_text
-
-                print(f"✓ Extracted text from full page and left half")
-                
-                # Extract right-side data from FULL text
-                self.data['packing_list_number'] = self._extract_packing_list_number(full_text)
-                self.data['date'] = self._extract_date(full_text)
-                self.data['your_ref'] = self._extract_your_ref(full_text)
-                self.data['our_ref'] = self._extract_our_ref(full_text)
-                self.data['delivery_terms'] = self._extract_delivery_terms(full_text)
-                
-                # Extract left-side data from LEFT text
-                self.data['consignee'] = self._extract_consignee(left_text)
-                
-                print(f"✓ Header extracted - Consignee: {self.data['consignee'].get('name', 'N/A')}")
-                
-                # Extract ALL boxes/pallets from ALL pages (deduplicated)
-                self.data['boxes'] = []
-                total_gross_weight = 0
-                seen_box_numbers = set()  # Track box numbers to avoid duplicates
-                
-                print(f"\nExtracting boxes from all {len(pdf.pages)} pages...")
-                for page_num, page in enumerate(pdf.pages, 1):
-                    page_text = page.extract_text()
-                    if not page_text:
-                        print(f"  ⚠ Page {page_num}: No text extracted")
-                        continue
-                        
-                    box_info = self._extract_box_from_page(page_text, page_num)
-                    if box_info:
-                        box_number = box_info.get('number')
-                        box_name = box_info.get('name', 'Box')
-                        
-                        # Only add if we haven't seen this box number before
-                        if box_number not in seen_box_numbers:
-                            self.data['boxes'].append(box_info)
-                            seen_box_numbers.add(box_number)
-                            print(f"  ✓ Page {page_num}: Added {box_name}")
-                            if box_info.get('gross_weight_kg'):
-                                total_gross_weight += box_info['gross_weight_kg']
-                        else:
-                            print(f"  - Page {page_num}: Skipped {box_name} (duplicate - already added)")
-                    else:
-                        print(f"  - Page {page_num}: No box found (might be continuation)")
-                
-                self.data['total_gross_weight'] = total_gross_weight
-                self.data['num_boxes'] = len(self.data['boxes'])
-                
-                print(f"\n✓ Total: {self.data['num_boxes']} unique boxes, {total_gross_weight} KG")
-                
-                return self.data
+            digest = self._read_source().sha256
+            with self.timer.stage('cache_lookup'):
+                cached = self.cache.get(digest, self.EXTRACTOR_VERSION)
+        except OSError as e:
+            logger.warning("⚠ Warning: Extraction cache unavailable: %s", e)
+            return self._extract_from_pdf()
+        
+        if cached is not None:
+            logger.info("✓ Using cached extraction for %s", self.pdf_path)
+            self._source = None
+            self.data = cached
+            return self.data
+        
+        self._extract_from_pdf()
+        try:
+            self.cache.put(digest, self.EXTRACTOR_VERSION, self.data)
+        except OSError as e:
+            logger.warning("⚠ Warning: Could not write extraction cache: %s", e)
+        return self.data
+    
+    def _extract_from_pdf(self) -> Dict:
+        """Parse the PDF - reads ALL pages"""
+        try:
+            for _ in self.iter_boxes():
+                pass
+            
+            logger.info("✓ Total: %d unique boxes, %s KG",
+                        self.data['num_boxes'], self.data['total_gross_weight'])
+            
+            return self.data
                 
         except Exception as e:
             raise Exception(f"Error extracting PDF data: {e}\n\nThis may indicate:\n- PDF file is corrupted\n- PDF is a scanned image (not text-based)\n- File upload was incomplete")
     
-    def _extract_packing_list_number(self, text: str) -> Optional[str]:
-        # Looks for "Packing List 12345" or "Packing List 12345-1"
-        match = re.search(r'Packing List\s+(\d+)(?:-\d+)?', text)
-        return match.group(1) if match else None
+    def iter_boxes(self) -> Iterator[Dict]:
+        """Stream the unique boxes/pallets page by page.
+        
+        Header fields and consignee are in self.data before the first box is
+        yielded, and self.data['boxes'] / totals grow as boxes are found.
+        Each page's parsed layout is released as soon as its text is read, so
+        memory stays flat however many pages the PDF has (the file itself is
+        read into memory once, see PDFSource). Doesn't use the extraction
+        cache - extract() does.
+        """
+        source = self._read_source()
+        self._source = None  # this extraction owns it now
+        logger.info("Opening PDF: %s", self.pdf_path)
+        with self.timer.stage('pdf_open'):
+            pdf = pdfplumber.open(source.stream())
+            try:
+                pages = pdf.pages
+            except Exception:
+                pdf.close()
+                raise
+        with pdf, source:
+            logger.info("✓ PDF opened - %d pages found", len(pages))
+            
+            # Read first page for header info and consignee
+            # (text + word boxes from ONE pass over its chars)
+            try:
+                with self.timer.stage('page_text'):
+                    first_page_text = self._extract_page_text(pages[0], with_words=True)
+            finally:
+                pages[0].close()
+            
+            full_text = first_page_text['full']
+            if not full_text:
+                raise Exception("PDF text extraction returned empty - PDF may be corrupted or scanned image")
+            
+            logger.debug("✓ Extracted text and %d words from page 1", len(first_page_text['words']))
+            
+            # Header fields: values next to their labels, anywhere on the page
+            with self.timer.stage('header_fields'):
+                header_lines = _words_to_lines(first_page_text['words'])
+                for field, anchor, value in HEADER_FIELDS:
+                    self.data[field] = _value_near_anchor(header_lines, anchor, value,
+                                                          self.VALUE_COLUMN_GAP,
+                                                          self.VALUE_MAX_DISTANCE)
+            
+            # Consignee: the lines under its label, left column only
+            with self.timer.stage('consignee'):
+                column_right = pages[0].width * self.LEFT_HALF_RATIO
+                left_lines = _words_to_lines([word for word in first_page_text['words']
+                                              if word['x0'] < column_right])
+                self.data['consignee'] = self._extract_consignee(
+                    "\n".join(_line_text(line) for line in left_lines))
+            
+            logger.info("✓ Header extracted - Consignee: %s", self.data['consignee'].get('name', 'N/A'))
+            
+            # Extract ALL boxes/pallets from ALL pages (deduplicated)
+            self.data['boxes'] = []
+            self.data['total_gross_weight'] = 0
+            self.data['num_boxes'] = 0
+            seen_box_numbers = set()  # Track box numbers to avoid duplicates
+            
+            logger.debug("Extracting boxes from all %d pages...", len(pages))
+            # Page 1 was already analysed for the header - reuse its text
+            with self.timer.stage('box_parse'):
+                first_box = self._extract_box_from_page(full_text, 1)
+            if not first_box:
+                logger.debug("  - Page 1: No box found (might be continuation)")
+            
+            page_boxes = itertools.chain([(1, first_box)], self._iter_page_boxes(pages, source))
+            for page_num, box_info in page_boxes:
+                if not box_info:
+                    continue
+                box_number = box_info.get('number')
+                box_name = box_info.get('name', 'Box')
+                
+                # Only add if we haven't seen this box number before
+                if box_number not in seen_box_numbers:
+                    self.data['boxes'].append(box_info)
+                    self.data['num_boxes'] = len(self.data['boxes'])
+                    seen_box_numbers.add(box_number)
+                    logger.debug("  ✓ Page %d: Added %s", page_num, box_name)
+                    if box_info.get('gross_weight_kg'):
+                        self.data['total_gross_weight'] += box_info['gross_weight_kg']
+                    yield box_info
+                else:
+                    logger.debug("  - Page %d: Skipped %s (duplicate - already added)", page_num, box_name)
+    
+    def _read_source(self) -> PDFSource:
+        """The PDF's contents, read from disk/the share (or the spool cache) once per extraction"""
+        if self._source is None:
+            with self.timer.stage('pdf_read'):
+                self._source = PDFSource(self.pdf_path, self.spool_cache)
+        return self._source
     
-    def _extract_date(self, text: str) -> Optional[str]:
-        # Looks for "Barendrecht, 04-09-2023"
-        match = re.search(r'Barendrecht,\s*(\d{2}-\d{2}-\d{4})', text)
-        return match.group(1) if match else None
+    def _iter_page_boxes(self, pages, source: PDFSource) -> Iterator[tuple]:
+        """(page number, box or None) for pages 2.. in page order.
+        
+        With page_workers > 1, enough pages and enough CPU cores, pages 2..
+        are split into one contiguous range per worker process. Each worker
+        opens the PDF once - from a local memory-mapped spool copy, not the
+        original file. Their results come back in page order, so the
+        caller's dedup and totals are the same as in serial mode.
+        """
+        workers = min(self.page_workers, os.cpu_count() or 1,
+                      (len(pages) - 1) // self.MIN_PAGES_PER_WORKER)
+        if workers <= 1:
+            for page_num, page in enumerate(pages[1:], 2):
+                yield page_num, self._parse_page(page, page_num)
+            return
+        
+        # Opening the PDF costs about as much as parsing a few pages, so one range per worker
+        bounds = [2 + (len(pages) - 1) * n // workers for n in range(workers + 1)]
+        logger.debug("Parsing pages 2-%d in %d worker processes", len(pages), workers)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_page_worker,
+                                 initargs=(_log_level(),)) as pool:
+            results = pool.map(_parse_page_range, itertools.repeat(source.spool()),
+                               bounds[:-1], bounds[1:], itertools.repeat(self.prefilter))
+            for boxes, report in results:
+                self.timer.merge(report)
+                yield from boxes
     
-    def _extract_your_ref(self, text: str) -> Optional[str]:
-        # Looks for "Your ref.: ..."
-        match = re.search(r'Your ref\.:\s*([^\n]+)', text)
-        return match.group(1).strip() if match else None
+    def _parse_page(self, page, page_num: int) -> Optional[Dict]:
+        """The box on a page after the first, or None - releases the page's layout"""
+        try:
+            with self.timer.stage('page_text'):
+                page_texts = self._extract_page_text(page, collo_only=self.prefilter)
+        finally:
+            page.close()  # drop the page's layout objects
+        if page_texts is None:
+            logger.debug("  - Page %d: No collo marker, skipped", page_num)
+            return None
+        if not page_texts['full']:
+            logger.debug("  ⚠ Page %d: No text extracted", page_num)
+            return None
+        
+        with self.timer.stage('box_parse'):
+            box_info = self._extract_box_from_page(page_texts['full'], page_num)
+        if not box_info:
+            logger.debug("  - Page %d: No box found (might be continuation)", page_num)
+        return box_info
     
-    def _extract_our_ref(self, text: str) -> Optional[str]:
-        # Looks for "Our ref.: 12345"
-        match = re.search(r'Our ref\.:\s*(\d{4,5})', text)
-        return match.group(1).strip() if match else None
+    def _extract_page_text(self, page, with_words: bool = False,
+                           collo_only: bool = False) -> Optional[Dict]:
+        """Analyse a page's characters ONCE and build all we need from them.
+        
+        Returns {'full': full page text, 'words': word boxes (only if asked)}.
+        The text is the same as page.extract_text(); the words (text, x0, x1,
+        top, bottom) are the ones that text was laid out from.
+        
+        collo_only: return None for a page that can't hold a collo - one with
+        no package keyword and no "Packing List" anywhere. Decided from the
+        content stream when its text is readable there, before any layout;
+        otherwise from the raw characters, before the text layout.
+        """
+        if collo_only and _stream_without_colli(page):
+            return None
+        
+        chars = self._page_chars(page)
+        if collo_only and not _may_hold_collo("".join(char['text'] for char in chars).lower()):
+            return None
+        
+        wordmap = WordExtractor().extract_wordmap(chars)
+        texts = {'full': self._wordmap_to_text(wordmap, page.bbox)}
+        
+        if with_words:
+            texts['words'] = [word for word, _ in wordmap.tuples]
+        
+        return texts
+    
+    @staticmethod
+    def _page_chars(page) -> List[Dict]:
+        """Character records for text layout, straight from the pdfminer layout.
+        
+        page.chars runs pdfplumber's generic object processing on every char
+        (colours, fonts, graphic state...) - over half of the per-page cost.
+        Text layout only needs position, size and text, so build just that.
+        """
+        if page.pdf.unicode_norm is not None:
+            return page.chars
+        
+        height = page.height
+        mb_x0, mb_top = page.mediabox[:2]
+        doctop_offset = page.initial_doctop
+        chars = []
+        
+        def collect(layout_objects):
+            for obj in layout_objects:
+                if isinstance(obj, LTChar):
+                    top = (height - obj.y1) + mb_top
+                    chars.append({
+                        'text': obj.get_text(),
+                        'x0': obj.x0 + mb_x0,
+                        'x1': obj.x1 + mb_x0,
+                        'top': top,
+                        'bottom': (height - obj.y0) + mb_top,
+                        'doctop': doctop_offset + top,
+                        'width': obj.width,
+                        'height': obj.height,
+                        'size': obj.size,
+                        'upright': obj.upright,
+                    })
+                elif isinstance(obj, LTContainer):
+                    collect(obj._objs)
+        
+        collect(page.layout._objs)
+        return chars
+    
+    @staticmethod
+    def _wordmap_to_text(wordmap, bbox) -> str:
+        """pdfplumber's default (non-layout) text for a page's words within bbox"""
+        x0, top, x1, bottom = bbox
+        textmap = wordmap.to_textmap(
+            presorted=True, layout_bbox=bbox, layout_width=x1 - x0, layout_height=bottom - top
+        )
+        return textmap.as_string
     
     def _extract_consignee(self, text: str) -> Dict:
         """Extract consignee - stops *after* finding 5 address lines."""
@@ -143,7 +358,7 @@ class PackingListExtractor:
             if 'consignee address' in line_lower:
                 in_consignee = True
                 found_header = True
-                print(f"  ✓ Found 'Consignee address' at line {i}")
+                logger.debug("  ✓ Found 'Consignee address' at line %d", i)
                 continue
                 
             if in_consignee:
@@ -154,13 +369,13 @@ class PackingListExtractor:
                 # Accept this line if it has content
                 if line_stripped:
                     consignee_lines.append(line_stripped)
-                    print(f"  + Added line {len(consignee_lines)}: {line_stripped[:60]}")
+                    logger.debug("  + Added line %d: %.60s", len(consignee_lines), line_stripped)
                     
                     # *** Hard-stop limit ***
                     # After adding 5 lines (name, add1, add2, city, country),
                     # we STOP. No matter what.
                     if len(consignee_lines) >= 5:
-                        print(f"  ✓ Reached 5-line limit. Stopping.")
+                        logger.debug("  ✓ Reached 5-line limit. Stopping.")
                         break
         
         # Strategy 2: If header "Consignee address" is not found
@@ -181,94 +396,517 @@ class PackingListExtractor:
             consignee['country'] = consignee_lines[4]
         # We no longer parse extra1, extra2, etc. at all
         
-        print(f"\n  DEBUG - Consignee extraction result:")
-        if consignee:
+        if not consignee:
+            logger.warning("  ⚠ WARNING: Consignee dict is EMPTY! (This is bad)")
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug("  Consignee extraction result:")
             for key, val in consignee.items():
-                print(f"      {key}: {val}")
-        else:
-            print(f"  ⚠ WARNING: Consignee dict is EMPTY! (This is bad)")
+                logger.debug("      %s: %s", key, val)
         
         return consignee
     
-    def _extract_delivery_terms(self, text: str) -> Optional[str]:
-        # Looks for "Delivery ..."
-        match = re.search(r'Delivery\s+([^\n]+)', text)
-        return match.group(1).strip() if match else None
-    
     def _extract_box_from_page(self, text: str, page_num: int) -> Optional[Dict]:
         """Extract box/pallet/case/crate info from a single page"""
         box = {}
+        found = _scan_box_fields(text)
         
-        package_types = [
-            r'Wooden\s*box', r'Pallet', r'Case', r'Crate', r'Carton\s*box',
-            r'Carton', r'Package', r'Container', r'Box', r'Skid', r'Bundle'
-        ]
-        
-        for pkg_type_pattern in package_types:
+        if 'package' in found:
             # Match: "Wooden box (1)" or "Case 1" or "Pallet(6)"
-            collo_match = re.search(rf'({pkg_type_pattern})\s*\(?\s*(\d+)\s*\)?', text, re.IGNORECASE)
-            if collo_match:
-                box['type'] = collo_match.group(1).strip()
-                box['number'] = int(collo_match.group(2))
-                type_cleaned = re.sub(r'\s+', ' ', box['type'].title())
-                box['name'] = f"{type_cleaned} {box['number']}"
-                print(f"    ✓ Found package: {box['name']}")
-                break
-        
-        if not box:
+            collo_match = found['package']
+            box['type'] = collo_match.group(1).strip()
+            box['number'] = int(collo_match.group(2))
+            type_cleaned = _WHITESPACE_RE.sub(' ', box['type'].title())
+            box['name'] = f"{type_cleaned} {box['number']}"
+            logger.debug("    ✓ Found package: %s", box['name'])
+        elif 'packing_list' in found:
             # Strategy 2: Look for "Packing List 15738-X"
-            packing_match = re.search(r'Packing List\s+\d+[-\s]*(\d+)', text)
-            if packing_match:
-                box_num = int(packing_match.group(1))
-                box['type'] = 'Package'
-                box['number'] = box_num
-                box['name'] = f"Package {box_num}"
-                print(f"    ✓ Found from packing list number: {box['name']}")
-            else:
-                print(f"    - No package identifier found on page {page_num}")
-                return None
+            box_num = int(found['packing_list'].group(1))
+            box['type'] = 'Package'
+            box['number'] = box_num
+            box['name'] = f"Package {box_num}"
+            logger.debug("    ✓ Found from packing list number: %s", box['name'])
+        else:
+            logger.debug("    - No package identifier found on page %d", page_num)
+            return None
         
-        # Extract measurements
-        measurement_patterns = [
-            r'Measurement[:\s]+([\d\s]+x[\d\s]+x[\d\s]+)',
-            r'Dimensions?[:\s]+([\d\s]+x[\d\s]+x[\d\s]+)',
-            r'(\d+\s*x\s*\d+\s*x\s*\d+)\s*cm',
-        ]
-        
-        for pattern in measurement_patterns:
-            measurement_match = re.search(pattern, text, re.IGNORECASE)
-            if measurement_match:
-                dims = measurement_match.group(1).strip()
-                dims = re.sub(r'\s+', ' ', dims).replace(' x ', ' x ')
-                box['dimensions'] = dims
-                print(f"      Dimensions: {dims}")
-                break
+        # Measurements
+        if 'dimensions' in found:
+            dims = found['dimensions'].group(1).strip()
+            dims = _WHITESPACE_RE.sub(' ', dims)
+            box['dimensions'] = dims
+            logger.debug("      Dimensions: %s", dims)
         
-        if 'dimensions' not in box: print(f"      ⚠ No dimensions found")
-        
-        # Extract gross weight (handles commas: 1,234 KG)
-        weight_patterns = [
-            r'Gross\s*weight[:\s]+([\d,]+)\s*KG',
-            r'Gross[:\s]+([\d,]+)\s*KG',
-            r'([\d,]+)\s*KG.*gross',
-        ]
-        
-        for pattern in weight_patterns:
-            gross_weight_match = re.search(pattern, text, re.IGNORECASE)
-            if gross_weight_match:
-                # Remove commas before converting to int
-                weight_str = gross_weight_match.group(1).replace(',', '')
-                weight = int(weight_str)
-                box['gross_weight'] = f"{weight} KG"
-                box['gross_weight_kg'] = weight
-                print(f"      Weight: {weight} KG")
-                break
+        if 'dimensions' not in box: logger.debug("      ⚠ No dimensions found")
         
-        if 'gross_weight_kg' not in box: print(f"      ⚠ No gross weight found")
+        # Gross weight (handles commas: 1,234 KG)
+        if 'gross_weight' in found:
+            # Remove commas before converting to int
+            weight_str = found['gross_weight'].group(1).replace(',', '')
+            weight = int(weight_str)
+            box['gross_weight'] = f"{weight} KG"
+            box['gross_weight_kg'] = weight
+            logger.debug("      Weight: %s KG", weight)
+        
+        if 'gross_weight_kg' not in box: logger.debug("      ⚠ No gross weight found")
         
         return box
 
 
+def _log_level() -> Optional[int]:
+    """The level configure_logging() set, None if messages aren't shown"""
+    if any(not isinstance(handler, logging.NullHandler) for handler in logger.handlers):
+        return logger.level
+    return None
+
+
+def _init_page_worker(log_level: Optional[int]):
+    """Page worker setup: show messages like the parent process does"""
+    if log_level is not None and _log_level() is None:  # a forked worker has the handler already
+        sys.stdout.reconfigure(line_buffering=True)  # don't lose output at pool shutdown
+        configure_logging(log_level)
+
+
+def _parse_page_range(spool_path: str, start: int, stop: int, prefilter: bool):
+    """Runs in a page worker: ([(page number, box or None)], stage report) for pages start..stop-1"""
+    extractor = PackingListExtractor(spool_path, prefilter=prefilter)
+    with open_spool(spool_path) as view, pdfplumber.open(view) as pdf:
+        pages = pdf.pages
+        boxes = [(page_num, extractor._parse_page(pages[page_num - 1], page_num))
+                 for page_num in range(start, stop)]
+    return boxes, extractor.timer.report()
+
+
+# Page 1 header fields: (field, label, value pattern). The value is read
+# from the words right of the label on its line - up to the next column -
+# or, if nothing there matches, from the words under the label
+HEADER_FIELDS = [
+    # "Packing List 12345" or "Packing List 12345-1"
+    ('packing_list_number', re.compile(r'Packing List(?!\S)'), re.compile(r'(\d+)(?:-\d+)?')),
+    # "Barendrecht, 04-09-2023"
+    ('date', re.compile(r'Barendrecht,'), re.compile(r'(\d{2}-\d{2}-\d{4})')),
+    # "Your ref.: ..."
+    ('your_ref', re.compile(r'Your ref\.:'), re.compile(r'(.+)')),
+    # "Our ref.: 12345"
+    ('our_ref', re.compile(r'Our ref\.:'), re.compile(r'(\d{4,5})')),
+    # "Delivery ..."
+    ('delivery_terms', re.compile(r'Delivery(?!\S)'), re.compile(r'(.+)')),
+]
+
+# Words within this many points of each other vertically are one line
+# (pdfplumber's default for text layout)
+LINE_TOLERANCE = 3
+
+
+def _words_to_lines(words: List[Dict]) -> List[List[Dict]]:
+    """Group word boxes into lines, top to bottom - the lines of the page text"""
+    return pdfplumber.utils.cluster_objects(words, itemgetter('top'), LINE_TOLERANCE,
+                                            preserve_order=True)
+
+
+def _line_text(line: List[Dict]) -> str:
+    return " ".join(word['text'] for word in line)
+
+
+def _words_from(line: List[Dict], offset: int, max_gap: float, max_distance: float) -> str:
+    """Text of a line from character offset on (in _line_text), up to the first column gap.
+    
+    The first word must start within max_distance of the word before the offset.
+    """
+    parts = []
+    position, last_x1, gap = 0, None, max_distance
+    for word in line:
+        start = position
+        position += len(word['text']) + 1
+        if position - 1 <= offset:
+            last_x1 = word['x1']
+            continue
+        if last_x1 is not None and word['x0'] - last_x1 > gap:
+            break
+        parts.append(word['text'][max(0, offset - start):])
+        last_x1, gap = word['x1'], max_gap
+    return " ".join(parts).strip()
+
+
+def _words_under(line: List[Dict], x0: float, x1: float, max_gap: float) -> str:
+    """Text of the words of a line that start under x0..x1, up to the first column gap"""
+    parts, last_x1 = [], None
+    for word in line:
+        if last_x1 is None:
+            if x0 - max_gap <= word['x0'] <= x1:
+                parts.append(word['text'])
+                last_x1 = word['x1']
+        elif word['x0'] - last_x1 > max_gap:
+            break
+        else:
+            parts.append(word['text'])
+            last_x1 = word['x1']
+    return " ".join(parts)
+
+
+def _word_at(line: List[Dict], offset: int) -> Dict:
+    """The word of a line that character offset (in _line_text) falls in"""
+    position = 0
+    for word in line:
+        position += len(word['text']) + 1
+        if offset < position:
+            return word
+    return line[-1]
+
+
+def _value_near_anchor(lines: List[List[Dict]], anchor, value, max_gap: float,
+                       max_distance: float) -> Optional[str]:
+    """First value matching `value` right of - or else under - a label matching `anchor`"""
+    for index, line in enumerate(lines):
+        text = _line_text(line)
+        for label in anchor.finditer(text):
+            match = value.match(_words_from(line, label.end(), max_gap, max_distance))
+            if not match:
+                match = value.match(_text_under(lines, index, label, max_gap))
+            if match:
+                return match.group(1).strip()
+    return None
+
+
+def _text_under(lines: List[List[Dict]], index: int, label, max_gap: float) -> str:
+    """Text in the column of a label on lines[index], on the nearest line below that has any"""
+    first, last = _word_at(lines[index], label.start()), _word_at(lines[index], label.end() - 1)
+    bottom = max(word['bottom'] for word in lines[index])
+    for line in lines[index + 1:]:
+        if line[0]['top'] - bottom > max_gap:
+            break
+        text = _words_under(line, first['x0'], last['x1'], max_gap)
+        if text:
+            return text
+    return ""
+
+
+# Box detection patterns, in priority order within each field: the first
+# pattern of a field that matches ANYWHERE on the page wins (not the
+# leftmost match). Compiled once at import time - see _scan_box_fields.
+PACKAGE_TYPE_PATTERNS = [
+    r'Wooden\s*box', r'Pallet', r'Case', r'Crate', r'Carton\s*box',
+    r'Carton', r'Package', r'Container', r'Box', r'Skid', r'Bundle'
+]
+
+MEASUREMENT_PATTERNS = [
+    r'Measurement[:\s]+([\d\s]+x[\d\s]+x[\d\s]+)',
+    r'Dimensions?[:\s]+([\d\s]+x[\d\s]+x[\d\s]+)',
+    r'(\d+\s*x\s*\d+\s*x\s*\d+)\s*cm',
+]
+
+GROSS_WEIGHT_PATTERNS = [
+    r'Gross\s*weight[:\s]+([\d,]+)\s*KG',
+    r'Gross[:\s]+([\d,]+)\s*KG',
+    r'([\d,]+)\s*KG.*gross',
+]
+
+# Fallback when no package type is found: "Packing List 15738-X" (case-sensitive)
+PACKING_LIST_BOX_PATTERN = r'Packing List\s+\d+[-\s]*(\d+)'
+
+
+# Keyword every pattern starts with - or, for the patterns that start with
+# a digit, a tuple of words the match must contain
+_BOX_PATTERN_KEYWORDS = {
+    'package': ['wooden', 'pallet', 'case', 'crate', 'carton', 'carton', 'package',
+                'container', 'box', 'skid', 'bundle'],
+    'packing_list': ['packing'],
+    'dimensions': ['measurement', 'dimension', ('x', 'cm')],
+    'gross_weight': ['gross', 'gross', ('kg', 'gross')],
+}
+
+
+def _compile_box_patterns():
+    """Compile every box pattern once, grouped per field in priority order.
+    
+    Each entry is (keyword, lowercase pattern, original pattern). The
+    lowercase pattern runs case-sensitively on the lowercased page text,
+    which gives the same matches as re.IGNORECASE on ASCII text at a
+    fraction of the cost. The 'Packing List' fallback is case-sensitive,
+    so it has no lowercase pattern and runs on the original text.
+    (The patterns contain no uppercase escapes, so .lower() is safe.)
+    """
+    sources = {
+        'package': [rf'({p})\s*\(?\s*(\d+)\s*\)?' for p in PACKAGE_TYPE_PATTERNS],
+        'packing_list': [PACKING_LIST_BOX_PATTERN],
+        'dimensions': MEASUREMENT_PATTERNS,
+        'gross_weight': GROSS_WEIGHT_PATTERNS,
+    }
+    fields = []
+    for field, patterns in sources.items():
+        entries = []
+        for keyword, pattern in zip(_BOX_PATTERN_KEYWORDS[field], patterns):
+            if field == 'packing_list':
+                entries.append((keyword, None, re.compile(pattern)))
+            else:
+                entries.append((keyword, re.compile(pattern.lower()),
+                                re.compile(pattern, re.IGNORECASE)))
+        fields.append((field, entries))
+    return fields
+
+
+class _FieldMatch:
+    """re.Match-like access to a match's groups, sliced from the original text"""
+    
+    __slots__ = ('_text', '_match')
+    
+    def __init__(self, text: str, match):
+        self._text = text
+        self._match = match
+    
+    def group(self, index: int = 0) -> str:
+        start, end = self._match.span(index)
+        return self._text[start:end]
+
+
+_BOX_FIELDS = _compile_box_patterns()
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _scan_box_fields(text: str) -> Dict[str, _FieldMatch]:
+    """Best match per field ('package', 'packing_list', 'dimensions',
+    'gross_weight'), only for fields that matched at all.
+    
+    Same result as running each field's patterns with re.search in priority
+    order: a match of a keyword-led pattern can only start where its keyword
+    does, so the page is lowercased once and each pattern is only tried at
+    its keyword's positions (found with str.find), leftmost first. The
+    digit-led patterns only run when the words they need are on the page.
+    """
+    # lower() may shift positions on non-ASCII text - search that the slow way
+    fast = text.isascii()
+    lowered = text.lower() if fast else text
+    found = {}
+    
+    for field, entries in _BOX_FIELDS:
+        for keyword, lower_pattern, pattern in entries:
+            match = None
+            if not fast:
+                match = pattern.search(text)
+            elif lower_pattern is None:
+                # Case-sensitive pattern - anchor on the lowercased text,
+                # match on the original
+                pos = lowered.find(keyword)
+                while pos != -1:
+                    match = pattern.match(text, pos)
+                    if match:
+                        break
+                    pos = lowered.find(keyword, pos + 1)
+            elif isinstance(keyword, tuple):
+                # Digit-led pattern: skip the (backtracking) search when a
+                # word it needs isn't on the page at all
+                if all(word in lowered for word in keyword):
+                    match = lower_pattern.search(lowered)
+            else:
+                pos = lowered.find(keyword)
+                while pos != -1:
+                    match = lower_pattern.match(lowered, pos)
+                    if match:
+                        break
+                    pos = lowered.find(keyword, pos + 1)
+            
+            if match:
+                found[field] = _FieldMatch(text, match)
+                break
+    
+    return found
+
+
+# A page can only yield a box if its text contains one of these (lowercase):
+# the keyword of a package pattern, or "packing" of the "Packing List" fallback.
+# Whitespace can't split them - the patterns keep each keyword in one piece
+_COLLO_MARKERS = sorted(set(_BOX_PATTERN_KEYWORDS['package'])) + ['packing']
+_COLLO_MARKER_BYTES = [marker.encode('ascii') for marker in _COLLO_MARKERS]
+
+# Fonts whose string bytes are the ASCII letters they show
+_SIMPLE_FONT_TYPES = (LIT('Type1'), LIT('TrueType'), LIT('MMType1'))
+_READABLE_ENCODINGS = {'WinAnsiEncoding', 'MacRomanEncoding', 'StandardEncoding'}
+_STANDARD_TEXT_FONTS = {
+    'Helvetica', 'Helvetica-Bold', 'Helvetica-Oblique', 'Helvetica-BoldOblique',
+    'Times-Roman', 'Times-Bold', 'Times-Italic', 'Times-BoldItalic',
+    'Courier', 'Courier-Bold', 'Courier-Oblique', 'Courier-BoldOblique',
+}
+
+_STRING_START_RE = re.compile(rb'[(<%]')
+_LITERAL_SPECIAL_RE = re.compile(rb'[()\\]')
+_LITERAL_ESCAPE_RE = re.compile(rb'\\([0-7]{1,3}|\r\n|.)', re.DOTALL)
+_INLINE_IMAGE_RE = re.compile(rb'(?:^|\s)BI\s')
+_LITERAL_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f',
+                    b'\r\n': b'', b'\n': b'', b'\r': b''}
+
+
+def _may_hold_collo(text: str) -> bool:
+    """False if lowercased page text can't contain a box (see _scan_box_fields)"""
+    return any(marker in text for marker in _COLLO_MARKERS)
+
+
+def _stream_without_colli(page) -> bool:
+    """True if the page's content stream shows readable text without any collo marker.
+    
+    Only pages whose fonts map string bytes straight to ASCII letters
+    (simple fonts, standard encodings) and that draw no form XObjects or
+    inline images qualify - for anything else this says False and the
+    page's characters are checked instead.
+    """
+    resources = resolve1(page.page_obj.resources) or {}
+    
+    for xobject in (resolve1(resources.get('XObject')) or {}).values():
+        xobject = resolve1(xobject)
+        if getattr(xobject, 'attrs', {}).get('Subtype') != LIT('Image'):
+            return False  # text could be inside a form
+    
+    for font in (resolve1(resources.get('Font')) or {}).values():
+        if not _font_is_readable(resolve1(font)):
+            return False
+    
+    try:
+        data = b"".join(resolve1(stream).get_data() for stream in page.page_obj.contents)
+    except Exception:
+        return False  # e.g. a filter pdfminer can't decode - the layout will tell
+    if _INLINE_IMAGE_RE.search(data):
+        return False
+    
+    shown = _shown_strings(data)
+    if shown is None:
+        return False
+    shown = shown.lower()
+    return not any(marker in shown for marker in _COLLO_MARKER_BYTES)
+
+
+def _font_is_readable(font) -> bool:
+    """True for a simple font whose codes are ASCII for the letters"""
+    if not isinstance(font, dict):
+        return False
+    if font.get('Subtype') not in _SIMPLE_FONT_TYPES:
+        return False
+    if 'ToUnicode' in font:
+        # Text extraction maps codes through the CMap, not the encoding
+        return False
+    
+    encoding = resolve1(font.get('Encoding'))
+    if encoding is None:
+        # Built-in encoding - only known for the standard fonts
+        # (not embedded, or the font file could have its own)
+        base_font = resolve1(font.get('BaseFont'))
+        descriptor = resolve1(font.get('FontDescriptor')) or {}
+        return (isinstance(base_font, PSLiteral) and base_font.name in _STANDARD_TEXT_FONTS
+                and not any(key in descriptor for key in ('FontFile', 'FontFile2', 'FontFile3')))
+    if isinstance(encoding, dict):
+        # /Differences may remap any code
+        encoding = None if 'Differences' in encoding else resolve1(encoding.get('BaseEncoding'))
+    return isinstance(encoding, PSLiteral) and encoding.name in _READABLE_ENCODINGS
+
+
+def _shown_strings(data: bytes) -> Optional[bytes]:
+    """The string operands of a content stream, concatenated - None if it can't be parsed.
+    
+    Concatenating keeps words whole that a TJ array splits for kerning,
+    e.g. [(W) 80 (ooden box) -20 (\\(1\\))] TJ.
+    """
+    parts = []
+    pos, end = 0, len(data)
+    while pos < end:
+        match = _STRING_START_RE.search(data, pos)
+        if not match:
+            break
+        start = match.end()
+        token = data[match.start()]
+        
+        if token == 0x25:  # % comment, up to the end of the line
+            eol = min((i for i in (data.find(b'\n', start), data.find(b'\r', start)) if i != -1),
+                      default=end)
+            pos = eol + 1
+        elif token == 0x3C:  # < hex string >, or a << dictionary
+            if data.startswith(b'<', start):
+                pos = start + 1
+                continue
+            close = data.find(b'>', start)
+            if close == -1:
+                return None
+            digits = re.sub(rb'\s', b'', data[start:close])
+            try:
+                parts.append(bytes.fromhex((digits + b'0' * (len(digits) % 2)).decode('ascii')))
+            except ValueError:
+                return None
+            pos = close + 1
+        else:  # ( literal string ), parentheses may nest
+            depth, scan = 1, start
+            while depth:
+                special = _LITERAL_SPECIAL_RE.search(data, scan)
+                if not special:
+                    return None
+                char = data[special.start()]
+                if char == 0x5C:  # backslash escapes the next byte
+                    scan = special.start() + 2
+                    continue
+                depth += 1 if char == 0x28 else -1
+                scan = special.end()
+            parts.append(_LITERAL_ESCAPE_RE.sub(_unescape, data[start:scan - 1]))
+            pos = scan
+    
+    return b"".join(parts)
+
+
+def _unescape(match) -> bytes:
+    escaped = match.group(1)
+    if escaped[:1].isdigit():
+        return bytes([int(escaped, 8) & 0xFF])
+    return _LITERAL_ESCAPES.get(escaped, escaped)
+
+
+def aggregate_boxes(boxes: List[Dict]) -> List[Dict]:
+    """Group identical colli (same type, dimensions and weight) into one line each.
+    
+    A group of several boxes becomes {'name': '12 x Pallet', 'count': 12,
+    'numbers': [...], 'dimensions': ..., 'unit_weight_kg': 400,
+    'gross_weight_kg': 4800, 'gross_weight': '4800 KG'}; a box without a
+    twin is kept as it is. Lines are in order of first appearance. One pass
+    over the boxes - fine for thousands of colli.
+    """
+    groups = {}
+    for box in boxes:
+        box_type = _WHITESPACE_RE.sub(' ', (box.get('type') or 'Package').title())
+        key = (box_type, box.get('dimensions'), box.get('gross_weight_kg'))
+        group = groups.get(key)
+        if group is None:
+            groups[key] = [box_type, [box]]
+        else:
+            group[1].append(box)
+    
+    lines = []
+    for (box_type, dimensions, weight), (_, members) in groups.items():
+        if len(members) == 1:
+            lines.append(members[0])
+            continue
+        line = {
+            'type': box_type,
+            'name': f"{len(members)} x {box_type}",
+            'count': len(members),
+            'numbers': [member.get('number') for member in members],
+        }
+        if dimensions:
+            line['dimensions'] = dimensions
+        if weight:
+            line['unit_weight_kg'] = weight
+            line['gross_weight_kg'] = weight * len(members)
+            line['gross_weight'] = f"{weight * len(members)} KG"
+        lines.append(line)
+    return lines
+
+
+def paginate_boxes(boxes: List[Dict], first_page: int, per_page: int) -> List[List[Dict]]:
+    """Split the box list into the CMR page and annex pages.
+    
+    Everything fits on the CMR if the list is at most first_page + 1 long
+    (the row that would hold the "more colli" pointer takes a box instead).
+    """
+    if len(boxes) <= first_page + 1:
+        return [boxes]
+    pages = [boxes[:first_page]]
+    for start in range(first_page, len(boxes), per_page):
+        pages.append(boxes[start:start + per_page])
+    return pages
+
+
 class CMRExcelPopulator:
     """Populate CMR Excel template - ALL CELLS VERIFIED"""
     
@@ -297,10 +935,105 @@ class CMRExcelPopulator:
         'SPAIN': 'ES',
     }
 
-    def __init__(self, template_path: str):
+    # One font object shared by every styled cell (openpyxl stores it once)
+    CELL_FONT = Font(name='Arial', size=13)
+    
+    # Box table: the CMR has room for 20 rows (50-69) above the footer at
+    # B70. Longer lists keep 19 there plus a pointer, the rest goes onto
+    # annex sheets of BOX_ROWS_ANNEX rows (one A4 page each)
+    BOX_FIRST_ROW = 50
+    BOX_ROWS_MAIN = 19
+    BOX_ROWS_ANNEX = 55
+    ANNEX_HEADER_FONT = Font(name='Arial', size=13, bold=True)
+    ANNEX_COLUMN_WIDTHS = {'A': 4, 'B': 40, 'C': 20, 'D': 12, 'E': 20, 'F': 12, 'G': 20, 'H': 25}
+    
+    # Summary sheet of populate_many()
+    SUMMARY_COLUMNS = ["Packing list No.", "Date", "Project No.", "Customer ref",
+                       "Consignee", "Colli", "Gross weight (KG)"]
+    SUMMARY_HEADER_FONT = Font(name='Arial', size=11, bold=True)
+    
+    # Excel refuses (reports as corrupt) sheet titles longer than this
+    MAX_SHEET_TITLE = 31
+
+    # Prepared templates (loaded + row heights + print settings), pickled once
+    # per process: {absolute path: (mtime, size, pickled workbook, load seconds,
+    # coordinates of the template's own non-empty cells)}
+    _prepared_templates = {}
+    
+    def __init__(self, template_path: str, timer: Optional[StageTimer] = None,
+                 aggregate: bool = False):
         self.template_path = template_path
+        self.aggregate = aggregate  # identical colli on one line - see aggregate_boxes
         self.wb = None
         self.ws = None
+        self.template_timings = {}
+        self.timer = timer or StageTimer()
+        # Cells that get the CMR font at save time: the template's non-empty
+        # cells plus every cell we write
+        self._styled_cells = set()
+    
+    @classmethod
+    def preload(cls, template_path: str):
+        """Parse and prepare the template now so later conversions only copy it"""
+        if os.path.exists(template_path):
+            cls(template_path)._load_prepared_template()
+    
+    def _load_prepared_template(self):
+        """Fresh copy of the prepared template - parses it only on first use.
+        
+        Unpickling the prepared workbook is several times faster than
+        load_workbook(), and the row heights / print settings are already on it.
+        """
+        key = os.path.abspath(self.template_path)
+        stat = os.stat(key)
+        cached = self._prepared_templates.get(key)
+        
+        if cached is None or cached[:2] != (stat.st_mtime, stat.st_size):
+            started = time.perf_counter()
+            self.wb = load_workbook(self.template_path)
+            self.ws = self.wb.active
+            self._apply_row_heights()
+            self._apply_print_settings()
+            value_cells = frozenset(cell.coordinate
+                                    for row in self.ws.iter_rows()
+                                    for cell in row if cell.value)
+            load_seconds = time.perf_counter() - started
+            
+            try:
+                pickled = pickle.dumps(self.wb, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                # e.g. embedded objects that can't be copied - just use this load
+                logger.warning("  ⚠ Template can't be cached, loading it every time: %s", e)
+                self.template_timings = {'load_ms': load_seconds * 1000, 'copy_ms': None}
+                self._styled_cells = set(value_cells)
+                return self.wb
+            
+            cached = (stat.st_mtime, stat.st_size, pickled, load_seconds, value_cells)
+            self._prepared_templates[key] = cached
+        
+        started = time.perf_counter()
+        self.wb = pickle.loads(cached[2])
+        self._rebind_dimensions(self.wb)
+        self.ws = self.wb.active
+        self._styled_cells = set(cached[4])
+        self.template_timings = {
+            'load_ms': cached[3] * 1000,
+            'copy_ms': (time.perf_counter() - started) * 1000,
+        }
+        return self.wb
+    
+    @staticmethod
+    def _rebind_dimensions(wb):
+        """Repair the row/column dimension holders of an unpickled workbook.
+        
+        They are defaultdicts, which pickle only their items: unpickled, the
+        default factory lands in .worksheet and new rows/columns raise KeyError.
+        """
+        for ws in wb.worksheets:
+            for holder, factory in ((ws.row_dimensions, ws._add_row),
+                                    (ws.column_dimensions, ws._add_column)):
+                holder.worksheet = ws
+                holder.default_factory = factory
     
     def _get_country_code(self, country_name: str) -> str:
         """Gets 2-letter country code, or returns name if not found."""
@@ -320,102 +1053,207 @@ class CMRExcelPopulator:
     
     def populate(self, data: Dict, output_path: str):
         """Populate template with extracted data"""
+        self._load_template()
+        self._populate_sheet(data)
         
-        if os.path.exists(self.template_path):
-            try:
-                self.wb = load_workbook(self.template_path)
-                self.ws = self.wb.active
-                print(f"✓ Loaded template")
-                # Apply settings even to existing template
-                # DON'T set column widths early - do it at the END only
-                # self._apply_column_widths()  # DISABLED
-                self._apply_row_heights()
-                self._apply_print_settings()
-            except Exception as e:
-                print(f"⚠ Warning: Could not load template '{self.template_path}'. Error: {e}")
-                print("Creating a new blank workbook.")
+        with self.timer.stage('save'):
+            self.wb.save(output_path)
+        logger.info("✓ CMR saved: %s", output_path)
+    
+    def populate_many(self, data_list: List[Dict], output_path: str):
+        """One workbook for several packing lists (e.g. one truck): a CMR sheet
+        per list plus a summary sheet with the totals.
+        
+        The template is loaded once; every CMR sheet is a copy of it.
+        """
+        if not data_list:
+            raise ValueError("No packing lists to populate")
+        
+        self._load_template()
+        template_ws = self.ws
+        template_cells = set(self._styled_cells)
+        
+        titles = {template_ws.title}
+        for data in data_list:
+            with self.timer.stage('sheet_copy'):
+                self.ws = self.wb.copy_worksheet(template_ws)
+                self.ws.title = self._sheet_title(data, titles)
+                if template_ws.print_area:  # the only print setting copy_worksheet skips
+                    self.ws.print_area = template_ws.print_area
+            self._styled_cells = set(template_cells)
+            logger.debug("  Sheet '%s'", self.ws.title)
+            self._populate_sheet(data)
+        
+        self.wb.remove(template_ws)
+        with self.timer.stage('summary'):
+            self._populate_summary_sheet(data_list)
+        
+        with self.timer.stage('save'):
+            self.wb.save(output_path)
+        logger.info("✓ CMR saved: %s (%d packing lists)", output_path, len(data_list))
+    
+    def _load_template(self):
+        """self.wb/self.ws = copy of the template, or a blank CMR workbook"""
+        with self.timer.stage('template_load'):
+            if os.path.exists(self.template_path):
+                try:
+                    # Copy of the prepared template (row heights + print settings
+                    # already applied). DON'T set column widths early - do it at
+                    # the END only
+                    self._load_prepared_template()
+                    timings = self.template_timings
+                    if timings['copy_ms'] is not None:
+                        logger.info("✓ Loaded template (copy %.1f ms, full load %.1f ms)",
+                                    timings['copy_ms'], timings['load_ms'])
+                    else:
+                        logger.info("✓ Loaded template (full load %.1f ms)", timings['load_ms'])
+                except Exception as e:
+                    logger.warning("⚠ Warning: Could not load template '%s'. Error: %s\n"
+                                   "Creating a new blank workbook.", self.template_path, e)
+                    self._create_cmr_template()
+            else:
+                logger.warning("⚠ Warning: Template '%s' not found.\n"
+                               "Creating a new blank workbook.", self.template_path)
                 self._create_cmr_template()
-        else:
-            print(f"⚠ Warning: Template '{self.template_path}' not found.")
-            print("Creating a new blank workbook.")
-            self._create_cmr_template()
-        
-        # Populate all sections
-        self._populate_header_section(data)
-        self._populate_sender_section()
-        self._populate_consignee_section(data.get('consignee', {}))
-        self._populate_boxes_section(data.get('boxes', []))
-        self._populate_footer_section(data)
+    
+    def _populate_sheet(self, data: Dict):
+        """Write one packing list into self.ws and finish its layout"""
+        boxes = data.get('boxes', [])
+        if self.aggregate:
+            with self.timer.stage('aggregate'):
+                boxes = aggregate_boxes(boxes)
+            logger.debug("  Aggregated %d colli into %d lines", len(data.get('boxes', [])), len(boxes))
+        
+        with self.timer.stage('cell_writes'):
+            self._populate_header_section(data)
+            self._populate_sender_section()
+            self._populate_consignee_section(data.get('consignee', {}))
+            overflow = self._populate_boxes_section(boxes)
+            self._populate_footer_section(data)
         
         # DON'T apply column widths here - do it at the VERY END only
         # self._apply_column_widths()  # DISABLED
         
         # MERGE CELLS to give more space for addresses
-        print("  Merging address cells for more space...")
-        try:
-            # Merge sender cells (B6:C8) - UPDATED ROWS
-            self.ws.merge_cells('B6:C6')  # CTS Netherlands B.V.
-            self.ws.merge_cells('B7:C7')  # Riga 10
-            self.ws.merge_cells('B8:C8')  # Address
+        logger.debug("  Merging address cells for more space...")
+        with self.timer.stage('merge'):
+            try:
+                # Merge sender cells (B6:C8) - UPDATED ROWS
+                self.ws.merge_cells('B6:C6')  # CTS Netherlands B.V.
+                self.ws.merge_cells('B7:C7')  # Riga 10
+                self.ws.merge_cells('B8:C8')  # Address
             
-            # Merge row 11 (empty box)
-            self.ws.merge_cells('B11:C11')
+                # Merge row 11 (empty box)
+                self.ws.merge_cells('B11:C11')
             
-            # Merge consignee cells (B16:C19) - FIXED: Don't merge B20!
-            self.ws.merge_cells('B16:C16')  # Company name
-            self.ws.merge_cells('B17:C17')  # Address line 1
-            self.ws.merge_cells('B18:C18')  # Address line 2
-            self.ws.merge_cells('B19:C19')  # City/Country
-            # B20 is NOT merged or used anymore!
+                # Merge consignee cells (B16:C19) - FIXED: Don't merge B20!
+                self.ws.merge_cells('B16:C16')  # Company name
+                self.ws.merge_cells('B17:C17')  # Address line 1
+                self.ws.merge_cells('B18:C18')  # Address line 2
+                self.ws.merge_cells('B19:C19')  # City/Country
+                # B20 is NOT merged or used anymore!
             
-            # Merge city formula cell
-            self.ws.merge_cells('B26:C26')
+                # Merge city formula cell
+                self.ws.merge_cells('B26:C26')
             
-            # Merge origin cell
-            self.ws.merge_cells('B33:C33')
+                # Merge origin cell
+                self.ws.merge_cells('B33:C33')
             
-            # Merge box description column (B) to give more space
-            self.ws.merge_cells('B45:C45')  # Colli header
-            self.ws.merge_cells('B46:C46')  # Dimensions text
-            self.ws.merge_cells('B48:C48')  # Description header
+                # Merge box description column (B) to give more space
+                self.ws.merge_cells('B45:C45')  # Colli header
+                self.ws.merge_cells('B46:C46')  # Dimensions text
+                self.ws.merge_cells('B48:C48')  # Description header
             
-            print("  ✓ Merged cells for wider address display")
-        except Exception as e:
-            print(f"  ⚠ Warning: Could not merge cells: {e}")
+                logger.debug("  ✓ Merged cells for wider address display")
+            except Exception as e:
+                logger.warning("  ⚠ Warning: Could not merge cells: %s", e)
         
         # SET ALL COLUMN WIDTHS AT THE VERY END - LAST THING BEFORE SAVE
-        print("  [FINAL] Setting all column widths...")
-        self.ws.column_dimensions['A'].width = 18  # LEFT MARGIN SPACE (as per working template)
-        self.ws.column_dimensions['B'].width = 40  # MAIN CONTENT COLUMN
-        self.ws.column_dimensions['C'].width = 20
-        self.ws.column_dimensions['D'].width = 12
-        self.ws.column_dimensions['E'].width = 20  # Dimensions
-        self.ws.column_dimensions['F'].width = 12
-        self.ws.column_dimensions['G'].width = 20  # Labels  
-        self.ws.column_dimensions['H'].width = 25  # Values
-        self.ws.column_dimensions['I'].width = 12
-        
-        print(f"  ✓ [FINAL] Column widths set:")
-        print(f"       A={self.ws.column_dimensions['A'].width} ← LEFT MARGIN")
-        print(f"       B={self.ws.column_dimensions['B'].width} ← MAIN COLUMN")
-        print(f"  Matches working template!")
-        
-        # Apply font size 13 to all cells
-        print("  [FINAL] Applying font size 13...")
-        default_font = Font(name='Arial', size=13)
-        for row in self.ws.iter_rows():
-            for cell in row:
-                if cell.value:
-                    cell.font = default_font
-        
-        self.wb.save(output_path)
-        print(f"✓ CMR saved: {output_path}")
+        logger.debug("  [FINAL] Setting all column widths...")
+        with self.timer.stage('column_widths'):
+            self.ws.column_dimensions['A'].width = 18  # LEFT MARGIN SPACE (as per working template)
+            self.ws.column_dimensions['B'].width = 40  # MAIN CONTENT COLUMN
+            self.ws.column_dimensions['C'].width = 20
+            self.ws.column_dimensions['D'].width = 12
+            self.ws.column_dimensions['E'].width = 20  # Dimensions
+            self.ws.column_dimensions['F'].width = 12
+            self.ws.column_dimensions['G'].width = 20  # Labels  
+            self.ws.column_dimensions['H'].width = 25  # Values
+            self.ws.column_dimensions['I'].width = 12
+        
+        logger.debug("  ✓ [FINAL] Column widths set: A=%s (left margin), B=%s (main column)",
+                     self.ws.column_dimensions['A'].width, self.ws.column_dimensions['B'].width)
+        
+        # Apply font size 13 - only template text and the cells we wrote can
+        # hold a value, so there's no need to walk the whole sheet
+        logger.debug("  [FINAL] Applying font size 13...")
+        with self.timer.stage('font_pass'):
+            self._apply_cell_font()
+        
+        if overflow:
+            with self.timer.stage('annex'):
+                self._populate_annex_sheets(data, overflow)
+    
+    def _write(self, coordinate: str, value):
+        """Write a cell and remember it for the final font pass"""
+        self.ws[coordinate] = value
+        self._styled_cells.add(coordinate)
+    
+    def _apply_cell_font(self):
+        """Arial 13 on every non-empty template cell and written cell"""
+        for coordinate in self._styled_cells:
+            cell = self.ws[coordinate]
+            if cell.value:
+                cell.font = self.CELL_FONT
+    
+    @classmethod
+    def _sheet_title(cls, data: Dict, used: set) -> str:
+        """'CMR <packing list no.>', unique within the workbook and at most
+        MAX_SHEET_TITLE long - the base is cut to fit each ' (n)' suffix"""
+        base = re.sub(r'[\\/*?:\[\]]', '', f"CMR {data.get('packing_list_number') or ''}".strip())
+        title, n = base[:cls.MAX_SHEET_TITLE], 1
+        while title in used:
+            n += 1
+            suffix = f" ({n})"
+            title = base[:cls.MAX_SHEET_TITLE - len(suffix)] + suffix
+        used.add(title)
+        return title
+    
+    def _populate_summary_sheet(self, data_list: List[Dict]):
+        """First sheet: one line per packing list and the shipment totals"""
+        ws = self.wb.create_sheet("Summary", 0)
+        ws.append(self.SUMMARY_COLUMNS)
+        for cell in ws[1]:
+            cell.font = self.SUMMARY_HEADER_FONT
+        
+        for data in data_list:
+            ws.append([
+                data.get('packing_list_number', ''),
+                data.get('date', ''),
+                f"CTS-{data['our_ref']}" if data.get('our_ref') else '',
+                data.get('your_ref', ''),
+                data.get('consignee', {}).get('name', ''),
+                data.get('num_boxes', 0),
+                data.get('total_gross_weight', 0),
+            ])
+        
+        ws.append([])
+        ws.append(["Total", '', '', '', f"{len(data_list)} packing lists",
+                   sum(data.get('num_boxes', 0) for data in data_list),
+                   sum(data.get('total_gross_weight', 0) for data in data_list)])
+        for cell in ws[ws.max_row]:
+            cell.font = self.SUMMARY_HEADER_FONT
+        
+        for column, width in zip('ABCDEFG', (16, 12, 14, 20, 40, 8, 18)):
+            ws.column_dimensions[column].width = width
+        self.wb.active = 0
     
     def _create_cmr_template(self):
         """Create CMR template with precise row heights matching CMR form"""
         self.wb = Workbook()
         self.ws = self.wb.active
         self.ws.title = "CMR"
+        self._styled_cells = set()
         
         # Column widths (matching CMR template)
         self.ws.column_dimensions['A'].width = 18  # LEFT MARGIN (as per working template)
@@ -504,11 +1342,11 @@ class CMRExcelPopulator:
         self.ws.page_margins.header = 0.0
         self.ws.page_margins.footer = 0.0
         
-        print("  ✓ Created CMR template with precise row heights for form alignment")
+        logger.debug("  ✓ Created CMR template with precise row heights for form alignment")
     
     def _apply_column_widths(self):
         """Apply column widths to worksheet - explicit settings"""
-        print(f"  DEBUG: Setting column widths...")
+        logger.debug("  Setting column widths...")
         
         # FIX 1: Apply larger font size to all cells FIRST
         default_font = Font(name='Arial', size=13)
@@ -516,7 +1354,7 @@ class CMRExcelPopulator:
             for cell in row:
                 if cell.value:
                     cell.font = default_font
-        print(f"  ✓ Applied font size 13 to all cells")
+        logger.debug("  ✓ Applied font size 13 to all cells")
         
         # Set column A - LEFT MARGIN SPACER
         self.ws.column_dimensions['A'].width = 18  # As per working template
@@ -538,7 +1376,8 @@ class CMRExcelPopulator:
         self.ws.column_dimensions['H'].width = 25
         self.ws.column_dimensions['I'].width = 12
         
-        print(f"  ✓ Column widths set: A={self.ws.column_dimensions['A'].width} (left margin), B={self.ws.column_dimensions['B'].width}")
+        logger.debug("  ✓ Column widths set: A=%s (left margin), B=%s",
+                     self.ws.column_dimensions['A'].width, self.ws.column_dimensions['B'].width)
     
     def _apply_row_heights(self):
         """Apply row heights to worksheet"""
@@ -584,14 +1423,18 @@ class CMRExcelPopulator:
         # Rows 66-70: Bottom
         for row in range(66, 71):
             self.ws.row_dimensions[row].height = 13
-        print("  ✓ Applied row heights")
+        logger.debug("  ✓ Applied row heights")
     
     def _apply_print_settings(self):
         """Apply print settings to worksheet for single-page A4 output"""
         # PAGE SETUP
         self.ws.page_setup.paperSize = 9  # A4
         self.ws.page_setup.orientation = 'portrait'
-        self.ws.page_setup.fitToPage = True
+        # fitToPage lives on the sheet properties - page_setup.fitToPage
+        # fails on sheets read from a file (no parent worksheet)
+        if self.ws.sheet_properties.pageSetUpPr is None:
+            self.ws.sheet_properties.pageSetUpPr = PageSetupProperties()
+        self.ws.sheet_properties.pageSetUpPr.fitToPage = True
         self.ws.page_setup.fitToHeight = 1  # Fit to 1 page tall
         self.ws.page_setup.fitToWidth = 1   # Fit to 1 page wide
         self.ws.page_setup.scale = 85  # Scale down to 85% to give more room
@@ -607,7 +1450,7 @@ class CMRExcelPopulator:
         self.ws.page_margins.header = 0.0
         self.ws.page_margins.footer = 0.0
         
-        print("  ✓ Applied single-page print settings with 85% scale")
+        logger.debug("  ✓ Applied single-page print settings with 85% scale")
     
     def _populate_header_section(self, data: Dict):
         """Populate header section - ALL CELLS VERIFIED"""
@@ -654,54 +1497,54 @@ class CMRExcelPopulator:
         # Instead we add formulas:
         
         # B33: Formula - copy of sender address (B8)
-        self.ws['B33'] = '=B8'
-        print(f"    Writing B33 (formula): =B8")
+        self._write('B33', '=B8')
+        logger.debug("    Writing B33 (formula): =B8")
         
         # FIX 4: B69 cleared (was showing formula)
-        self.ws['B69'] = ""
-        print(f"    Writing B69: (cleared)")
+        self._write('B69', "")
+        logger.debug("    Writing B69: (cleared)")
         
         # FIX 5: B85 hardcoded
-        self.ws['B85'] = "CTS Netherlands BV"
-        print(f"    Writing B85: CTS Netherlands BV")
+        self._write('B85', "CTS Netherlands BV")
+        logger.debug("    Writing B85: CTS Netherlands BV")
         
         # G33/H33: Delivery terms (MOVED from G26)
-        self.ws['G33'] = "Delivery term"
+        self._write('G33', "Delivery term")
         if data.get('delivery_terms'):
             delivery = data['delivery_terms']
-            if 'EXW' in delivery: self.ws['H33'] = 'EXW'
-            elif 'CIF' in delivery: self.ws['H33'] = 'CIF'
-            elif 'FOB' in delivery: self.ws['H33'] = 'FOB'
-            elif 'FCA' in delivery: self.ws['H33'] = 'FCA'
-            else: self.ws['H33'] = delivery.split()[0] if delivery else ''
+            if 'EXW' in delivery: self._write('H33', 'EXW')
+            elif 'CIF' in delivery: self._write('H33', 'CIF')
+            elif 'FOB' in delivery: self._write('H33', 'FOB')
+            elif 'FCA' in delivery: self._write('H33', 'FCA')
+            else: self._write('H33', delivery.split()[0] if delivery else '')
         
         # G35/H35: Project No (Our ref) (MOVED from G28)
-        self.ws['G35'] = "Project No.:"
+        self._write('G35', "Project No.:")
         if data.get('our_ref'):
-            self.ws['H35'] = f"CTS-{data['our_ref']}"
+            self._write('H35', f"CTS-{data['our_ref']}")
         
         # FIX 3: G37/H37: Customer ref (already correct!)
-        self.ws['G37'] = "Customer ref"
+        self._write('G37', "Customer ref")
         if data.get('your_ref'):
-            self.ws['H37'] = data['your_ref']
+            self._write('H37', data['your_ref'])
         
         # B40/C40: Packing list number
-        self.ws['B40'] = "Packing list No.:"
+        self._write('B40', "Packing list No.:")
         if data.get('packing_list_number'):
-            self.ws['C40'] = data['packing_list_number']
-            print(f"    Writing B40/C40: Packing list No.: {data['packing_list_number']}")
+            self._write('C40', data['packing_list_number'])
+            logger.debug("    Writing B40/C40: Packing list No.: %s", data['packing_list_number'])
     
     def _populate_sender_section(self):
         """Populate static sender info - ROWS 6-8"""
-        self.ws['B6'] = "CTS Netherlands B.V."
-        self.ws['B7'] = "Riga 10"
-        self.ws['B8'] = "2993 LW BARENDRECHT, NL"
+        self._write('B6', "CTS Netherlands B.V.")
+        self._write('B7', "Riga 10")
+        self._write('B8', "2993 LW BARENDRECHT, NL")
     
     def _populate_consignee_section(self, consignee: Dict):
         """Populate consignee address - ROWS 16-19 (NOT 20!)"""
         
         if not consignee:
-            print("    ⚠ Consignee is empty or None! Writing nothing.")
+            logger.warning("    ⚠ Consignee is empty or None! Writing nothing.")
             return
         
         # Write ONLY the main address fields starting at row 16
@@ -734,101 +1577,197 @@ class CMRExcelPopulator:
                 if field == 'city' or field == 'address_line2':
                     value = value.upper()
                 
-                print(f"    Writing B{row}: {value}")
-                self.ws[f'B{row}'] = value
+                logger.debug("    Writing B%d: %s", row, value)
+                self._write(f'B{row}', value)
                 row += 1
                 
                 # FIX 2: Safety limit - stop at row 19, DON'T write to row 20
                 if row >= 20:
-                    print(f"    ✓ Stopped at row 19 (avoiding B20)")
+                    logger.debug("    ✓ Stopped at row 19 (avoiding B20)")
                     break
         
         # B26: Formula - references B19 (city line)
-        self.ws['B26'] = '=B19'
-        print(f"    Writing B26 (formula): =B19")
+        self._write('B26', '=B19')
+        logger.debug("    Writing B26 (formula): =B19")
     
     def _populate_boxes_section(self, boxes: List[Dict]):
         """Populate boxes/pallets section - ROWS 45, 46, 48, 50+"""
         
         # Row 45: Headers
-        self.ws['B45'] = "Colli"
-        self.ws['H45'] = "KG"
+        self._write('B45', "Colli")
+        self._write('H45', "KG")
         
         # Row 46: Standard text
-        self.ws['B46'] = "Dimensions as per attached packaging overview"
+        self._write('B46', "Dimensions as per attached packaging overview")
         
         # Row 48: Table headers
-        self.ws['B48'] = "Description"
-        self.ws['E48'] = "L x W x H (cm)"
-        self.ws['H48'] = "Gross weight (KG)"
-        
-        # Populate each box starting at row 50
-        start_row = 50
-        for idx, box in enumerate(boxes):
-            row = start_row + idx
+        self._write('B48', "Description")
+        self._write('E48', "L x W x H (cm)")
+        self._write('H48', "Gross weight (KG)")
+        
+        # Populate each box starting at row 50 - what doesn't fit above the
+        # footer goes onto annex sheets
+        pages = paginate_boxes(boxes, self.BOX_ROWS_MAIN, self.BOX_ROWS_ANNEX)
+        for idx, box in enumerate(pages[0]):
+            row = self.BOX_FIRST_ROW + idx
             
             if box.get('name'):
-                self.ws[f'B{row}'] = box['name']
+                self._write(f'B{row}', box['name'])
             
             if box.get('dimensions'):
-                self.ws[f'E{row}'] = box['dimensions']
+                self._write(f'E{row}', box['dimensions'])
             
             if box.get('gross_weight_kg'):
-                self.ws[f'H{row}'] = box['gross_weight_kg']
+                self._write(f'H{row}', box['gross_weight_kg'])
+        
+        overflow = pages[1:]
+        if overflow:
+            # Last box row: pointer to the annex
+            more = sum(box.get('count', 1) for page in overflow for box in page)
+            self._write(f'B{self.BOX_FIRST_ROW + self.BOX_ROWS_MAIN}',
+                        f"... {more} more colli on the annex sheet{'s' if len(overflow) > 1 else ''}")
+            logger.debug("    %d lines on the CMR, %d colli on %d annex sheet(s)",
+                         len(pages[0]), more, len(overflow))
+        return overflow
+    
+    def _populate_annex_sheets(self, data: Dict, pages: List[List[Dict]]):
+        """Continuation sheets after self.ws with the boxes that didn't fit.
+        
+        Each sheet repeats the packing list header and the table header, and
+        the last one has the totals. Rows are appended (no coordinate parsing)
+        so a shipment with 1,000+ colli stays fast.
+        """
+        index = self.wb.index(self.ws)
+        font = self.CELL_FONT
+        header_font = self.ANNEX_HEADER_FONT
+        total = len(pages)
+        
+        for number, boxes in enumerate(pages, 1):
+            ws = self.wb.create_sheet(f"{self.ws.title[:20]} Annex {number}", index + number)
+            
+            ws.append([None, f"Annex {number}/{total} to CMR - Packing list No.: "
+                             f"{data.get('packing_list_number', '')}"])
+            ws.append([None, f"Project No.: CTS-{data['our_ref']}" if data.get('our_ref') else None,
+                       None, None, None, None, "Customer ref", data.get('your_ref')])
+            ws.append([])
+            ws.append([None, "Description", None, None, "L x W x H (cm)", None, None, "Gross weight (KG)"])
+            for row in ws.iter_rows(min_row=1, max_row=4):
+                for cell in row:
+                    if cell.value:
+                        cell.font = header_font
+            
+            for box in boxes:
+                ws.append([None, box.get('name') or None, None, None, box.get('dimensions') or None,
+                           None, None, box.get('gross_weight_kg') or None])
+                for cell in ws[ws.max_row]:
+                    if cell.value is not None:
+                        cell.font = font
+            
+            if number == total:
+                ws.append([])
+                ws.append([None, f"Total: {data.get('num_boxes', 0)} colli", None, None, None, None, None,
+                           data.get('total_gross_weight', 0)])
+                for cell in ws[ws.max_row]:
+                    if cell.value is not None:
+                        cell.font = header_font
+            
+            for column, width in self.ANNEX_COLUMN_WIDTHS.items():
+                ws.column_dimensions[column].width = width
+            
+            # A4, one page wide; the header rows repeat if a sheet runs over a page
+            ws.page_setup.paperSize = 9
+            ws.page_setup.orientation = 'portrait'
+            ws.sheet_properties.pageSetUpPr = PageSetupProperties(fitToPage=True)
+            ws.page_setup.fitToWidth = 1
+            ws.page_setup.fitToHeight = 0
+            ws.print_title_rows = '1:4'
+            ws.print_area = f'A1:H{ws.max_row}'
+            ws.page_margins.left = ws.page_margins.right = 0.15
+            ws.page_margins.top = ws.page_margins.bottom = 0.3
     
     def _populate_footer_section(self, data: Dict):
         """Populate static footer - moved lower to avoid box section"""
         # B70+: Contact info section (moved from B57 to avoid boxes)
-        self.ws['B70'] = "Previous to deliver, please contact:"
-        self.ws['B73'] = "Tel.:"
+        self._write('B70', "Previous to deliver, please contact:")
+        self._write('B73', "Tel.:")
 
 
 def main():
     """Main execution"""
-    if len(sys.argv) < 2:
-        print("Usage: python pdf_to_cmr.py <pdf_file>")
-        sys.exit(1)
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('-')]
+    use_cache = '--no-cache' not in sys.argv
+    profile = '--profile' in sys.argv
+    aggregate = '--aggregate' in sys.argv
+    # Large PDFs: parse the pages on every CPU core
+    page_workers = (os.cpu_count() or 1) if '--parallel' in sys.argv else 1
     
-    pdf_path = sys.argv[1]
+    if '-v' in sys.argv or '--verbose' in sys.argv:
+        configure_logging(logging.DEBUG)    # every line, box and cell
+    elif '-q' in sys.argv or '--quiet' in sys.argv:
+        configure_logging(logging.WARNING)  # problems only
+    else:
+        configure_logging(logging.INFO)
     
-    if not os.path.isfile(pdf_path):
-        print(f"Error: File not found: {pdf_path}")
+    if len(args) < 1:
+        print("Usage: python pdf_to_cmr.py <pdf_file> [more pdf files...] [--aggregate] [--no-cache] "
+              "[--parallel] [--profile] [-v | -q]")
+        print("       Several PDFs (e.g. one truck) are written into one workbook, a CMR sheet each")
         sys.exit(1)
     
+    for pdf_path in args:
+        if not os.path.isfile(pdf_path):
+            print(f"Error: File not found: {pdf_path}")
+            sys.exit(1)
+    
     # Template path is hardcoded
     template_path = "CTS_NL_CMR_Template.xlsx"
     
     # Output filename
-    base_name = os.path.splitext(os.path.basename(pdf_path))[0]
+    base_name = os.path.splitext(os.path.basename(args[0]))[0]
+    if len(args) > 1:
+        base_name = f"{base_name}_and_{len(args) - 1}_more"
     output_path = f"cmr_output/CMR_{base_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
     
     # Create output directory if it doesn't exist
     os.makedirs('cmr_output', exist_ok=True)
     
     try:
-        print(f"--- Starting Extraction ---")
-        extractor = PackingListExtractor(pdf_path)
-        data = extractor.extract()
-        
-        print(f"\n--- Extraction Summary ---")
-        print(f"  Packing List: {data.get('packing_list_number')}")
-        print(f"  Date: {data.get('date')}")
-        print(f"  Our Ref: {data.get('our_ref')}")
-        print(f"  Your Ref: {data.get('your_ref')}")
-        print(f"  Consignee: {data.get('consignee', {}).get('name', 'N/A')}")
-        print(f"  Delivery: {data.get('delivery_terms')}")
-        print(f"  Boxes: {data.get('num_boxes', 0)}")
-        print(f"  Total Weight: {data.get('total_gross_weight', 0)} KG")
-        
-        for box in data.get('boxes', []):
-            print(f"    - {box.get('name')}: {box.get('dimensions')} / {box.get('gross_weight')}")
-        
-        print(f"\n--- Populating Excel ---")
-        populator = CMRExcelPopulator(template_path)
-        populator.populate(data, output_path)
+        timer = StageTimer()
+        data_list = []
+        for pdf_path in args:
+            print(f"--- Starting Extraction ---")
+            extractor = PackingListExtractor(pdf_path, cache=ExtractionCache() if use_cache else None,
+                                             timer=timer, page_workers=page_workers)
+            data = extractor.extract()
+            data_list.append(data)
+            
+            print(f"\n--- Extraction Summary ---")
+            print(f"  Packing List: {data.get('packing_list_number')}")
+            print(f"  Date: {data.get('date')}")
+            print(f"  Our Ref: {data.get('our_ref')}")
+            print(f"  Your Ref: {data.get('your_ref')}")
+            print(f"  Consignee: {data.get('consignee', {}).get('name', 'N/A')}")
+            print(f"  Delivery: {data.get('delivery_terms')}")
+            print(f"  Boxes: {data.get('num_boxes', 0)}")
+            print(f"  Total Weight: {data.get('total_gross_weight', 0)} KG")
+            
+            for box in data.get('boxes', []):
+                print(f"    - {box.get('name')}: {box.get('dimensions')} / {box.get('gross_weight')}")
+            print()
+        
+        print(f"--- Populating Excel ---")
+        populator = CMRExcelPopulator(template_path, timer=timer, aggregate=aggregate)
+        if len(data_list) == 1:
+            populator.populate(data_list[0], output_path)
+        else:
+            populator.populate_many(data_list, output_path)
         
         print(f"\n✓ Success! Output generated.")
         
+        if profile:
+            print(f"\n--- Stage Timings ---")
+            print(format_report(timer.report()))
+        
     except Exception as e:
         print(f"\n✗ FATAL ERROR: {e}")
         import traceback
@@ -837,4 +1776,5 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
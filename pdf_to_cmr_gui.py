@@ -7,15 +7,20 @@ Professional interface with manual browse + smart search
 import os
 import sys
 import threading
-import glob
+import multiprocessing
 from pathlib import Path
 from tkinter import *
 from tkinter import ttk, filedialog, messagebox
 from datetime import datetime
 
-# Import from the main script
+# Import from the main script - pdf_to_cmr (pdfplumber, pdfminer, openpyxl) is
+# imported when first needed, so the window appears without waiting for it
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from pdf_to_cmr import PackingListExtractor, CMRExcelPopulator
+from batch_convert import collect_pdfs, iter_batch_convert
+from extraction_cache import ExtractionCache
+from pl_index import PackingListIndex
+from conversion_service import convert_via_service, service_available
+from pdf_source import SpoolCache, SpoolPrefetcher
 
 # Import updater
 try:
@@ -28,163 +33,111 @@ except ImportError:
 
 
 class PDFSearcher:
-    """Smart PDF searcher for project and packing list numbers"""
+    """Smart PDF searcher for project and packing list numbers
+    
+    Lookups go to the local packing list index (pl_index.py). The share is
+    only re-scanned when the index is old or a lookup comes up empty.
+    """
     
     def __init__(self, base_path="P:\\"):
         self.base_path = base_path
+        self._indexes = {}
     
     def find_by_project_and_pl(self, project_num, pl_num):
         """Search by both project number and packing list number"""
-        results = []
-        year_folders = self._get_year_folders()
-        
-        for year_folder in year_folders:
-            # Look for folders STARTING with project number
-            project_folders = glob.glob(os.path.join(year_folder, f"{project_num} *"))
-            
-            for project_folder in project_folders:
-                transport_folder = os.path.join(project_folder, "Transport")
-                
-                if os.path.exists(transport_folder):
-                    pdfs = self._find_packing_list_pdfs(transport_folder, pl_num)
-                    results.extend(pdfs)
-        
-        if len(results) == 0:
-            return False, f"No packing list found for Project {project_num} / PL {pl_num}\n\nTry:\n• Check numbers\n• Try PL number only\n• Browse manually"
-        elif len(results) == 1:
-            return True, results[0]['path']
-        else:
-            return True, results
+        return self._collect(project_num, pl_num)
     
     def find_by_project_only(self, project_num):
         """Search by project number only"""
-        results = []
-        year_folders = self._get_year_folders()
-        
-        for year_folder in year_folders:
-            project_folders = glob.glob(os.path.join(year_folder, f"{project_num} *"))
-            
-            for project_folder in project_folders:
-                transport_folder = os.path.join(project_folder, "Transport")
-                
-                if os.path.exists(transport_folder):
-                    pdfs = self._find_all_packing_lists(transport_folder)
-                    results.extend(pdfs)
-        
-        if len(results) == 0:
-            return False, f"No packing lists found in Project {project_num}\n\nTry:\n• Browse manually\n• Check if Transport folder exists"
-        elif len(results) == 1:
-            return True, results[0]['path']
-        else:
-            return True, results
+        return self._collect(project_num, '')
     
     def find_by_pl_only(self, pl_num):
         """Search by packing list number only"""
-        results = []
-        year_folders = self._get_year_folders()
+        return self._collect('', pl_num)
+    
+    def iter_search(self, project_num, pl_num, cancel=None):
+        """Yield matches as they turn up - index hits first, then whatever a
+        re-scan of the share finds. Stops as soon as cancel is set.
+        
+        A project number limits the re-scan to that project's folders, and
+        a project + PL search stops at its first match (a PL number is
+        unique within a project). Index hits whose file was moved or deleted
+        are dropped, and make the share be re-scanned.
+        """
+        index = self.get_index()
+        found = set()
+        stale = False
+        
+        for match in index.find(project_num, pl_num):
+            if cancel is not None and cancel.is_set():
+                return
+            if os.path.exists(match['path']):
+                found.add(match['path'])
+                yield match
+            else:
+                stale = True
         
-        for year_folder in year_folders:
-            # Get all project folders
-            project_folders = [d for d in glob.glob(os.path.join(year_folder, "*")) 
-                             if os.path.isdir(d)]
-            
-            for project_folder in project_folders:
-                transport_folder = os.path.join(project_folder, "Transport")
-                
-                if os.path.exists(transport_folder):
-                    pdfs = self._find_packing_list_pdfs(transport_folder, pl_num)
-                    results.extend(pdfs)
+        if found and not stale and (project_num and pl_num or not index.needs_refresh()):
+            return
+        
+        # Old index or nothing found - re-scan, checking each folder that changed
+        scan = index.iter_refresh(cancel, project_num=project_num)
+        try:
+            for year, project, files in scan:
+                for match in index.find_in_folder(year, project, files, project_num, pl_num):
+                    if match['path'] not in found:
+                        found.add(match['path'])
+                        yield match
+                if found and project_num and pl_num:
+                    return
+        finally:
+            scan.close()
+        
+        if cancel is not None and cancel.is_set():
+            return
+        for match in index.find(project_num, pl_num):
+            if match['path'] not in found and os.path.exists(match['path']):
+                found.add(match['path'])
+                yield match
+    
+    @staticmethod
+    def not_found_message(project_num, pl_num):
+        if project_num and pl_num:
+            return f"No packing list found for Project {project_num} / PL {pl_num}\n\nTry:\n• Check numbers\n• Try PL number only\n• Browse manually"
+        elif project_num:
+            return f"No packing lists found in Project {project_num}\n\nTry:\n• Browse manually\n• Check if Transport folder exists"
+        return f"No packing list {pl_num} found\n\nTry:\n• Check number\n• Browse manually"
+    
+    def get_index(self):
+        """Index for the current base folder (loaded from disk on first use)"""
+        index = self._indexes.get(self.base_path)
+        if index is None:
+            index = PackingListIndex(self.base_path)
+            self._indexes[self.base_path] = index
+        return index
+    
+    def _collect(self, project_num, pl_num):
+        """(False, message) / (True, path) / (True, [matches])"""
+        results = list(self.iter_search(project_num, pl_num))
         
         if len(results) == 0:
-            return False, f"No packing list {pl_num} found\n\nTry:\n• Check number\n• Browse manually"
+            return False, self.not_found_message(project_num, pl_num)
         elif len(results) == 1:
             return True, results[0]['path']
         else:
             return True, results
-    
-    def _get_year_folders(self):
-        """Get all year folders (2024, 2025, etc.)"""
-        if not os.path.exists(self.base_path):
-            return []
-        
-        year_folders = []
-        for item in os.listdir(self.base_path):
-            full_path = os.path.join(self.base_path, item)
-            if os.path.isdir(full_path) and item.isdigit() and len(item) == 4:
-                year_folders.append(full_path)
-        
-        return sorted(year_folders, reverse=True)
-    
-    def _find_packing_list_pdfs(self, folder, pl_num):
-        """Find PDFs containing packing list number - handles PL16008, PL 16008, Cl16008"""
-        results = []
-        
-        try:
-            for file in os.listdir(folder):
-                if file.lower().endswith('.pdf'):
-                    # Check for various patterns:
-                    # PL16008, PL 16008, Cl16008, pl16008, etc.
-                    file_upper = file.upper()
-                    
-                    # Look for the 5-digit number with common prefixes
-                    patterns = [
-                        f"PL{pl_num}",      # PL16008
-                        f"PL {pl_num}",     # PL 16008
-                        f"CL{pl_num}",      # Cl16008
-                        f"CL {pl_num}",     # Cl 16008
-                        pl_num              # Just the number
-                    ]
-                    
-                    if any(pattern in file_upper for pattern in patterns):
-                        full_path = os.path.join(folder, file)
-                        results.append({
-                            'path': full_path,
-                            'filename': file,
-                            'modified': datetime.fromtimestamp(os.path.getmtime(full_path))
-                        })
-        except Exception as e:
-            print(f"Error searching folder {folder}: {e}")
-        
-        return results
-    
-    def _find_all_packing_lists(self, folder):
-        """Find all PDFs that look like packing lists"""
-        results = []
-        
-        try:
-            for file in os.listdir(folder):
-                if file.lower().endswith('.pdf'):
-                    file_upper = file.upper()
-                    
-                    # Look for files with PL or CL followed by 5 digits
-                    # Also check for common packing list keywords
-                    keywords = ['PL', 'CL', 'PACKING', 'PACKINGLIST']
-                    
-                    # Check if it has 5 consecutive digits (likely a PL number)
-                    has_pl_pattern = False
-                    for i in range(len(file) - 4):
-                        if file[i:i+5].isdigit():
-                            has_pl_pattern = True
-                            break
-                    
-                    if any(kw in file_upper for kw in keywords) or has_pl_pattern:
-                        full_path = os.path.join(folder, file)
-                        results.append({
-                            'path': full_path,
-                            'filename': file,
-                            'modified': datetime.fromtimestamp(os.path.getmtime(full_path))
-                        })
-        except Exception as e:
-            print(f"Error searching folder {folder}: {e}")
-        
-        return results
 
 
 class FileSelectionDialog:
-    """Dialog for selecting from multiple PDF matches"""
+    """Dialog for selecting from multiple PDF matches
+    
+    More matches can be added while it's open (add_file), and on_close is
+    called with the selected path (None if cancelled) when it closes.
+    """
     
-    def __init__(self, parent, files):
+    def __init__(self, parent, files, on_close=None):
         self.result = None
+        self.on_close = on_close
         self.dialog = Toplevel(parent)
         self.dialog.title("Select Packing List")
         self.dialog.geometry("700x450")
@@ -198,9 +151,9 @@ class FileSelectionDialog:
         self.dialog.geometry(f"+{x}+{y}")
         
         # Title
-        title_label = Label(self.dialog, text="Multiple packing lists found - select one:",
-                          font=("Segoe UI", 12, "bold"), fg="#1e40af")
-        title_label.pack(pady=15, padx=20)
+        self.title_label = Label(self.dialog, text="Multiple packing lists found - select one:",
+                                 font=("Segoe UI", 12, "bold"), fg="#1e40af")
+        self.title_label.pack(pady=15, padx=20)
         
         # List
         list_frame = Frame(self.dialog, bg="white")
@@ -215,14 +168,9 @@ class FileSelectionDialog:
         scrollbar.config(command=self.listbox.yview)
         
         # Add files
-        self.files = files
+        self.files = []
         for file in files:
-            display = f"{file['filename']}"
-            self.listbox.insert(END, display)
-            self.listbox.insert(END, f"  Modified: {file['modified'].strftime('%Y-%m-%d %H:%M')}")
-            self.listbox.insert(END, "")  # Empty line
-        
-        self.listbox.selection_set(0)
+            self.add_file(file)
         
         # Buttons
         button_frame = Frame(self.dialog, bg="white")
@@ -239,6 +187,24 @@ class FileSelectionDialog:
         cancel_btn.pack(side=LEFT, padx=5)
         
         self.listbox.bind("<Double-Button-1>", lambda e: self.on_select())
+        self.dialog.protocol("WM_DELETE_WINDOW", self.on_cancel)
+    
+    def add_file(self, file):
+        """Append a match to the list"""
+        self.files.append(file)
+        self.listbox.insert(END, f"{file['filename']}")
+        self.listbox.insert(END, f"  Modified: {file['modified'].strftime('%Y-%m-%d %H:%M')}")
+        self.listbox.insert(END, "")  # Empty line
+        
+        if not self.listbox.curselection():
+            self.listbox.selection_set(0)
+    
+    def set_searching(self, searching):
+        """Show whether more matches may still arrive"""
+        if searching:
+            self.title_label.config(text=f"Searching... {len(self.files)} packing lists found so far:")
+        else:
+            self.title_label.config(text="Multiple packing lists found - select one:")
     
     def on_select(self):
         selection = self.listbox.curselection()
@@ -247,14 +213,15 @@ class FileSelectionDialog:
             file_index = selection[0] // 3
             if file_index < len(self.files):
                 self.result = self.files[file_index]['path']
-                self.dialog.destroy()
+                self._close()
     
     def on_cancel(self):
-        self.dialog.destroy()
+        self._close()
     
-    def show(self):
-        self.dialog.wait_window()
-        return self.result
+    def _close(self):
+        self.dialog.destroy()
+        if self.on_close:
+            self.on_close(self.result)
 
 
 class ModernButton(Canvas):
@@ -305,6 +272,10 @@ class ModernButton(Canvas):
 class PDFtoCMRApp:
     """Modern GUI with manual browse + smart search"""
     
+    # While the selection dialog is open, the first this many matches are
+    # copied from the share in the background - the pick is then local
+    PREFETCH_TOP_HITS = 5
+    
     COLORS = {
         'primary': '#2563eb',
         'primary_hover': '#1d4ed8',
@@ -331,14 +302,57 @@ class PDFtoCMRApp:
         self.template_path = "CTS_NL_CMR_Template.xlsx"
         self.searcher = PDFSearcher()
         
+        # Conversion service: only used when CTS_CMR_SERVICE_URL is set or one
+        # answered the start-up probe - a refused connection can take seconds
+        # on Windows, too long to try on every conversion
+        self._use_service = 'CTS_CMR_SERVICE_URL' in os.environ
+        
+        # Local copies of PDFs picked from the share
+        self.spool_cache = SpoolCache()
+        self._prefetcher = SpoolPrefetcher(self.spool_cache)
+        
+        # Smart search state - only events of the current search are handled
+        self._search_id = 0
+        self._search_cancel = None
+        self._search_matches = []
+        self._search_dialog = None
+        
         # Build UI
         self.create_widgets()
         self.center_window()
         
+        # Once the window is up: load the converter and prepare the CMR template
+        # in the background - conversions then only copy it
+        self.root.after(100, lambda: threading.Thread(target=self._preload_template, daemon=True).start())
+        
+        # Bring the packing list search index up to date in the background
+        threading.Thread(target=self._refresh_search_index, daemon=True).start()
+        
+        # Look for a running conversion service in the background
+        if not self._use_service:
+            threading.Thread(target=self._probe_service, daemon=True).start()
+        
         # Check for updates
         if UPDATER_AVAILABLE:
             self.root.after(2000, self.check_updates)
     
+    def _preload_template(self):
+        try:
+            from pdf_to_cmr import CMRExcelPopulator
+            CMRExcelPopulator.preload(self.template_path)
+        except Exception as e:
+            print(f"Template preload failed: {e}")
+    
+    def _refresh_search_index(self):
+        try:
+            self.searcher.get_index().refresh()
+        except Exception as e:
+            print(f"Search index refresh failed: {e}")
+    
+    def _probe_service(self):
+        if service_available():
+            self._use_service = True
+    
     def center_window(self):
         self.root.update_idletasks()
         width = self.root.winfo_width()
@@ -401,6 +415,14 @@ class PDFtoCMRApp:
         self.convert_btn.pack()
         self.convert_btn.set_state("disabled")
         
+        # Batch button
+        self.batch_btn = Button(convert_frame, text="📂 Batch Process Folder",
+                               command=self.batch_process_folder,
+                               bg="#e5e7eb", fg=self.COLORS['text_primary'],
+                               font=("Segoe UI", 9), relief=FLAT,
+                               padx=15, pady=6, cursor="hand2")
+        self.batch_btn.pack(pady=(10, 0))
+        
         # Smart search section (collapsible)
         search_section = Frame(main_frame, bg=self.COLORS['background'])
         search_section.pack(fill=X, pady=(15, 0))
@@ -534,7 +556,8 @@ class PDFtoCMRApp:
             self.searcher.base_path = folder
     
     def smart_search(self):
-        """Smart search based on user input"""
+        """Smart search based on user input - runs in a thread, a new search
+        cancels the one in progress"""
         project_num = self.project_var.get().strip()
         pl_num = self.pl_var.get().strip()
         
@@ -543,40 +566,92 @@ class PDFtoCMRApp:
                                   "Please enter a project number, packing list number, or both.")
             return
         
+        self._cancel_search()
         self.searcher.base_path = self.folder_var.get()
+        self._search_matches = []
+        self._search_cancel = threading.Event()
         self.set_status("Searching...", "#0369a1")
-        self.root.update()
         
-        # Search
+        thread = threading.Thread(target=self._search_thread,
+                                  args=(self._search_id, project_num, pl_num, self._search_cancel))
+        thread.daemon = True
+        thread.start()
+    
+    def _cancel_search(self):
+        """Stop the running search and ignore anything it still sends"""
+        self._prefetcher.clear()
+        if self._search_cancel:
+            self._search_cancel.set()
+            self._search_cancel = None
+        if self._search_dialog:
+            dialog, self._search_dialog = self._search_dialog, None
+            dialog.on_close = None
+            dialog.dialog.destroy()
+        self._search_id += 1
+    
+    def _search_thread(self, search_id, project_num, pl_num, cancel):
+        """Search logic (runs in thread) - matches go back via root.after"""
+        error = None
         try:
-            if project_num and pl_num:
-                success, result = self.searcher.find_by_project_and_pl(project_num, pl_num)
-            elif project_num:
-                success, result = self.searcher.find_by_project_only(project_num)
-            else:
-                success, result = self.searcher.find_by_pl_only(pl_num)
-            
-            if not success:
-                self.set_status("Not found", "#dc2626")
-                messagebox.showerror("Not Found", result)
-                return
-            
-            # Handle result
-            if isinstance(result, list):
-                dialog = FileSelectionDialog(self.root, result)
-                selected_path = dialog.show()
-                
-                if selected_path:
-                    self.selected_pdf = selected_path
-                    self.do_conversion()
-                else:
-                    self.set_status("Cancelled", self.COLORS['text_secondary'])
-            else:
-                self.selected_pdf = result
-                self.do_conversion()
+            for match in self.searcher.iter_search(project_num, pl_num, cancel):
+                self.root.after(0, lambda m=match: self.on_search_match(search_id, m))
         except Exception as e:
+            error = str(e)
+        
+        self.root.after(0, lambda: self.on_search_done(search_id, project_num, pl_num, error))
+    
+    def on_search_match(self, search_id, match):
+        """Show a match - the selection dialog opens once there's a choice"""
+        if search_id != self._search_id:
+            return
+        
+        self._search_matches.append(match)
+        if self._search_dialog:
+            self._search_dialog.add_file(match)
+            if len(self._search_matches) <= self.PREFETCH_TOP_HITS and self._on_share(match['path']):
+                self._prefetcher.add(match['path'])
+        elif len(self._search_matches) == 2:
+            self._search_dialog = FileSelectionDialog(
+                self.root, self._search_matches,
+                on_close=lambda path: self.on_search_dialog_closed(search_id, path))
+            for first in self._search_matches:
+                if self._on_share(first['path']):
+                    self._prefetcher.add(first['path'])
+        
+        if self._search_dialog:
+            self._search_dialog.set_searching(True)
+        self.set_status(f"Searching... {len(self._search_matches)} found", "#0369a1")
+    
+    def on_search_done(self, search_id, project_num, pl_num, error):
+        """Search finished - convert a single match directly"""
+        if search_id != self._search_id:
+            return
+        self._search_cancel = None
+        
+        if self._search_dialog:
+            self._search_dialog.set_searching(False)
+            self.set_status(f"{len(self._search_matches)} packing lists found", "#0369a1")
+        elif error:
             self.set_status("Error", "#dc2626")
-            messagebox.showerror("Search Error", f"Search failed:\n\n{str(e)}")
+            messagebox.showerror("Search Error", f"Search failed:\n\n{error}")
+        elif not self._search_matches:
+            self.set_status("Not found", "#dc2626")
+            messagebox.showerror("Not Found", self.searcher.not_found_message(project_num, pl_num))
+        else:
+            self.selected_pdf = self._search_matches[0]['path']
+            self.do_conversion()
+    
+    def on_search_dialog_closed(self, search_id, selected_path):
+        """Selection made (or cancelled) - no need to keep searching"""
+        self._search_dialog = None
+        if search_id == self._search_id:
+            self._cancel_search()
+        
+        if selected_path:
+            self.selected_pdf = selected_path
+            self.do_conversion()
+        else:
+            self.set_status("Cancelled", self.COLORS['text_secondary'])
     
     def convert_pdf(self):
         """Convert selected PDF"""
@@ -600,12 +675,28 @@ class PDFtoCMRApp:
     def _conversion_thread(self):
         """Conversion logic (runs in thread)"""
         try:
-            extractor = PackingListExtractor(self.selected_pdf)
+            output_dir = "cmr_output"
+            os.makedirs(output_dir, exist_ok=True)
+            
+            # A running conversion service has warm workers - use it if there is one
+            if self._use_service:
+                result = convert_via_service(self.selected_pdf, output_dir)
+                if result is not None:
+                    if not result['success']:
+                        raise Exception(result['error'])
+                    output_path = result['output_path']
+                    self.root.after(0, lambda: self.on_success(output_path))
+                    return
+                self._use_service = False  # gone - convert in-process from now on
+            
+            from pdf_to_cmr import PackingListExtractor, CMRExcelPopulator
+            
+            spool_cache = self.spool_cache if self._on_share(self.selected_pdf) else None
+            extractor = PackingListExtractor(self.selected_pdf, cache=ExtractionCache(),
+                                             spool_cache=spool_cache)
             data = extractor.extract()
             
             base_name = os.path.splitext(os.path.basename(self.selected_pdf))[0]
-            output_dir = "cmr_output"
-            os.makedirs(output_dir, exist_ok=True)
             output_path = os.path.join(output_dir, 
                                       f"CMR_{base_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx")
             
@@ -617,6 +708,80 @@ class PDFtoCMRApp:
         except Exception as e:
             self.root.after(0, lambda: self.on_error(str(e)))
     
+    def _on_share(self, path):
+        """True for a PDF under the search base folder - only those are worth a local copy"""
+        base = os.path.normcase(os.path.abspath(self.searcher.base_path))
+        path = os.path.normcase(os.path.abspath(path))
+        try:
+            return os.path.commonpath([base, path]) == base
+        except ValueError:  # another drive
+            return False
+    
+    def batch_process_folder(self):
+        """Convert every PDF in a folder (e.g. a Transport folder)"""
+        folder = filedialog.askdirectory(title="Select Folder with Packing Lists")
+        if not folder:
+            return
+        
+        pdf_paths = collect_pdfs([folder])
+        if not pdf_paths:
+            messagebox.showwarning("No PDFs", f"No PDF files found in:\n\n{folder}")
+            return
+        
+        self.set_status(f"Batch: 0/{len(pdf_paths)}...", "#0369a1")
+        self.convert_btn.set_state("disabled")
+        self.search_btn.set_state("disabled")
+        self.batch_btn.config(state=DISABLED)
+        
+        thread = threading.Thread(target=self._batch_thread, args=(pdf_paths,))
+        thread.daemon = True
+        thread.start()
+    
+    def _batch_thread(self, pdf_paths):
+        """Batch logic (runs in thread) - progress events go back via root.after"""
+        try:
+            for event in iter_batch_convert(pdf_paths, "cmr_output", self.template_path):
+                self.root.after(0, lambda ev=event: self.on_batch_event(ev))
+        except Exception as e:
+            self.root.after(0, lambda: self.on_batch_error(str(e)))
+    
+    def _end_batch(self):
+        """Re-enable the buttons batch_process_folder disabled"""
+        self.convert_btn.set_state("normal" if self.selected_pdf else "disabled")
+        self.search_btn.set_state("normal")
+        self.batch_btn.config(state=NORMAL)
+    
+    def on_batch_error(self, error_msg):
+        """The batch as a whole failed (not one of its files)"""
+        self._end_batch()
+        self.set_status("✗ Batch error", self.COLORS['danger'])
+        messagebox.showerror("Error", f"Batch conversion failed:\n\n{error_msg}")
+    
+    def on_batch_event(self, event):
+        """Show batch progress"""
+        if event['event'] == 'file':
+            self.set_status(f"Batch: {event['completed']}/{event['total']} - "
+                            f"{os.path.basename(event['result']['pdf_path'])}", "#0369a1")
+        elif event['event'] == 'finish':
+            self._end_batch()
+            
+            failed = [r for r in event['results'] if not r['success']]
+            if failed:
+                self.set_status(f"✗ Batch: {len(failed)} failed", self.COLORS['danger'])
+                details = "\n".join(os.path.basename(r['pdf_path']) for r in failed[:10])
+                if len(failed) > 10:
+                    details += f"\n... and {len(failed) - 10} more"
+                messagebox.showwarning("Batch Finished",
+                                       f"{event['succeeded']} of {event['total']} converted.\n\n"
+                                       f"Failed:\n{details}")
+            else:
+                self.set_status(f"✓ Batch: {event['succeeded']} converted", self.COLORS['success'])
+                result = messagebox.askyesno("Batch Finished",
+                                             f"{event['succeeded']} CMRs created in "
+                                             f"{event['seconds']:.0f}s.\n\nOpen folder?")
+                if result:
+                    os.startfile(os.path.abspath("cmr_output"))
+    
     def on_success(self, output_path):
         """Handle success"""
         self.set_status("✓ Success!", self.COLORS['success'])
@@ -640,27 +805,39 @@ class PDFtoCMRApp:
         self.status_label.config(text=text, fg=color)
     
     def check_updates(self):
-        """Check for updates"""
+        """Check for updates in the background - the sources can be slow"""
+        thread = threading.Thread(target=self._update_check_thread)
+        thread.daemon = True
+        thread.start()
+    
+    def _update_check_thread(self):
         try:
             update_info = check_for_updates()
-            if update_info and update_info.get('available'):
-                result = messagebox.askyesno(
-                    "Update Available",
-                    f"New version available!\n\n"
-                    f"Current: {get_current_version()}\n"
-                    f"New: {update_info['version']}\n\n"
-                    f"Download now?",
-                    icon='info'
-                )
-                if result:
-                    import webbrowser
-                    webbrowser.open(update_info.get('download_url', 
-                                   'https://github.com/Yewcake/cts-cmr-converter/releases'))
         except Exception as e:
             print(f"Update check failed: {e}")
+            return
+        
+        if update_info and update_info.get('available'):
+            self.root.after(0, lambda: self.on_update_available(update_info))
+    
+    def on_update_available(self, update_info):
+        """Offer the update"""
+        result = messagebox.askyesno(
+            "Update Available",
+            f"New version available!\n\n"
+            f"Current: {get_current_version()}\n"
+            f"New: {update_info['version']}\n\n"
+            f"Download now?",
+            icon='info'
+        )
+        if result:
+            import webbrowser
+            webbrowser.open(update_info.get('download_url', 
+                           'https://github.com/Yewcake/cts-cmr-converter/releases'))
 
 
 def main():
+    multiprocessing.freeze_support()
     root = Tk()
     app = PDFtoCMRApp(root)
     root.mainloop()
@@ -0,0 +1,385 @@
+"""
+Packing list index for CTS CMR Converter
+Remembers which packing list PDFs sit in the project folders on the share
+(<base>/<year>/<project>/Transport/*.pdf) so searches don't have to walk it
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+# Index location (per user, survives restarts)
+DEFAULT_INDEX_DIR = os.path.join(os.path.expanduser("~"), ".cts_cmr_converter")
+
+# Re-scan the share when the index is older than this (seconds)
+DEFAULT_MAX_AGE = 10 * 60
+
+# Folders checked at the same time - the share's latency, not CPU, is the limit
+DEFAULT_SCAN_WORKERS = 8
+
+INDEX_VERSION = 1
+
+_FIVE_DIGITS_RE = re.compile(r'\d{5}')
+
+
+def matches_pl(filename: str, pl_num: str) -> bool:
+    """PL16008, PL 16008, Cl16008 ... all contain the number itself"""
+    return pl_num in filename.upper()
+
+
+def looks_like_packing_list(filename: str) -> bool:
+    """PL / CL / packing keywords, or 5 consecutive digits (likely a PL number)"""
+    file_upper = filename.upper()
+    keywords = ['PL', 'CL', 'PACKING', 'PACKINGLIST']
+    if any(kw in file_upper for kw in keywords):
+        return True
+    return any(filename[i:i + 5].isdigit() for i in range(len(filename) - 4))
+
+
+class PackingListIndex:
+    """Persistent index of the packing list PDFs under one base folder
+
+    Refreshing is incremental: a year folder is only listed again when its
+    modified time changed (project added/removed), and a Transport folder
+    only when its own modified time changed (PDF added/removed/renamed).
+    Everything else comes from the saved index, so a refresh costs one stat
+    per project instead of a directory listing plus a stat per PDF.
+    """
+
+    def __init__(self, base_path: str, index_dir: str = DEFAULT_INDEX_DIR,
+                 max_age: float = DEFAULT_MAX_AGE, max_workers: int = DEFAULT_SCAN_WORKERS):
+        self.base_path = base_path
+        self.index_dir = index_dir
+        self.max_age = max_age
+        self.max_workers = max_workers
+        self.refreshed_at = None
+        self.last_scan = {}
+        # {year: {'mtime': m, 'projects': {project: {'mtime': m|None, 'files': [[name, mtime]]}}}}
+        self._years = {}
+        self._lookups = self._build_lookups(self._years)
+        # Guards swapping in a refreshed index - held for the swap and while a
+        # lookup copies it, never while the share is scanned
+        self._lock = threading.Lock()
+        self._load()
+
+    @property
+    def index_path(self) -> str:
+        key = hashlib.sha1(os.path.abspath(self.base_path).encode('utf-8')).hexdigest()[:12]
+        return os.path.join(self.index_dir, f"pl_index_{key}.json")
+
+    def needs_refresh(self) -> bool:
+        """Never scanned, or the last scan is older than max_age"""
+        return self.refreshed_at is None or time.time() - self.refreshed_at > self.max_age
+
+    # ------------------------------------------------------------------ lookups
+
+    def find_by_project_and_pl(self, project_num: str, pl_num: str) -> List[Dict]:
+        lookups = self._current_lookups()
+        return [self._result(year, project, name, mtime)
+                for year, project in self._match_projects(lookups, project_num)
+                for name, mtime in lookups['years'][year]['projects'][project]['files']
+                if matches_pl(name, pl_num)]
+
+    def find_by_project(self, project_num: str) -> List[Dict]:
+        lookups = self._current_lookups()
+        return [self._result(year, project, name, mtime)
+                for year, project in self._match_projects(lookups, project_num)
+                for name, mtime in lookups['years'][year]['projects'][project]['files']
+                if looks_like_packing_list(name)]
+
+    def find_by_pl(self, pl_num: str) -> List[Dict]:
+        lookups = self._current_lookups()
+        # Any 5-digit run of the query narrows it down to a handful of files
+        digits = _FIVE_DIGITS_RE.search(pl_num)
+        candidates = lookups['by_digits'].get(digits.group(), []) if digits else lookups['files']
+        return [self._result(*record) for record in candidates
+                if matches_pl(record[2], pl_num)]
+
+    def find(self, project_num: str = '', pl_num: str = '') -> List[Dict]:
+        """Project + PL, project only or PL only - whichever was given"""
+        if project_num and pl_num:
+            return self.find_by_project_and_pl(project_num, pl_num)
+        elif project_num:
+            return self.find_by_project(project_num)
+        return self.find_by_pl(pl_num)
+
+    def find_in_folder(self, year: str, project: str, files: List[list],
+                       project_num: str = '', pl_num: str = '') -> List[Dict]:
+        """Same rules as find(), for one Transport folder listing"""
+        if project_num and not fnmatch.fnmatch(project, f"{project_num} *"):
+            return []
+        wanted = (lambda name: matches_pl(name, pl_num)) if pl_num else looks_like_packing_list
+        return [self._result(year, project, name, mtime)
+                for name, mtime in files if wanted(name)]
+
+    def _current_lookups(self) -> Dict:
+        """The lookups of the index as it is now - a refresh swaps in new ones
+        instead of changing these, so they can be read without the lock"""
+        with self._lock:
+            return self._lookups
+
+    @staticmethod
+    def _match_projects(lookups: Dict, project_num: str) -> List[tuple]:
+        """(year, project) for folders named "<project_num> ..." - like glob("<num> *")"""
+        if ' ' not in project_num and not any(c in project_num for c in '*?['):
+            return lookups['by_project'].get(os.path.normcase(project_num), [])
+
+        pattern = f"{project_num} *"
+        return [(year, project) for year, project in lookups['projects']
+                if fnmatch.fnmatch(project, pattern)]
+
+    def _result(self, year: str, project: str, name: str, mtime: float) -> Dict:
+        return {
+            'path': os.path.join(self.base_path, year, project, "Transport", name),
+            'filename': name,
+            'modified': datetime.fromtimestamp(mtime),
+        }
+
+    @staticmethod
+    def _build_lookups(years: Dict) -> Dict:
+        """In-memory lookups: project number -> folders, 5-digit run -> files"""
+        lookups = {'years': years, 'projects': [], 'files': [], 'by_project': {}, 'by_digits': {}}
+
+        for year in sorted(years, reverse=True):  # newest year first
+            projects = years[year]['projects']
+            for project in sorted(projects):
+                lookups['projects'].append((year, project))
+                number = os.path.normcase(project.split(' ', 1)[0])
+                lookups['by_project'].setdefault(number, []).append((year, project))
+
+                for name, mtime in projects[project]['files']:
+                    record = (year, project, name, mtime)
+                    lookups['files'].append(record)
+                    windows = {name[i:i + 5] for i in range(len(name) - 4)}
+                    for window in windows:
+                        if window.isdigit():
+                            lookups['by_digits'].setdefault(window, []).append(record)
+        return lookups
+
+    # ------------------------------------------------------------------ scanning
+
+    def refresh(self, cancel: Optional[threading.Event] = None) -> Dict:
+        """Bring the index up to date with the share, returns scan counters"""
+        for _ in self.iter_refresh(cancel):
+            pass
+        return self.last_scan
+
+    def iter_refresh(self, cancel: Optional[threading.Event] = None,
+                     project_num: str = '') -> Iterator[tuple]:
+        """Refresh step by step - yields (year, project, files) for every
+        Transport folder that had to be listed again.
+
+        Year and Transport folders are checked on a thread pool, so the
+        share's latency overlaps instead of adding up. With project_num only
+        that project's Transport folders are checked (a targeted scan - the
+        rest of the index stays as it was).
+
+        Stopping early (cancel set, or the generator closed) keeps what was
+        scanned so far; unfinished year folders are listed again next time.
+
+        Lookups (and other refreshes) can run during the scan: the lock is
+        only taken to copy the index at the start and to swap in the result.
+        """
+        with self._lock:
+            old_years = self._years
+        stats = {'years': 0, 'projects': 0, 'listed_years': 0, 'listed_transports': 0}
+        years = {}
+        listings = {}
+        finished_years = set()
+        completed = False
+        jobs = {}
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        try:
+            year_folders = self._scan_year_folders()
+            if year_folders is None:  # share unreachable - keep the index as it is
+                return
+            year_folders.sort(reverse=True)  # newest first
+            stats['years'] = len(year_folders)
+
+            # Project folder names - only years whose mtime changed are listed
+            to_list = []
+            for year, year_mtime in year_folders:
+                old_year = old_years.get(year)
+                if old_year and old_year['mtime'] == year_mtime:
+                    listings[year] = list(old_year['projects'])
+                else:
+                    to_list.append(year)
+            stats['listed_years'] = len(to_list)
+            year_paths = [os.path.join(self.base_path, year) for year in to_list]
+            listings.update(zip(to_list, pool.map(self._list_project_folders, year_paths)))
+
+            if cancel is not None and cancel.is_set():
+                return
+
+            # Transport folders - one stat each, listed again only if changed
+            remaining = {}
+            for year, year_mtime in year_folders:
+                old_year = old_years.get(year)
+                if listings[year] is None:  # unreadable - keep what we had
+                    if old_year:
+                        years[year] = old_year
+                        finished_years.add(year)
+                    continue
+
+                old_projects = old_year['projects'] if old_year else {}
+                years[year] = {'mtime': year_mtime, 'projects': {}}
+                year_path = os.path.join(self.base_path, year)
+                remaining[year] = 0
+                for project in listings[year]:
+                    if project_num and not fnmatch.fnmatch(project, f"{project_num} *"):
+                        continue
+                    future = pool.submit(self._scan_transport, year_path, project,
+                                         old_projects.get(project))
+                    jobs[future] = (year, project)
+                    remaining[year] += 1
+
+                if not remaining[year] and not project_num:
+                    finished_years.add(year)
+
+            for future in as_completed(jobs):
+                if cancel is not None and cancel.is_set():
+                    return
+                year, project = jobs[future]
+                entry, listed = future.result()
+                years[year]['projects'][project] = entry
+                stats['projects'] += 1
+
+                remaining[year] -= 1
+                if not remaining[year] and not project_num:
+                    finished_years.add(year)
+
+                if listed:
+                    stats['listed_transports'] += 1
+                    yield year, project, entry['files']
+
+            completed = not project_num
+        finally:
+            for future in jobs:
+                future.cancel()
+            pool.shutdown(wait=False)
+            if completed or years:
+                self._commit(years, listings, finished_years, completed)
+            self.last_scan = stats
+
+    def _commit(self, years: Dict, listings: Dict, finished_years: set, completed: bool):
+        """Swap in the scanned folders (all of them, or what a partial scan got to)"""
+        with self._lock:
+            if completed:
+                self._years = years
+                self.refreshed_at = time.time()
+            else:
+                # Merged into the index as it is now - another refresh may have
+                # swapped in its result during this scan
+                merged = dict(self._years)
+                for year, scanned in years.items():
+                    if year in finished_years:
+                        merged[year] = scanned
+                        continue
+                    # Part of the year was checked: fill in the rest from the old
+                    # index. If some project folder is in neither, forget the
+                    # year's mtime so the next refresh lists it again
+                    old_year = self._years.get(year)
+                    old_projects = old_year['projects'] if old_year else {}
+                    projects = {}
+                    for project in listings[year]:
+                        entry = scanned['projects'].get(project) or old_projects.get(project)
+                        if entry is not None:
+                            projects[project] = entry
+                    complete = len(projects) == len(listings[year])
+                    merged[year] = {'mtime': scanned['mtime'] if complete else None,
+                                    'projects': projects}
+                self._years = merged
+
+            self._lookups = self._build_lookups(self._years)
+            self._save()
+
+    def _scan_year_folders(self) -> Optional[List[tuple]]:
+        """(year, modified time) of the 2024, 2025, ... folders - None if the
+        share can't be listed"""
+        try:
+            entries = list(os.scandir(self.base_path))
+        except OSError as e:
+            print(f"Error searching folder {self.base_path}: {e}")
+            return None
+
+        years = []
+        for entry in entries:
+            if entry.name.isdigit() and len(entry.name) == 4:
+                try:
+                    if entry.is_dir():
+                        years.append((entry.name, entry.stat().st_mtime))
+                except OSError:
+                    continue
+        return years
+
+    def _list_project_folders(self, year_path: str) -> Optional[List[str]]:
+        try:
+            with os.scandir(year_path) as entries:
+                return [entry.name for entry in entries
+                        if not entry.name.startswith('.') and entry.is_dir()]
+        except OSError as e:
+            print(f"Error searching folder {year_path}: {e}")
+            return None
+
+    def _scan_transport(self, year_path: str, project: str, old: Optional[Dict]) -> tuple:
+        """(index entry, 1 if the folder had to be listed else 0)"""
+        transport_folder = os.path.join(year_path, project, "Transport")
+        try:
+            mtime = os.stat(transport_folder).st_mtime
+        except OSError:
+            return {'mtime': None, 'files': []}, 0
+
+        if old and old['mtime'] == mtime:
+            return old, 0
+
+        files = []
+        try:
+            with os.scandir(transport_folder) as entries:
+                for entry in entries:
+                    if entry.name.lower().endswith('.pdf'):
+                        files.append([entry.name, entry.stat().st_mtime])
+        except OSError as e:
+            print(f"Error searching folder {transport_folder}: {e}")
+            return (old or {'mtime': None, 'files': []}), 0
+
+        return {'mtime': mtime, 'files': files}, 1
+
+    # ------------------------------------------------------------------ storage
+
+    def _load(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if saved.get('version') != INDEX_VERSION or saved.get('base_path') != self.base_path:
+            return
+
+        self._years = saved.get('years', {})
+        self.refreshed_at = saved.get('refreshed_at')
+        self._lookups = self._build_lookups(self._years)
+
+    def _save(self):
+        try:
+            os.makedirs(self.index_dir, exist_ok=True)
+            # Write to a temp file first so a crash never leaves half an index
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'version': INDEX_VERSION,
+                    'base_path': self.base_path,
+                    'refreshed_at': self.refreshed_at,
+                    'years': self._years,
+                }, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"⚠ Warning: Could not save search index: {e}")
@@ -0,0 +1,103 @@
+"""
+Stage timing for CTS CMR Converter
+Times the pipeline stages of a conversion (PDF open, page text, box parse,
+template load, cell writes, save ...) and summarises them across a batch
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+
+class StageTimer:
+    """Accumulates wall time per named stage
+
+    A stage can run many times (e.g. 'page_text' once per page); the report
+    has the total time and the number of calls, in first-seen order.
+    """
+
+    def __init__(self):
+        self._stages = {}  # name -> [seconds, calls]
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name: str, seconds: float):
+        entry = self._stages.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+    def merge(self, report: Dict):
+        """Add the stages of another timer's report (e.g. from a worker process)"""
+        for name, stage in report['stages'].items():
+            entry = self._stages.setdefault(name, [0.0, 0])
+            entry[0] += stage['ms'] / 1000
+            entry[1] += stage['calls']
+
+    def report(self) -> Dict:
+        """{'total_ms': t, 'stages': {name: {'ms': t, 'calls': n}}}"""
+        stages = {name: {'ms': seconds * 1000, 'calls': calls}
+                  for name, (seconds, calls) in self._stages.items()}
+        return {
+            'total_ms': sum(stage['ms'] for stage in stages.values()),
+            'stages': stages,
+        }
+
+
+def format_report(report: Dict) -> str:
+    """One line per stage, for console output"""
+    lines = [f"  {'stage':<16}{'ms':>10}{'calls':>8}"]
+    for name, stage in report['stages'].items():
+        lines.append(f"  {name:<16}{stage['ms']:>10.1f}{stage['calls']:>8}")
+    lines.append(f"  {'total':<16}{report['total_ms']:>10.1f}")
+    return "\n".join(lines)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    rank = max(1, -(-len(sorted_values) * pct // 100))  # ceil
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(reports: List[Dict]) -> Dict:
+    """Per-stage percentiles over many conversion reports
+
+    {stage: {'count': n, 'p50': ms, 'p90': ms, 'p99': ms, 'max': ms}},
+    plus a 'total' entry. A stage only counts the conversions that ran it
+    (e.g. cached extractions have no PDF stages).
+    """
+    per_stage = {}
+    for report in reports:
+        for name, stage in report['stages'].items():
+            per_stage.setdefault(name, []).append(stage['ms'])
+        per_stage.setdefault('total', []).append(report['total_ms'])
+
+    # 'total' last
+    if 'total' in per_stage:
+        per_stage['total'] = per_stage.pop('total')
+
+    summary = {}
+    for name, values in per_stage.items():
+        values.sort()
+        summary[name] = {
+            'count': len(values),
+            'p50': _percentile(values, 50),
+            'p90': _percentile(values, 90),
+            'p99': _percentile(values, 99),
+            'max': values[-1],
+        }
+    return summary
+
+
+def format_summary(summary: Dict) -> str:
+    """Percentile table for console output"""
+    lines = [f"  {'stage':<16}{'count':>7}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+    for name, stats in summary.items():
+        lines.append(f"  {name:<16}{stats['count']:>7}{stats['p50']:>10.1f}{stats['p90']:>10.1f}"
+                     f"{stats['p99']:>10.1f}{stats['max']:>10.1f}")
+    return "\n".join(lines)
@@ -5,9 +5,11 @@ Checks for updates on network share or GitHub
 
 import json
 import os
+import queue
+import threading
+import time
 from pathlib import Path
 from typing import Optional, Dict
-from packaging import version as ver
 
 # Current version
 __version__ = "v1.0.6"
@@ -25,6 +27,19 @@ GITHUB_TOKEN = ""
 # Option 3: Web server
 WEB_SERVER_URL = "https://yourserver.com/cmr_converter/version.json"
 
+# Last check result is reused for this long (seconds) - later launches don't probe
+UPDATE_CACHE_TTL = 12 * 60 * 60
+UPDATE_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cts_cmr_converter", "update_check.json")
+
+# Give up on sources that haven't answered after this long (seconds)
+UPDATE_CHECK_TIMEOUT = 10
+
+
+def _is_newer(latest_version: str) -> bool:
+    """latest_version > __version__ (packaging is imported on the first check, not at start-up)"""
+    from packaging import version as ver
+    return ver.parse(latest_version) > ver.parse(__version__)
+
 
 def check_for_updates_network_share() -> Optional[Dict]:
     """
@@ -55,7 +70,7 @@ def check_for_updates_network_share() -> Optional[Dict]:
         latest_version = data['version']
         
         # Compare versions
-        if ver.parse(latest_version) > ver.parse(__version__):
+        if _is_newer(latest_version):
             return {
                 'available': True,
                 'version': latest_version,
@@ -86,7 +101,7 @@ def check_for_updates_github() -> Optional[Dict]:
             data = response.json()
             latest_version = data['tag_name'].lstrip('v')
             
-            if ver.parse(latest_version) > ver.parse(__version__):
+            if _is_newer(latest_version):
                 # Find the .exe asset
                 download_url = None
                 for asset in data.get('assets', []):
@@ -127,7 +142,7 @@ def check_for_updates_web() -> Optional[Dict]:
             data = response.json()
             latest_version = data['version']
             
-            if ver.parse(latest_version) > ver.parse(__version__):
+            if _is_newer(latest_version):
                 return {
                     'available': True,
                     'version': latest_version,
@@ -146,30 +161,78 @@ def check_for_updates_web() -> Optional[Dict]:
         return None
 
 
-def check_for_updates() -> Optional[Dict]:
+UPDATE_SOURCES = [
+    check_for_updates_network_share,
+    check_for_updates_github,
+    check_for_updates_web,
+]
+
+
+def check_for_updates(use_cache: bool = True, timeout: float = UPDATE_CHECK_TIMEOUT) -> Optional[Dict]:
     """
     Check for updates from all configured sources
     Returns info about the latest available update
+    
+    All sources are probed at the same time and the first one reporting an
+    update wins, so an unreachable share or no internet costs one timeout
+    instead of one per source. The answer is cached for UPDATE_CACHE_TTL.
     """
     if not UPDATE_CHECK_ENABLED:
         return {'available': False}
     
-    # Try network share first (fastest for internal use)
-    update_info = check_for_updates_network_share()
-    if update_info and update_info.get('available'):
-        return update_info
+    if use_cache:
+        cached = _load_cached_result()
+        if cached is not None:
+            return cached
     
-    # Try GitHub
-    update_info = check_for_updates_github()
-    if update_info and update_info.get('available'):
-        return update_info
+    # Daemon threads - a source that hangs must not keep the app from exiting
+    answers = queue.Queue()
+    for source in UPDATE_SOURCES:
+        threading.Thread(target=lambda source=source: answers.put(source()), daemon=True).start()
+    
+    deadline = time.monotonic() + timeout
+    answered = False
+    for _ in UPDATE_SOURCES:
+        try:
+            update_info = answers.get(timeout=max(0, deadline - time.monotonic()))
+        except queue.Empty:
+            break
+        
+        if update_info is not None:
+            answered = True
+            if update_info.get('available'):
+                _save_cached_result(update_info)
+                return update_info
     
-    # Try web server
-    update_info = check_for_updates_web()
-    if update_info and update_info.get('available'):
-        return update_info
+    result = {'available': False}
+    if answered:  # don't remember "no update" if no source could be reached
+        _save_cached_result(result)
+    return result
+
+
+def _load_cached_result() -> Optional[Dict]:
+    """Cached check result, if it's recent and for this version"""
+    try:
+        with open(UPDATE_CACHE_PATH, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
     
-    return {'available': False}
+    if cached.get('current_version') != __version__:
+        return None
+    if time.time() - cached.get('checked_at', 0) > UPDATE_CACHE_TTL:
+        return None
+    return cached.get('result')
+
+
+def _save_cached_result(result: Dict):
+    try:
+        os.makedirs(os.path.dirname(UPDATE_CACHE_PATH), exist_ok=True)
+        with open(UPDATE_CACHE_PATH, 'w', encoding='utf-8') as f:
+            json.dump({'checked_at': time.time(), 'current_version': __version__,
+                       'result': result}, f)
+    except OSError as e:
+        print(f"Could not cache update check: {e}")
 
 
 def get_current_version() -> str:
@@ -182,7 +245,7 @@ if __name__ == "__main__":
     print(f"Current version: {__version__}")
     print("Checking for updates...")
     
-    update_info = check_for_updates()
+    update_info = check_for_updates(use_cache=False)
     
     if update_info.get('available'):
         print(f"\n✓ Update available!")
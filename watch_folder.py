@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Watch-folder service for CTS CMR Converter
+Polls folders (e.g. the Transport folders) for new or changed packing list
+PDFs and converts them in the background with the batch converter's worker
+pool - no GUI needed.
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+from batch_convert import (DEFAULT_OUTPUT_DIR, DEFAULT_TEMPLATE, _init_worker,
+                           collect_pdfs, convert_one)
+from extraction_cache import file_sha256
+
+DEFAULT_STATE_DIR = os.path.join(os.path.expanduser("~"), ".cts_cmr_converter")
+
+# Seconds between folder scans
+DEFAULT_POLL_INTERVAL = 5.0
+
+# A PDF is only converted once its size and modified time have stayed the
+# same this long - files that are still being copied/saved are left alone
+DEFAULT_SETTLE_TIME = 3.0
+
+STATE_VERSION = 1
+
+logger = logging.getLogger("watch_folder")
+logger.addHandler(logging.NullHandler())
+
+# (size, modified time) of a PDF - a change means it was rewritten
+Signature = Tuple[int, float]
+
+
+class FolderWatcher:
+    """Converts PDFs that land in the watched folders, once each
+
+    State (in state_dir, per set of folders) survives restarts:
+      files   - path -> signature of every PDF that was handled
+      outputs - PDF content hash -> CMR written for it
+    A PDF whose signature is unchanged is never looked at again, and one
+    whose content hash already has an existing CMR (a copy, or a re-save
+    of the same file) is skipped without converting.
+
+    On the very first run the PDFs already in the folders are taken as
+    handled, unless convert_existing is set - pointing the watcher at a
+    share with years of packing lists must not convert all of them.
+    """
+
+    def __init__(self, folders: List[str], output_dir: Optional[str] = DEFAULT_OUTPUT_DIR,
+                 template_path: str = DEFAULT_TEMPLATE, recursive: bool = False,
+                 max_workers: Optional[int] = None,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 settle_time: float = DEFAULT_SETTLE_TIME,
+                 state_dir: str = DEFAULT_STATE_DIR,
+                 convert_existing: bool = False, use_cache: bool = True):
+        self.folders = [os.path.abspath(folder) for folder in folders]
+        self.output_dir = output_dir  # None = next to the source PDF
+        self.template_path = template_path
+        self.recursive = recursive
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.poll_interval = poll_interval
+        self.settle_time = settle_time
+        self.state_dir = state_dir
+        self.use_cache = use_cache
+
+        self._files: Dict[str, Signature] = {}
+        self._outputs: Dict[str, str] = {}
+        self._pending: Dict[str, Tuple[Signature, float]] = {}  # path -> (signature, stable since)
+        self._running = {}  # future -> (path, signature, digest)
+        self._pool = None
+
+        if not self._load() and not convert_existing:
+            self._files = self.scan()
+            self._save()
+
+    @property
+    def state_path(self) -> str:
+        key = hashlib.sha1("\n".join(sorted(self.folders)).encode('utf-8')).hexdigest()[:12]
+        return os.path.join(self.state_dir, f"watch_state_{key}.json")
+
+    # ------------------------------------------------------------------ scanning
+
+    def scan(self) -> Dict[str, Signature]:
+        """Signature of every PDF in the watched folders"""
+        signatures = {}
+        for path in collect_pdfs(self.folders, recursive=self.recursive):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue  # removed between listing and stat
+            signatures[path] = (stat.st_size, stat.st_mtime)
+        return signatures
+
+    @staticmethod
+    def scan_one(path: str) -> Optional[Signature]:
+        """Signature of one PDF, None if it is gone"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_size, stat.st_mtime)
+
+    def poll(self, now: Optional[float] = None) -> List[str]:
+        """PDFs that are new or changed and have stopped changing"""
+        now = time.monotonic() if now is None else now
+        busy = {path for path, _, _ in self._running.values()}
+        current = self.scan()
+
+        ready = []
+        for path, signature in current.items():
+            if self._files.get(path) == signature or path in busy:
+                continue
+
+            pending = self._pending.get(path)
+            if pending is None or pending[0] != signature:
+                self._pending[path] = (signature, now)  # (still) being written
+            elif now - pending[1] >= self.settle_time and self._readable(path):
+                del self._pending[path]
+                ready.append(path)
+
+        for path in list(self._pending):
+            if path not in current:
+                del self._pending[path]
+        return ready
+
+    @staticmethod
+    def _readable(path: str) -> bool:
+        """False while another program still holds the file (Windows locks it during a copy)"""
+        try:
+            with open(path, 'rb'):
+                return True
+        except OSError:
+            return False
+
+    # ------------------------------------------------------------------ converting
+
+    def submit(self, path: str):
+        """Queue one PDF for conversion, or skip it if its content already has a CMR"""
+        signature = self.scan_one(path)
+        if signature is None:
+            return
+        try:
+            digest = file_sha256(path)
+        except OSError as e:
+            logger.warning("✗ %s: could not read file: %s", path, e)
+            return
+
+        if any(digest == running[2] for running in self._running.values()):
+            return  # a copy of a PDF that is converting right now - look again next poll
+
+        existing = self._outputs.get(digest)
+        if existing and os.path.exists(existing):
+            logger.info("= %s: unchanged content, CMR already at %s", os.path.basename(path), existing)
+            self._files[path] = signature
+            self._save()
+            return
+
+        output_dir = self.output_dir or os.path.dirname(path)
+        os.makedirs(output_dir, exist_ok=True)
+        future = self._get_pool().submit(convert_one, path, output_dir,
+                                         self.template_path, self.use_cache)
+        self._running[future] = (path, signature, digest)
+
+    def collect(self) -> List[Dict]:
+        """Results of the conversions that finished since the last call"""
+        results = []
+        for future in [f for f in self._running if f.done()]:
+            path, signature, digest = self._running.pop(future)
+            try:
+                result = future.result()
+            except BrokenProcessPool as e:
+                self._pool = None  # a worker died - start a fresh pool for the next files
+                result = {'pdf_path': path, 'success': False, 'error': f"Worker failed: {e}"}
+            except Exception as e:
+                result = {'pdf_path': path, 'success': False, 'error': f"Worker failed: {e}"}
+
+            # Failed files are not retried until they change - a broken PDF
+            # would otherwise be converted on every poll
+            self._files[path] = signature
+            if result['success']:
+                self._outputs[digest] = result['output_path']
+                logger.info("✓ %s -> %s (%d boxes, %.1fs)", os.path.basename(path),
+                            result['output_path'], result['num_boxes'], result['seconds'])
+            else:
+                first_line = result['error'].split('\n')[0] if result['error'] else 'Unknown error'
+                logger.warning("✗ %s: %s", os.path.basename(path), first_line)
+            results.append(result)
+
+        if results:
+            self._save()
+        return results
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                             initargs=(True, self.template_path))
+        return self._pool
+
+    def run(self, stop: Optional[threading.Event] = None):
+        """Poll and convert until stop is set (or Ctrl+C)"""
+        stop = stop or threading.Event()
+        logger.info("Watching %d folder(s), output %s", len(self.folders),
+                    self.output_dir or "next to each PDF")
+        for folder in self.folders:
+            logger.info("  %s", folder)
+
+        try:
+            while not stop.is_set():
+                for path in self.poll():
+                    self.submit(path)
+                self.collect()
+                stop.wait(self.poll_interval if not self._running else min(self.poll_interval, 0.5))
+        finally:
+            self.close()
+
+    def close(self):
+        """Finish running conversions and stop the workers"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self.collect()
+            self._pool = None
+
+    # ------------------------------------------------------------------ persistence
+
+    def _load(self) -> bool:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if saved.get('version') != STATE_VERSION:
+            return False
+
+        self._files = {path: tuple(signature) for path, signature in saved.get('files', {}).items()}
+        self._outputs = saved.get('outputs', {})
+        return True
+
+    def _save(self):
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            # Write to a temp file first so a crash never leaves half a state file
+            tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'version': STATE_VERSION,
+                    'folders': self.folders,
+                    'files': self._files,
+                    'outputs': self._outputs,
+                }, f, ensure_ascii=False)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            logger.warning("Could not save watch state: %s", e)
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Convert packing list PDFs as they land in watched folders")
+    parser.add_argument('folders', nargs='+', help="Folders to watch")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR,
+                        help=f"Output folder for CMR files (default: {DEFAULT_OUTPUT_DIR})")
+    output.add_argument('--next-to-source', action='store_true',
+                        help="Write each CMR into the folder of its PDF")
+    parser.add_argument('--template', default=DEFAULT_TEMPLATE, help="CMR template path")
+    parser.add_argument('--recursive', action='store_true',
+                        help="Also watch sub-folders (e.g. every Transport folder of a year)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument('--interval', type=float, default=DEFAULT_POLL_INTERVAL,
+                        help=f"Seconds between folder scans (default: {DEFAULT_POLL_INTERVAL:g})")
+    parser.add_argument('--settle', type=float, default=DEFAULT_SETTLE_TIME,
+                        help="Seconds a PDF must stay unchanged before it is converted "
+                             f"(default: {DEFAULT_SETTLE_TIME:g})")
+    parser.add_argument('--convert-existing', action='store_true',
+                        help="On the first run, also convert the PDFs already in the folders")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Re-parse every PDF instead of using the extraction cache")
+    args = parser.parse_args()
+
+    for folder in args.folders:
+        if not os.path.isdir(folder):
+            print(f"Error: Folder not found: {folder}")
+            sys.exit(1)
+
+    # Only the watcher's own messages - the workers' conversion trace stays off
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s", datefmt="%Y-%m-%d %H:%M:%S"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+    watcher = FolderWatcher(args.folders,
+                            output_dir=None if args.next_to_source else args.output_dir,
+                            template_path=args.template, recursive=args.recursive,
+                            max_workers=args.workers, poll_interval=args.interval,
+                            settle_time=args.settle, convert_existing=args.convert_existing,
+                            use_cache=not args.no_cache)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        logger.info("Stopped")
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()